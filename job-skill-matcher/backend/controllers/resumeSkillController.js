@@ -3,6 +3,10 @@ const path = require('path');
 const fs = require('fs');
 const { spawn } = require('child_process');
 const db = require('../config/database');
+const { SKILL_INDEX_PATH, ensureSkillIndex, exportSkillIndex } = require('../services/skillIndexExport');
+
+// Fields requested from the extraction CLI (the context snippet is not used here)
+const EXTRACTION_FIELDS = 'skill,skill_id,skill_db_id,skill_db_match,category,confidence,method';
 
 const resumeSkillController = {
     // Extract skills from uploaded resume using Large-Scale Skills Model
@@ -24,19 +28,45 @@ const resumeSkillController = {
             console.log('🚀 Starting skill extraction with Enhanced Ensemble System...');
             console.log(`📄 Processing file: ${path.basename(filePath)}`);
             
-            // Use the enhanced ensemble skill extraction system
+            // The extractor resolves skills table ids from this export
+            try {
+                await ensureSkillIndex();
+            } catch (error) {
+                console.error('⚠️ Could not export skill index:', error.message);
+            }
+            
+            // Use the enhanced ensemble skill extraction system. Results arrive as JSON Lines
+            // with only the fields used below, and are parsed as each line completes.
             const pythonProcess = spawn('python', [
                 path.join(__dirname, '../enhanced_resume_parser_cli.py'),
                 filePath,
                 'extract_skills',
-                '--user-id', userId.toString()
+                '--user-id', userId.toString(),
+                '--format', 'jsonl',
+                '--fields', EXTRACTION_FIELDS,
+                '--skill-index', SKILL_INDEX_PATH
             ]);
 
-            let dataString = '';
+            const extractedSkills = [];
+            let pendingLine = '';
+            let parseError = null;
             let errorString = '';
 
+            const parseLine = (line) => {
+                if (!line.trim() || parseError) return;
+                try {
+                    extractedSkills.push(JSON.parse(line));
+                } catch (error) {
+                    parseError = error;
+                    console.log('Raw output line:', line);
+                }
+            };
+
+            pythonProcess.stdout.setEncoding('utf8');
             pythonProcess.stdout.on('data', (data) => {
-                dataString += data.toString();
+                const lines = (pendingLine + data).split('\n');
+                pendingLine = lines.pop();
+                lines.forEach(parseLine);
             });
 
             pythonProcess.stderr.on('data', (data) => {
@@ -67,19 +97,16 @@ const resumeSkillController = {
                 }
                 
                 try {
-                    // Parse the skills from the Enhanced Ensemble System output
-                    let extractedSkills = [];
-                    try {
-                        extractedSkills = JSON.parse(dataString);
-                        console.log(`✅ Enhanced Ensemble System extracted ${extractedSkills.length} skills`);
-                    } catch (parseError) {
+                    // Skills were parsed line by line as the Enhanced Ensemble System streamed them
+                    parseLine(pendingLine);
+                    if (parseError) {
                         console.error('❌ Error parsing Enhanced Ensemble System output:', parseError);
-                        console.log('Raw output:', dataString);
                         return res.status(500).json({ 
                             message: 'Error parsing skills from Enhanced Ensemble System', 
                             error: parseError.message 
                         });
                     }
+                    console.log(`✅ Enhanced Ensemble System extracted ${extractedSkills.length} skills`);
                     
                     // Get profile_id
                     const [profiles] = await db.query(
@@ -93,11 +120,19 @@ const resumeSkillController = {
                     
                     const profileId = profiles[0].profile_id;
                     
-                    // Get all skills from database
-                    const [allSkills] = await db.query('SELECT * FROM skills');
+                    // Database ids were resolved by the extractor; fetch only those rows
+                    const resolvedIds = [...new Set(extractedSkills
+                        .map(item => item.skill_db_id)
+                        .filter(id => id !== null && id !== undefined))];
+                    const skillsById = new Map();
+                    if (resolvedIds.length > 0) {
+                        const [rows] = await db.query('SELECT * FROM skills WHERE skill_id IN (?)', [resolvedIds]);
+                        rows.forEach(row => skillsById.set(row.skill_id, row));
+                    }
                     
                     // Enhanced skill matching leveraging Ensemble System categories and confidence
                     const matchedSkills = [];
+                    const matchedIds = new Set();
                     const unmatchedSkills = [];
                     const skillsByCategory = {};
                     const ensembleMetrics = {
@@ -123,74 +158,27 @@ const resumeSkillController = {
                         else if (method === 'embeddings') ensembleMetrics.embedding_skills++;
                         else if (method === 'ensemble') ensembleMetrics.ensemble_skills++;
                         
-                        // Normalize for comparison
                         const normalizedExtractedSkill = extractedSkill.toLowerCase().trim();
                         
-                        // Enhanced matching algorithm
-                        let matchFound = false;
+                        // Exact name, ontology alias or partial-name match, all resolved by
+                        // skill_db_index.py against the exported table (no per-upload table scan)
+                        const dbSkill = skillsById.get(extractedItem.skill_db_id);
+                        const matchFound = Boolean(dbSkill);
                         
-                        // 1. Exact match
-                        const exactMatch = allSkills.find(
-                            skill => skill.skill_name.toLowerCase() === normalizedExtractedSkill
-                        );
-                        
-                        if (exactMatch && !matchedSkills.some(s => s.skill_id === exactMatch.skill_id)) {
+                        if (dbSkill && !matchedIds.has(dbSkill.skill_id)) {
+                            const isExact = extractedItem.skill_db_match === 'exact';
+                            matchedIds.add(dbSkill.skill_id);
                             matchedSkills.push({
-                                ...exactMatch,
+                                ...dbSkill,
                                 category: category,
-                                confidence: confidence,
+                                confidence: isExact ? confidence : confidence * 0.9, // Slightly lower for variations
                                 method: method,
                                 context: context,
-                                match_type: 'exact'
-                            });
-                            matchFound = true;
-                        }
-                        
-                        // 2. Fuzzy matching for variations
-                        if (!matchFound) {
-                            const fuzzyMatch = allSkills.find(skill => {
-                                const normalizedSkillName = skill.skill_name.toLowerCase();
-                                
-                                // Handle common variations
-                                const variations = [
-                                    // JavaScript variations
-                                    (normalizedExtractedSkill === 'js' && normalizedSkillName.includes('javascript')),
-                                    (normalizedExtractedSkill === 'javascript' && normalizedSkillName.includes('js')),
-                                    
-                                    // Node.js variations
-                                    (normalizedExtractedSkill === 'nodejs' && normalizedSkillName.includes('node')),
-                                    (normalizedExtractedSkill === 'node.js' && normalizedSkillName.includes('node')),
-                                    
-                                    // Framework variations
-                                    (normalizedExtractedSkill.includes('react') && normalizedSkillName.includes('react')),
-                                    (normalizedExtractedSkill.includes('angular') && normalizedSkillName.includes('angular')),
-                                    
-                                    // Database variations
-                                    (normalizedExtractedSkill === 'mongodb' && normalizedSkillName.includes('mongo')),
-                                    (normalizedExtractedSkill === 'postgresql' && normalizedSkillName.includes('postgres')),
-                                    
-                                    // Generic partial matching
-                                    normalizedSkillName.includes(normalizedExtractedSkill) || 
-                                    normalizedExtractedSkill.includes(normalizedSkillName)
-                                ];
-                                
-                                return variations.some(variation => variation);
+                                match_type: isExact ? 'exact' : 'fuzzy'
                             });
-                            
-                            if (fuzzyMatch && !matchedSkills.some(s => s.skill_id === fuzzyMatch.skill_id)) {
-                                matchedSkills.push({
-                                    ...fuzzyMatch,
-                                    category: category,
-                                    confidence: confidence * 0.9, // Slightly lower confidence for fuzzy matches
-                                    method: method,
-                                    context: context,
-                                    match_type: 'fuzzy'
-                                });
-                                matchFound = true;
-                            }
                         }
                         
-                        // 3. Add to unmatched if no match found
+                        // Add to unmatched if no match found
                         if (!matchFound) {
                             const unmatchedSkill = {
                                 skill: extractedSkill,
@@ -221,7 +209,8 @@ const resumeSkillController = {
                     // Sort matched skills by confidence
                     matchedSkills.sort((a, b) => (b.confidence || 1) - (a.confidence || 1));
                     
-                    console.log(`📊 Results: ${matchedSkills.length} matched, ${unmatchedSkills.length} unmatched`);
+                    const partialMatches = extractedSkills.filter(item => item.skill_db_match === 'partial').length;
+                    console.log(`📊 Results: ${matchedSkills.length} matched (${partialMatches} by partial name), ${unmatchedSkills.length} unmatched`);
                     console.log(`🏷️ Categories found: ${Object.keys(skillsByCategory).join(', ')}`);
                     
                     res.json({
@@ -380,6 +369,13 @@ const resumeSkillController = {
             // Log the results
             console.log(`📊 Results: ${addedSkills.length} added, ${skippedSkills.length} skipped`);
             
+            // New rows should resolve on the next upload
+            if (addedSkills.length > 0) {
+                exportSkillIndex().catch(error => {
+                    console.error('⚠️ Skill index refresh failed:', error.message);
+                });
+            }
+            
             res.json({
                 message: `Successfully processed ${skills.length} skills`,
                 addedSkills: addedSkills,
@@ -8,7 +8,8 @@ import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from ensemble_skill_extractor import EnsembleSkillExtractor, EnsembleConfig
-from ab_testing_framework import ABTestManager, TestMetrics
+from ab_testing_framework import ABTestManager, TestMetrics, current_rss_mb
+from extractor_reloader import ExtractorReloader
 import time
 import logging
 
@@ -16,21 +17,28 @@ class EnhancedResumeParser:
     """Enhanced resume parser with ensemble skill extraction"""
     
     def __init__(self, enable_ab_testing=True):
-        self.extractor = EnsembleSkillExtractor()
+        # New model and ontology versions are picked up between requests, without a restart
+        self.reloader = ExtractorReloader()
         self.ab_manager = ABTestManager() if enable_ab_testing else None
         
         logging.basicConfig(level=logging.INFO)
         self.logger = logging.getLogger(__name__)
     
+    @property
+    def extractor(self) -> EnsembleSkillExtractor:
+        return self.reloader.extractor
+    
     def extract_skills_from_text(self, text: str, user_id: str = None) -> dict:
         """
         Extract skills from text using ensemble approach
         Returns both skills and metadata for monitoring
         """
         start_time = time.time()
+        # One extractor for the whole request, even if a new version is swapped in meanwhile
+        extractor = self.reloader.acquire()
         
         # Get user's A/B test configuration if available
-        config = None
+        extraction_config = None
         test_variant = None
         
         if self.ab_manager and user_id:
@@ -41,12 +49,14 @@ class EnhancedResumeParser:
                 config = self.ab_manager.get_user_config(user_id, test.test_id)
                 test_variant = self.ab_manager.assign_user_to_variant(user_id, test.test_id)
                 
-                # Update extractor config if A/B test config available
+                # Variant settings apply to this call only; the shared extractor is untouched
                 if config:
-                    self._update_extractor_config(config)
+                    extraction_config = self._variant_config(config, extractor)
         
         # Extract skills using ensemble approach
-        skill_matches = self.extractor.ensemble_extract(text)
+        rss_before = current_rss_mb()
+        skill_matches = extractor.ensemble_extract(text, config=extraction_config)
+        memory_mb = max(0.0, current_rss_mb() - rss_before)
         
         extraction_time = time.time() - start_time
         
@@ -68,6 +78,8 @@ class EnhancedResumeParser:
             'methods_used': list(set(match.method for match in skill_matches)),
             'average_confidence': sum(match.confidence for match in skill_matches) / len(skill_matches) if skill_matches else 0,
             'ab_test_variant': test_variant,
+            'model_version': extractor.model_version,
+            'ontology_version': extractor.ontology_version,
             'timestamp': time.time()
         }
         
@@ -80,7 +92,8 @@ class EnhancedResumeParser:
                 f1_score=0.835,  # Would be calculated from user feedback
                 extraction_time=extraction_time,
                 user_satisfaction=4.2,  # From user feedback
-                total_extractions=len(extracted_skills)
+                total_extractions=len(extracted_skills),
+                memory_mb=memory_mb
             )
             
             active_tests = self.ab_manager.get_active_tests()
@@ -92,15 +105,14 @@ class EnhancedResumeParser:
             'metadata': metadata
         }
     
-    def _update_extractor_config(self, config: dict):
-        """Update extractor configuration from A/B test"""
-        for key, value in config.items():
-            if hasattr(self.extractor.config, key):
-                setattr(self.extractor.config, key, value)
+    def _variant_config(self, config: dict, extractor: EnsembleSkillExtractor = None) -> EnsembleConfig:
+        """Extractor configuration for an A/B test variant (a copy; unknown keys are ignored)"""
+        return (extractor or self.extractor).config.with_overrides(config)
     
-    def add_user_feedback(self, text: str, predicted_skills: list, correct_skills: list, user_id: str = None):
-        """Add user feedback for active learning"""
-        self.extractor.add_feedback(text, predicted_skills, correct_skills, user_id)
+    def add_user_feedback(self, text: str, predicted_skills: list, correct_skills: list, user_id: str = None,
+                          confidences: dict = None):
+        """Add user feedback for active learning (confidences: skill -> confidence when it was predicted)"""
+        self.extractor.add_feedback(text, predicted_skills, correct_skills, user_id, confidences=confidences)
     
     def retrain_models(self):
         """Retrain models with accumulated feedback"""
@@ -167,6 +179,8 @@ def main():
     print(f"Extraction time: {result['metadata']['extraction_time']:.3f}s")
     print(f"Average confidence: {result['metadata']['average_confidence']:.3f}")
     print(f"Methods used: {', '.join(result['metadata']['methods_used'])}")
+    print(f"Model version: {result['metadata']['model_version']}, "
+          f"ontology version: {result['metadata']['ontology_version']}")
     
     if result['metadata']['ab_test_variant']:
         print(f"A/B test variant: {result['metadata']['ab_test_variant']}")
@@ -19,19 +19,54 @@ if CURRENT_DIR not in sys.path:
 
 try:
     from ensemble_skill_extractor import EnsembleSkillExtractor, SkillOntology
+    from extractor_reloader import ExtractorReloader
     from ab_testing_framework import ABTestManager
+    from skill_normalizer import get_normalizer
+    from result_formats import FORMATS, encode_results, parse_fields
+    from skill_db_index import DEFAULT_SKILL_INDEX_PATH, load_skill_db_index
 except ImportError as e:
     print(f"❌ Import error: {e}", file=sys.stderr)
     print("Please ensure ensemble_skill_extractor.py and ab_testing_framework.py are in the same directory", file=sys.stderr)
     sys.exit(1)
 
+# Job-skill-matcher categories, checked in this order (first match wins)
+SKILL_CATEGORIES = {
+    'programming_languages': {
+        'python', 'java', 'javascript', 'typescript', 'c', 'c++', 'c#', 'ruby', 'php',
+        'swift', 'kotlin', 'go', 'rust', 'scala', 'perl', 'r', 'matlab', 'sql'
+    },
+    'web_technologies': {
+        'html', 'css', 'html5', 'css3', 'sass', 'bootstrap', 'jquery', 'rest', 'api',
+        'graphql', 'websocket', 'xml', 'json', 'ajax', 'react', 'angular', 'vue'
+    },
+    'frameworks': {
+        'django', 'flask', 'spring', 'express', 'node.js', 'next.js', 'gatsby',
+        'svelte', 'laravel', 'asp.net', 'tensorflow', 'pytorch', 'keras', 'scikit-learn'
+    },
+    'cloud_devops': {
+        'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'jenkins', 'terraform',
+        'ansible', 'linux', 'unix', 'nginx', 'apache', 'git', 'github', 'gitlab'
+    },
+    'databases': {
+        'mysql', 'postgresql', 'mongodb', 'redis', 'oracle', 'sqlite',
+        'cassandra', 'dynamodb', 'elasticsearch'
+    },
+    'ai_ml': {
+        'machine learning', 'deep learning', 'artificial intelligence', 'nlp',
+        'computer vision', 'data science', 'neural networks'
+    }
+}
+CATEGORY_NORMALIZER = get_normalizer({}, categories=SKILL_CATEGORIES)
+
 class JobSkillMatcherParser:
     """Enhanced parser specifically designed for job-skill-matcher integration"""
     
-    def __init__(self):
+    def __init__(self, skill_index_path: str = DEFAULT_SKILL_INDEX_PATH):
         """Initialize the enhanced parser with A/B testing capabilities"""
         try:
-            self.extractor = EnsembleSkillExtractor()
+            # New model and ontology versions are picked up between requests, without a restart
+            self.reloader = ExtractorReloader()
+            self.skill_index_path = skill_index_path
             self.ab_manager = ABTestManager()
             
             # Create default A/B test for skill extraction methods
@@ -43,6 +78,10 @@ class JobSkillMatcherParser:
             print(f"❌ Error initializing parser: {e}", file=sys.stderr)
             raise
     
+    @property
+    def extractor(self) -> EnsembleSkillExtractor:
+        return self.reloader.extractor
+    
     def _create_default_ab_test(self) -> str:
         """Create a default A/B test for production use"""
         try:
@@ -115,14 +154,24 @@ class JobSkillMatcherParser:
             # Skip A/B testing for now - use default configuration
             variant_name = 'default'
             
+            # One extractor for the whole request, so skills, ids and versions all match
+            extractor = self.reloader.acquire()
+            skill_index = load_skill_db_index(extractor.ontology.normalizer, self.skill_index_path)
+            
             # Extract skills using ensemble method
-            skills = self.extractor.ensemble_extract(text)
+            skills = extractor.ensemble_extract(text)
             
             # Convert to job-skill-matcher compatible format
             formatted_skills = []
             for skill in skills:
+                skill_db_id, skill_db_match = (
+                    skill_index.resolve(skill.skill) if skill_index else (None, None)
+                )
                 formatted_skills.append({
                     'skill': skill.skill,
+                    'skill_id': extractor.ontology.resolve_skill(skill.skill).skill_id,
+                    'skill_db_id': skill_db_id,
+                    'skill_db_match': skill_db_match,
                     'category': self._categorize_skill(skill.skill),
                     'confidence': round(skill.confidence, 3),
                     'method': skill.method,
@@ -138,6 +187,8 @@ class JobSkillMatcherParser:
             result = {
                 'extracted_skills': formatted_skills,
                 'variant': variant_name,
+                'model_version': extractor.model_version,
+                'ontology_version': extractor.ontology_version,
                 'summary': {
                     'total_skills': len(skills),
                     'avg_confidence': round(sum(s.confidence for s in skills) / max(len(skills), 1), 3),
@@ -146,7 +197,13 @@ class JobSkillMatcherParser:
                 }
             }
             
-            print(f"📊 Extracted {len(skills)} skills using variant '{variant_name}'", file=sys.stderr)
+            print(f"📊 Extracted {len(skills)} skills using variant '{variant_name}' "
+                  f"(model {result['model_version']}, ontology {result['ontology_version']})", file=sys.stderr)
+            # How often the substring fallback is still needed, to judge the index's coverage
+            partial = [item['skill'] for item in formatted_skills if item['skill_db_match'] == 'partial']
+            unresolved = sum(1 for item in formatted_skills if item['skill_db_id'] is None)
+            print(f"🔎 Skill db ids: {len(partial)} partial matches {partial}, {unresolved} unresolved",
+                  file=sys.stderr)
             return result
             
         except Exception as e:
@@ -157,58 +214,7 @@ class JobSkillMatcherParser:
     
     def _categorize_skill(self, skill: str) -> str:
         """Categorize skills for job-skill-matcher compatibility"""
-        skill_lower = skill.lower()
-        
-        # Programming languages
-        programming_langs = {
-            'python', 'java', 'javascript', 'typescript', 'c', 'c++', 'c#', 'ruby', 'php',
-            'swift', 'kotlin', 'go', 'rust', 'scala', 'perl', 'r', 'matlab', 'sql'
-        }
-        
-        # Web technologies
-        web_tech = {
-            'html', 'css', 'html5', 'css3', 'sass', 'bootstrap', 'jquery', 'rest', 'api',
-            'graphql', 'websocket', 'xml', 'json', 'ajax', 'react', 'angular', 'vue'
-        }
-        
-        # Frameworks and libraries
-        frameworks = {
-            'django', 'flask', 'spring', 'express', 'node.js', 'next.js', 'gatsby',
-            'svelte', 'laravel', 'asp.net', 'tensorflow', 'pytorch', 'keras', 'scikit-learn'
-        }
-        
-        # Cloud and DevOps
-        cloud_devops = {
-            'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'jenkins', 'terraform',
-            'ansible', 'linux', 'unix', 'nginx', 'apache', 'git', 'github', 'gitlab'
-        }
-        
-        # Databases
-        databases = {
-            'mysql', 'postgresql', 'mongodb', 'redis', 'oracle', 'sqlite',
-            'cassandra', 'dynamodb', 'elasticsearch'
-        }
-        
-        # AI/ML
-        ai_ml = {
-            'machine learning', 'deep learning', 'artificial intelligence', 'nlp',
-            'computer vision', 'data science', 'neural networks'
-        }
-        
-        if skill_lower in programming_langs:
-            return 'programming_languages'
-        elif skill_lower in web_tech:
-            return 'web_technologies'
-        elif skill_lower in frameworks:
-            return 'frameworks'
-        elif skill_lower in cloud_devops:
-            return 'cloud_devops'
-        elif skill_lower in databases:
-            return 'databases'
-        elif skill_lower in ai_ml:
-            return 'ai_ml'
-        else:
-            return 'other'
+        return CATEGORY_NORMALIZER.categorize(skill)
     
     def submit_feedback(self, test_id: str, user_feedback: Dict, user_id: str = None):
         """Submit user feedback for continuous improvement"""
@@ -246,16 +252,30 @@ def main():
     parser.add_argument('action', choices=['extract_skills'], help='Action to perform')
     parser.add_argument('--user-id', help='User ID for A/B testing (optional)')
     parser.add_argument('--feedback', help='JSON feedback for improving the model (optional)')
+    parser.add_argument('--format', choices=FORMATS, default='json',
+                        help='Output encoding: pretty JSON (default), compact JSON, JSON Lines or '
+                             'length-prefixed binary frames (see result_formats.py)')
+    parser.add_argument('--fields', default='all',
+                        help="Fields to emit: 'all', 'minimal' (skill_id, confidence, category) "
+                             "or a comma-separated list")
+    parser.add_argument('--skill-index', default=DEFAULT_SKILL_INDEX_PATH,
+                        help='Skills table export used to resolve skill_db_id '
+                             '(written by services/skillIndexExport.js)')
     
     args = parser.parse_args()
     
+    try:
+        fields = parse_fields(args.fields)
+    except ValueError as e:
+        parser.error(str(e))
+    
     if not os.path.exists(args.pdf_path):
         print(f"❌ File not found: {args.pdf_path}", file=sys.stderr)
         sys.exit(1)
     
     try:
         # Initialize parser
-        job_parser = JobSkillMatcherParser()
+        job_parser = JobSkillMatcherParser(args.skill_index)
         
         if args.action == 'extract_skills':
             # Extract text from PDF
@@ -277,7 +297,8 @@ def main():
                     print(f"⚠️ Invalid feedback JSON: {e}", file=sys.stderr)
             
             # Output results
-            print(json.dumps(result['extracted_skills'], indent=2))
+            sys.stdout.buffer.write(encode_results(result['extracted_skills'], args.format, fields))
+            sys.stdout.buffer.flush()
             
     except Exception as e:
         print(f"❌ Error: {e}", file=sys.stderr)
@@ -8,17 +8,48 @@ import numpy as np
 import pandas as pd
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
-from sentence_transformers import SentenceTransformer
 from fuzzywuzzy import fuzz, process
 import json
 import re
 import os
 import sys
+import threading
 from typing import List, Dict, Tuple, Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, field, fields, replace
 from collections import defaultdict
 import logging
 
+# Shared extraction helpers live alongside the trained models in the resume project
+RESUME_PROJECT_PATH = os.path.abspath(os.path.join(
+    os.path.dirname(__file__), '..', '..', 'resume 1.0', 'Resume_Analyzer-NLP'
+))
+if RESUME_PROJECT_PATH not in sys.path:
+    sys.path.append(RESUME_PROJECT_PATH)
+
+from section_segmenter import SectionSegmenter, RoutedText, SECTION_CONFIDENCE
+from reference_index import load_or_build_reference_index
+from embedding_backends import create_embedding_backend
+from embedding_cache import CachedEmbeddingBackend
+from shared_tensors import SharedArrayStore, share_extractor_tensors
+from text_chunker import TextChunker, batched
+from pipeline_capabilities import configure_pipeline, PipelineCapabilities
+from skill_normalizer import get_normalizer
+from confidence_histogram import ConfidenceHistogram
+from feedback_store import FeedbackStore
+from model_registry import ModelRegistry
+
+# Persisted reference embeddings, one subdirectory per (model, skill list)
+REFERENCE_INDEX_DIR = os.path.join(RESUME_PROJECT_PATH, 'TrainedModel', 'reference_index')
+# Active learning feedback log (feedback_store.py), shared with the resume project
+FEEDBACK_DIR = os.path.join(RESUME_PROJECT_PATH, 'TrainedModel', 'feedback')
+# Custom spaCy skills model trained by Training/train_large_scale.py
+CUSTOM_MODEL_DIR = os.path.join(RESUME_PROJECT_PATH, 'TrainedModel', 'skills')
+# Fine-tuned versions of it, published by feedback_finetuner.py
+MODEL_REGISTRY_DIR = os.path.join(RESUME_PROJECT_PATH, 'TrainedModel', 'registry', 'skills')
+# Published skill ontologies, one ontology.json per version (SkillOntology.save)
+ONTOLOGY_REGISTRY_DIR = os.path.join(RESUME_PROJECT_PATH, 'TrainedModel', 'registry', 'ontology')
+ONTOLOGY_FILE = 'ontology.json'
+
 @dataclass
 class SkillMatch:
     skill: str
@@ -26,9 +57,16 @@ class SkillMatch:
     method: str
     context: str
     position: Tuple[int, int]
+    section: str = 'unknown'
     
-@dataclass
+@dataclass(frozen=True)
 class EnsembleConfig:
+    """Extraction settings, frozen so one instance can be shared by concurrent requests
+
+    Per-request variants (A/B tests, tuning) derive a copy with with_overrides() and
+    pass it to ensemble_extract(text, config=...). RESOURCE_FIELDS pick the models and
+    caches that are loaded, so they only take effect when the extractor is built.
+    """
     spacy_weight: float = 0.3
     fuzzy_weight: float = 0.2
     tfidf_weight: float = 0.25
@@ -37,6 +75,55 @@ class EnsembleConfig:
     fuzzy_threshold: int = 80
     tfidf_threshold: float = 0.3
     embedding_threshold: float = 0.7
+    use_section_routing: bool = True
+    chunk_max_chars: int = 10000       # Longer texts go through nlp.pipe in chunks
+    embedding_chunk_chars: int = 1000  # Roughly MiniLM's 256 word-piece window
+    chunk_overlap_chars: int = 200
+    chunk_batch_size: int = 16
+    embedding_model_name: str = 'all-MiniLM-L6-v2'
+    embedding_backend: str = 'torch'   # 'torch', 'onnx' or 'onnx-int8' (see embedding_backends.py)
+    embedding_quantization: Optional[str] = 'int8'  # 'int8', 'float16' or None for exact float32
+    embedding_rerank_k: int = 32       # Top candidates re-scored with exact float32 vectors
+    embedding_cache_size: int = 50000  # Cached sentence embeddings (0 disables the cache)
+    embedding_cache_path: Optional[str] = None  # Directory for a memory-mapped cache shared by workers
+    shared_tensor_dir: Optional[str] = None  # Map read-only weights/embeddings from here (e.g. /dev/shm/...)
+    feedback_dir: Optional[str] = None  # Feedback log directory (FEEDBACK_DIR when None)
+    feedback_retention_days: Optional[float] = 365  # Older feedback segments are dropped (None keeps all)
+    model_registry_dir: Optional[str] = None  # Versioned spaCy models (MODEL_REGISTRY_DIR when None)
+    ontology_registry_dir: Optional[str] = None  # Versioned ontologies (ONTOLOGY_REGISTRY_DIR when None)
+    reference_index_dir: Optional[str] = None  # Persisted reference embeddings (REFERENCE_INDEX_DIR when None)
+    
+    def with_overrides(self, overrides: Optional[Dict] = None, **changes) -> 'EnsembleConfig':
+        """Copy with the given fields replaced; keys that are not config fields are ignored"""
+        known = {f.name for f in fields(self)}
+        changes = {**(overrides or {}), **changes}
+        return replace(self, **{key: value for key, value in changes.items() if key in known})
+
+# Fixed at construction: changing them means loading different models or caches
+RESOURCE_FIELDS = ('embedding_model_name', 'embedding_backend', 'embedding_quantization', 'embedding_rerank_k',
+                   'embedding_cache_size', 'embedding_cache_path', 'shared_tensor_dir', 'feedback_dir',
+                   'feedback_retention_days', 'model_registry_dir', 'ontology_registry_dir',
+                   'reference_index_dir')
+
+@dataclass(frozen=True)
+class LoadedModel:
+    """A spaCy pipeline with its capabilities and the registry version it came from"""
+    nlp: object
+    pipeline: PipelineCapabilities
+    version: str
+
+@dataclass
+class LearningState:
+    """Feedback and the config tuned from it, shared by an extractor and its reloads
+
+    A reload (extractor_reloader.py) references this object instead of copying it, so
+    feedback or a retune that reaches the old extractor during a rebuild still counts.
+    """
+    config: EnsembleConfig
+    feedback_store: Optional[FeedbackStore] = None
+    confidence_histogram: ConfidenceHistogram = field(default_factory=ConfidenceHistogram)
+    feedback_count: int = 0
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
 
 class SkillOntology:
     """Maintains canonical skill ontology and alias mappings"""
@@ -45,6 +132,7 @@ class SkillOntology:
         self.canonical_skills = {}
         self.aliases = defaultdict(list)
         self.categories = {}
+        self.normalizer = None
         self.load_ontology(ontology_file)
     
     def load_ontology(self, file_path: str = None):
@@ -381,44 +469,68 @@ class SkillOntology:
                 'api_architecture': ['api', 'rest', 'graphql', 'microservices', 'serverless', 'websockets', 'oauth', 'jwt', 'redis', 'memcached', 'rabbitmq', 'socket_io']
             }
     
+        # Shared per ontology version; replaces the per-call scan over every alias list
+        self.normalizer = get_normalizer(self.canonical_skills, self.aliases, self.categories)
+    
+    def save(self, file_path: str):
+        """Write the ontology in the format load_ontology reads (e.g. to publish a new version)"""
+        with open(file_path, 'w') as f:
+            json.dump({
+                'canonical_skills': self.canonical_skills,
+                'aliases': dict(self.aliases),
+                'categories': self.categories
+            }, f, indent=2)
+    
     def normalize_skill(self, skill: str) -> str:
         """Normalize skill to canonical form"""
-        skill_lower = skill.lower().strip()
-        
-        # Direct canonical match
-        if skill_lower in self.canonical_skills:
-            return self.canonical_skills[skill_lower]
-        
-        # Check aliases
-        for canonical, aliases in self.aliases.items():
-            if skill_lower in aliases:
-                return self.canonical_skills.get(canonical, skill)
-        
-        return skill
+        return self.normalizer.normalize(skill)
+    
+    def resolve_skill(self, skill: str):
+        """(skill_id, canonical_name, category) for a raw skill string"""
+        return self.normalizer.resolve(skill)
 
 class EnsembleSkillExtractor:
     """Advanced ensemble skill extraction system"""
     
-    def __init__(self, config: EnsembleConfig = None):
-        self.config = config or EnsembleConfig()
-        self.ontology = SkillOntology()
+    def __init__(self, config: EnsembleConfig = None, shared_from: 'EnsembleSkillExtractor' = None):
+        # A reload takes its config from `shared_from`, together with the feedback state
+        if shared_from is not None:
+            self._learning = shared_from._learning
+        else:
+            self._learning = LearningState(config or EnsembleConfig())
+        self.logger = logging.getLogger(__name__)
         
-        # Initialize models - Try to load custom trained model first
-        custom_model_path = os.path.abspath(os.path.join(
-            os.path.dirname(__file__), '..', '..', 'resume 1.0', 'Resume_Analyzer-NLP', 'TrainedModel', 'skills'
-        ))
+        # Skill ontology: the registry's current version, else the built-in default
+        self.ontology_registry = ModelRegistry(self.config.ontology_registry_dir or ONTOLOGY_REGISTRY_DIR)
+        ontology_version = self.ontology_registry.current_version()
+        if ontology_version:
+            self.ontology = SkillOntology(
+                os.path.join(self.ontology_registry.version_path(ontology_version), ONTOLOGY_FILE)
+            )
+        else:
+            self.ontology = SkillOntology()
+        self.ontology_version = ontology_version or 'builtin'
         
-        try:
-            if os.path.exists(custom_model_path):
-                self.nlp = spacy.load(custom_model_path)
-                print(f"✅ Loaded custom skills model from {custom_model_path}", file=sys.stderr)
-            else:
-                self.nlp = spacy.load("en_core_web_sm")
-                print("⚠️ Custom model not found, using en_core_web_sm", file=sys.stderr)
-        except Exception as e:
-            print(f"⚠️ Error loading custom model: {e}, falling back to en_core_web_sm", file=sys.stderr)
-            self.nlp = spacy.load("en_core_web_sm")
-        self.sentence_model = SentenceTransformer('all-MiniLM-L6-v2')
+        # spaCy model: the registry's current version, else the custom trained model, else
+        # en_core_web_sm. Later versions are served by a new extractor (extractor_reloader.py).
+        self.model_registry = ModelRegistry(self.config.model_registry_dir or MODEL_REGISTRY_DIR)
+        self._model = self._load_model(self.model_registry.current_version())
+        
+        # A reload (extractor_reloader.py) reuses what does not depend on the model or
+        # ontology from the extractor it replaces: the embedding backend and the LearningState
+        if shared_from is not None:
+            self.sentence_model = shared_from.sentence_model
+        else:
+            self.sentence_model = create_embedding_backend(
+                self.config.embedding_backend, self.config.embedding_model_name
+            )
+            if self.config.embedding_cache_size > 0:
+                # Resumes repeat boilerplate sentences; only unseen ones reach the model
+                self.sentence_model = CachedEmbeddingBackend(
+                    self.sentence_model,
+                    capacity=self.config.embedding_cache_size,
+                    path=self.config.embedding_cache_path
+                )
         self.tfidf_vectorizer = TfidfVectorizer(
             max_features=5000,
             stop_words='english',
@@ -427,22 +539,116 @@ class EnsembleSkillExtractor:
         
         # Load skill reference data
         self.reference_skills = list(self.ontology.canonical_skills.values())
-        self.skill_embeddings = None
+        self.reference_index = None
         self.tfidf_fitted = False
         
-        # Active learning storage
-        self.feedback_data = []
+        # Active learning storage: an append-only log on disk, and the TP/FP histogram
+        # per confidence bucket rebuilt from it once here (see retrain_with_feedback)
+        if shared_from is None:
+            learning = self._learning
+            learning.feedback_store = FeedbackStore(
+                self.config.feedback_dir or FEEDBACK_DIR,
+                retention_days=self.config.feedback_retention_days
+            )
+            learning.feedback_store.apply_retention()
+            for record in learning.feedback_store.iter_feedback():
+                learning.confidence_histogram.add_feedback(record['confidences'], record['correct'])
+                learning.feedback_count += 1
+        
+        self.section_segmenter = SectionSegmenter()
         
         # Initialize models
         self._prepare_reference_data()
         
+        # Several workers per host: map MiniLM weights, reference embeddings and spaCy
+        # vectors from one shared copy instead of holding them privately
+        if self.config.shared_tensor_dir:
+            share_extractor_tensors(self, SharedArrayStore(self.config.shared_tensor_dir))
+        
         logging.basicConfig(level=logging.INFO)
-        self.logger = logging.getLogger(__name__)
+    
+    def _load_model(self, version: Optional[str]) -> LoadedModel:
+        """Load one spaCy pipeline: a registry version, or the custom/default model when None"""
+        if version:
+            nlp = spacy.load(self.model_registry.version_path(version))
+            print(f"✅ Loaded skills model version {version}", file=sys.stderr)
+        else:
+            try:
+                nlp = spacy.load(CUSTOM_MODEL_DIR)
+                version = 'custom'
+                print(f"✅ Loaded custom skills model from {CUSTOM_MODEL_DIR}", file=sys.stderr)
+            except Exception as e:
+                print(f"⚠️ Error loading custom model: {e}, falling back to en_core_web_sm", file=sys.stderr)
+                nlp = spacy.load("en_core_web_sm")
+                version = 'en_core_web_sm'
+        
+        # Decide once which stages exist (the custom model is NER-only, so it gets a
+        # sentencizer and no noun chunks) instead of catching errors on every call
+        return LoadedModel(nlp, configure_pipeline(nlp), version)
+    
+    @property
+    def nlp(self):
+        return self._model.nlp
+    
+    @property
+    def pipeline(self) -> PipelineCapabilities:
+        return self._model.pipeline
+    
+    @property
+    def model_version(self) -> str:
+        return self._model.version
+    
+    @property
+    def versions(self) -> Dict[str, str]:
+        """Model and ontology versions this extractor is serving"""
+        return {'model': self.model_version, 'ontology': self.ontology_version}
+    
+    # Read through to the LearningState, so every instance sharing it sees the same values
+    @property
+    def config(self) -> EnsembleConfig:
+        return self._learning.config
+    
+    @config.setter
+    def config(self, config: EnsembleConfig):
+        self._learning.config = config
+    
+    @property
+    def feedback_store(self) -> FeedbackStore:
+        return self._learning.feedback_store
+    
+    @property
+    def confidence_histogram(self) -> ConfidenceHistogram:
+        return self._learning.confidence_histogram
+    
+    @property
+    def feedback_count(self) -> int:
+        return self._learning.feedback_count
+    
+    def published_versions(self) -> Dict[str, Optional[str]]:
+        """Versions the registries currently point at (None where nothing is published)"""
+        return {
+            'model': self.model_registry.current_version(),
+            'ontology': self.ontology_registry.current_version()
+        }
+    
+    def is_outdated(self, published: Optional[Dict[str, Optional[str]]] = None) -> bool:
+        """True if a registry points at a version other than the one loaded here"""
+        published = published or self.published_versions()
+        return any(version is not None and version != self.versions[kind]
+                   for kind, version in published.items())
     
     def _prepare_reference_data(self):
         """Prepare reference embeddings and TF-IDF"""
-        # Create skill embeddings
-        self.skill_embeddings = self.sentence_model.encode(self.reference_skills)
+        # Reference skill embeddings: reuse the persisted artifact for this model and
+        # skill list, scoring against its quantized copy
+        self.reference_index = load_or_build_reference_index(
+            self.reference_skills,
+            self.sentence_model.encode,
+            f"{self.config.embedding_model_name}@{self.sentence_model.name}",
+            self.config.reference_index_dir or REFERENCE_INDEX_DIR,
+            quantization=self.config.embedding_quantization,
+            rerank_k=self.config.embedding_rerank_k
+        )
         
         # Fit TF-IDF on skill corpus
         skill_corpus = self.reference_skills + [
@@ -452,9 +658,43 @@ class EnsembleSkillExtractor:
         self.tfidf_vectorizer.fit(skill_corpus)
         self.tfidf_fitted = True
     
-    def extract_skills_spacy(self, text: str) -> List[SkillMatch]:
+    def _chunker(self, max_chars: int, config: EnsembleConfig) -> TextChunker:
+        return TextChunker(max_chars, min(config.chunk_overlap_chars, max_chars // 2))
+    
+    def extract_skills_spacy(self, text: str, config: Optional[EnsembleConfig] = None) -> List[SkillMatch]:
         """Extract skills using spaCy NER"""
-        doc = self.nlp(text)
+        config = config or self.config
+        # One model for the whole call, even if a newer version is swapped in meanwhile
+        model = self._model
+        chunker = self._chunker(config.chunk_max_chars, config)
+        if not chunker.needs_chunking(text):
+            matches = self._spacy_matches(model.nlp(text), pipeline=model.pipeline)
+        else:
+            # Long input: stream boundary-aligned chunks through nlp.pipe so neither
+            # max_length nor memory grows with the document
+            matches = []
+            docs = model.nlp.pipe(
+                ((chunk.text, chunk.start) for chunk in chunker.chunks(text)),
+                as_tuples=True,
+                batch_size=config.chunk_batch_size
+            )
+            for doc, offset in docs:
+                matches.extend(self._spacy_matches(doc, offset, model.pipeline))
+        
+        # Remove duplicates (including repeats from chunk overlaps) and return
+        unique_matches = []
+        seen_skills = set()
+        for match in matches:
+            if match.skill not in seen_skills:
+                unique_matches.append(match)
+                seen_skills.add(match.skill)
+        
+        return unique_matches
+    
+    def _spacy_matches(self, doc, offset: int = 0,
+                       pipeline: Optional[PipelineCapabilities] = None) -> List[SkillMatch]:
+        """Turn one spaCy doc into matches, shifting positions by the chunk offset"""
+        pipeline = pipeline or self.pipeline
         matches = []
         
         # Look for SKILL entities from custom model
@@ -473,18 +713,12 @@ class EnsembleSkillExtractor:
                 # Accept all detected skills, but prefer normalized ones
                 final_skill = skill if skill in self.reference_skills else skill_text
                 
-                try:
-                    context = ent.sent.text
-                except (ValueError, AttributeError):
-                    # Fallback if sentence boundaries not available
-                    context = text[:100] + "..." if len(text) > 100 else text
-                
                 matches.append(SkillMatch(
                     skill=final_skill,
                     confidence=0.9,  # Higher confidence for custom model
                     method="spacy_custom_ner",
-                    context=context,
-                    position=(ent.start_char, ent.end_char)
+                    context=ent.sent.text,
+                    position=(offset + ent.start_char, offset + ent.end_char)
                 ))
         
         # Also check for common skill entity types as fallback
@@ -493,54 +727,32 @@ class EnsembleSkillExtractor:
                 skill_text = ent.text.strip()
                 skill = self.ontology.normalize_skill(skill_text)
                 if skill in self.reference_skills:
-                    try:
-                        context = ent.sent.text
-                    except (ValueError, AttributeError):
-                        context = text[:100] + "..." if len(text) > 100 else text
-                    
                     matches.append(SkillMatch(
                         skill=skill,
                         confidence=0.7,
                         method="spacy_general_ner",
-                        context=context,
-                        position=(ent.start_char, ent.end_char)
+                        context=ent.sent.text,
+                        position=(offset + ent.start_char, offset + ent.end_char)
                     ))
         
-        # Look for noun phrases that might be skills (with error handling for custom models)
-        try:
+        # Look for noun phrases that might be skills (only if dependency parser available)
+        if pipeline.has_noun_chunks:
             for chunk in doc.noun_chunks:
                 skill = self.ontology.normalize_skill(chunk.text)
                 if skill in self.reference_skills:
-                    try:
-                        context = chunk.sent.text
-                    except (ValueError, AttributeError):
-                        context = text[:100] + "..." if len(text) > 100 else text
-                    
                     matches.append(SkillMatch(
                         skill=skill,
                         confidence=0.6,
                         method="spacy_noun_chunk",
-                        context=context,
-                        position=(chunk.start_char, chunk.end_char)
+                        context=chunk.sent.text,
+                        position=(offset + chunk.start_char, offset + chunk.end_char)
                     ))
-        except ValueError as e:
-            # Custom NER models might not have dependency parser
-            # Skip noun chunk extraction if not available
-            print(f"⚠️ Noun chunks not available in this model: {e}", file=sys.stderr)
-            pass
         
-        # Remove duplicates and return
-        unique_matches = []
-        seen_skills = set()
-        for match in matches:
-            if match.skill not in seen_skills:
-                unique_matches.append(match)
-                seen_skills.add(match.skill)
-        
-        return unique_matches
+        return matches
     
-    def extract_skills_fuzzy(self, text: str) -> List[SkillMatch]:
+    def extract_skills_fuzzy(self, text: str, config: Optional[EnsembleConfig] = None) -> List[SkillMatch]:
         """Extract skills using fuzzy string matching"""
+        config = config or self.config
         matches = []
         words = re.findall(r'\b[A-Za-z][A-Za-z0-9+#.-]*\b', text)
         
@@ -552,7 +764,7 @@ class EnsembleSkillExtractor:
                 scorer=fuzz.ratio
             )
             
-            if best_match and best_match[1] >= self.config.fuzzy_threshold:
+            if best_match and best_match[1] >= config.fuzzy_threshold:
                 # Find position in text
                 start_pos = text.lower().find(word.lower())
                 end_pos = start_pos + len(word) if start_pos >= 0 else 0
@@ -567,8 +779,9 @@ class EnsembleSkillExtractor:
         
         return matches
     
-    def extract_skills_tfidf(self, text: str) -> List[SkillMatch]:
+    def extract_skills_tfidf(self, text: str, config: Optional[EnsembleConfig] = None) -> List[SkillMatch]:
         """Extract skills using TF-IDF similarity"""
+        config = config or self.config
         if not self.tfidf_fitted:
             return []
         
@@ -579,7 +792,7 @@ class EnsembleSkillExtractor:
             skill_tfidf = self.tfidf_vectorizer.transform([skill])
             similarity = cosine_similarity(text_tfidf, skill_tfidf)[0][0]
             
-            if similarity >= self.config.tfidf_threshold:
+            if similarity >= config.tfidf_threshold:
                 # Find approximate position (simple implementation)
                 start_pos = text.lower().find(skill.lower())
                 end_pos = start_pos + len(skill) if start_pos >= 0 else 0
@@ -594,26 +807,48 @@ class EnsembleSkillExtractor:
         
         return matches
     
-    def extract_skills_embeddings(self, text: str) -> List[SkillMatch]:
+    def extract_skills_embeddings(self, text: str, config: Optional[EnsembleConfig] = None) -> List[SkillMatch]:
         """Extract skills using semantic embeddings"""
-        matches = []
-        text_embedding = self.sentence_model.encode([text])
+        config = config or self.config
+        # Encode sentence by sentence (MiniLM truncates at 256 tokens, and sentences
+        # repeat across resumes so they hit the embedding cache) and keep each
+        # skill's best similarity across them
+        chunker = self._chunker(config.embedding_chunk_chars, config)
+        best_similarity = np.full(len(self.reference_skills), -1.0)
+        best_chunk_start = np.zeros(len(self.reference_skills), dtype=int)
         
-        similarities = cosine_similarity(text_embedding, self.skill_embeddings)[0]
+        for batch in batched(chunker.sentences(text), config.chunk_batch_size):
+            chunk_embeddings = self.sentence_model.encode(
+                [chunk.text for chunk in batch], batch_size=len(batch)
+            )
+            similarities = self.reference_index.similarities(
+                chunk_embeddings, config.embedding_threshold
+            )
+            top_chunk = similarities.argmax(axis=0)
+            top_similarity = similarities[top_chunk, np.arange(similarities.shape[1])]
+            improved = top_similarity > best_similarity
+            best_similarity[improved] = top_similarity[improved]
+            chunk_starts = np.array([chunk.start for chunk in batch])
+            best_chunk_start[improved] = chunk_starts[top_chunk[improved]]
         
-        for i, similarity in enumerate(similarities):
-            if similarity >= self.config.embedding_threshold:
-                skill = self.reference_skills[i]
-                start_pos = text.lower().find(skill.lower())
-                end_pos = start_pos + len(skill) if start_pos >= 0 else 0
-                
-                matches.append(SkillMatch(
-                    skill=skill,
-                    confidence=similarity,
-                    method="embedding_similarity",
-                    context=self._get_context(text, start_pos, end_pos),
-                    position=(start_pos, end_pos)
-                ))
+        matches = []
+        text_lower = text.lower()
+        for i in np.flatnonzero(best_similarity >= config.embedding_threshold):
+            skill = self.reference_skills[i]
+            start_pos = text_lower.find(skill.lower())
+            if start_pos >= 0:
+                end_pos = start_pos + len(skill)
+            else:
+                # No literal mention - point at the window that matched best
+                start_pos = end_pos = int(best_chunk_start[i])
+            
+            matches.append(SkillMatch(
+                skill=skill,
+                confidence=float(best_similarity[i]),
+                method="embedding_similarity",
+                context=self._get_context(text, start_pos, end_pos),
+                position=(start_pos, end_pos)
+            ))
         
         return matches
     
@@ -623,74 +858,103 @@ class EnsembleSkillExtractor:
         context_end = min(len(text), end + window)
         return text[context_start:context_end].strip()
     
-    def ensemble_extract(self, text: str) -> List[SkillMatch]:
+    def _route_text(self, text: str, config: Optional[EnsembleConfig] = None) -> RoutedText:
+        """Restrict extraction to skill-bearing sections (drops header and education)"""
+        config = config or self.config
+        if not config.use_section_routing:
+            return RoutedText.identity(text)
+        
+        routed = self.section_segmenter.route(text)
+        if not routed.text.strip():
+            return RoutedText.identity(text)
+        return routed
+    
+    def _request_config(self, config: Optional[EnsembleConfig]) -> EnsembleConfig:
+        """The config for one call; nothing shared is mutated, so variants can run concurrently"""
+        if config is None:
+            return self.config
+        fixed = [name for name in RESOURCE_FIELDS if getattr(config, name) != getattr(self.config, name)]
+        if fixed:
+            raise ValueError(f"{', '.join(fixed)} are fixed when the extractor is built; "
+                             f"use a separate EnsembleSkillExtractor for them")
+        return config
+    
+    def ensemble_extract(self, text: str, config: Optional[EnsembleConfig] = None) -> List[SkillMatch]:
         """Extract skills using custom spaCy model only (fast mode)"""
-        # Use only custom spaCy model for extraction
-        spacy_matches = self.extract_skills_spacy(text)
+        config = self._request_config(config)
+        routed = self._route_text(text, config)
         
         # Apply minimum confidence threshold (lowered for spaCy-only mode)
-        final_matches = []
-        for match in spacy_matches:
-            if match.confidence >= 0.5:  # Lower threshold for spaCy-only
-                final_matches.append(match)
-        
-        # Sort by confidence
-        final_matches.sort(key=lambda x: x.confidence, reverse=True)
+        final_matches = [
+            match for match in self._score_routed(routed, config)
+            if match.confidence >= 0.5  # Lower threshold for spaCy-only
+        ]
         
-        self.logger.info(f"Extracted {len(final_matches)} skills using spaCy-only method")
+        self.logger.info(
+            f"Extracted {len(final_matches)} skills using spaCy-only method "
+            f"(skipped {routed.skipped_chars}/{len(text)} non-skill chars)"
+        )
         return final_matches
     
-    def add_feedback(self, text: str, predicted_skills: List[str], 
-                    correct_skills: List[str], user_id: str = None):
-        """Add human feedback for active learning"""
-        feedback_entry = {
-            'text': text,
-            'predicted': predicted_skills,
-            'correct': correct_skills,
-            'user_id': user_id,
-            'timestamp': pd.Timestamp.now()
-        }
-        self.feedback_data.append(feedback_entry)
+    def _score_routed(self, routed: RoutedText, config: EnsembleConfig) -> List[SkillMatch]:
+        """Every scored candidate, before the confidence threshold, highest first"""
+        # Use only custom spaCy model for extraction, on skill-bearing sections
+        candidates = self.extract_skills_spacy(routed.text, config)
+        for match in candidates:
+            start = match.position[0]
+            match.section = routed.section_at(start) if start >= 0 else 'unknown'
+            match.position = routed.to_original_span(match.position)
+            match.confidence = min(1.0, match.confidence * SECTION_CONFIDENCE.get(match.section, 1.0))
         
-        self.logger.info(f"Added feedback: {len(correct_skills)} correct skills")
+        # Sort by confidence
+        candidates.sort(key=lambda x: x.confidence, reverse=True)
+        return candidates
+    
+    def score_candidates(self, text: str, config: Optional[EnsembleConfig] = None) -> List[SkillMatch]:
+        """Candidates with their confidences, ignoring the threshold (for feedback and tuning)"""
+        config = self._request_config(config)
+        return self._score_routed(self._route_text(text, config), config)
     
-    def retrain_with_feedback(self):
-        """Retrain models using accumulated feedback"""
-        if not self.feedback_data:
-            self.logger.warning("No feedback data available for retraining")
-            return
+    def add_feedback(self, text: str, predicted_skills: List[str], 
+                    correct_skills: List[str], user_id: str = None,
+                    confidences: Optional[Dict[str, float]] = None):
+        """Add human feedback for active learning
         
-        # Simple retraining: adjust confidence thresholds based on feedback
-        correct_predictions = []
-        incorrect_predictions = []
+        `confidences` maps each candidate skill to its confidence at prediction time.
+        Without it the text is scored once here, below the threshold too, so lowering
+        the threshold can be evaluated later without re-extracting anything.
+        """
+        if confidences is None:
+            confidences = {}
+            for match in self.score_candidates(text):
+                confidences.setdefault(match.skill, match.confidence)
+        with self._learning.lock:
+            self.confidence_histogram.add_feedback(confidences, correct_skills)
+            self._learning.feedback_count += 1
         
-        for feedback in self.feedback_data:
-            matches = self.ensemble_extract(feedback['text'])
-            predicted = [m.skill for m in matches]
-            
-            for skill in feedback['correct']:
-                if skill in predicted:
-                    match = next(m for m in matches if m.skill == skill)
-                    correct_predictions.append(match.confidence)
-                else:
-                    # This skill was missed
-                    pass
-            
-            for skill in predicted:
-                if skill not in feedback['correct']:
-                    match = next(m for m in matches if m.skill == skill)
-                    incorrect_predictions.append(match.confidence)
-        
-        # Adjust thresholds
-        if correct_predictions and incorrect_predictions:
-            # Find optimal threshold
-            correct_mean = np.mean(correct_predictions)
-            incorrect_mean = np.mean(incorrect_predictions)
-            
-            new_threshold = (correct_mean + incorrect_mean) / 2
-            self.config.min_confidence = max(0.4, min(0.8, new_threshold))
+        # Durable and deduplicated: the resume text is stored once per content hash
+        self.feedback_store.append(text, predicted_skills, correct_skills, user_id, confidences)
+        
+        self.logger.info(f"Added feedback: {len(correct_skills)} correct skills")
+    
+    def retrain_with_feedback(self) -> Optional[Dict[str, float]]:
+        """Retune min_confidence to the F1-optimal threshold from the feedback histogram"""
+        # O(buckets): a sweep over the TP/FP histogram, no re-extraction of stored texts
+        with self._learning.lock:
+            best = self.confidence_histogram.best_threshold(bounds=(0.4, 0.8))
+            if best is None:
+                self.logger.warning("No feedback data available for retraining")
+                return None
             
-            self.logger.info(f"Adjusted confidence threshold to {self.config.min_confidence}")
+            # Swap in a new config object; requests already running keep the one they started
+            # with. It lands on the LearningState, so a reload in progress picks it up too.
+            self.config = self.config.with_overrides(min_confidence=best['threshold'])
+        
+        self.logger.info(
+            f"Adjusted confidence threshold to {self.config.min_confidence:.2f} "
+            f"(F1 {best['f1']:.3f}, precision {best['precision']:.3f}, recall {best['recall']:.3f})"
+        )
+        return best
     
     def get_skill_statistics(self) -> Dict:
         """Get extraction statistics"""
@@ -698,7 +962,15 @@ class EnsembleSkillExtractor:
             'total_reference_skills': len(self.reference_skills),
             'canonical_skills': len(self.ontology.canonical_skills),
             'alias_mappings': len(self.ontology.aliases),
-            'feedback_entries': len(self.feedback_data),
+            'normalizer': self.ontology.normalizer.get_stats(),
+            'model_version': self.model_version,
+            'ontology_version': self.ontology_version,
+            'feedback_entries': self.feedback_count,
+            'feedback_predictions': self.confidence_histogram.total,
+            'embedding_cache': (
+                self.sentence_model.get_stats()
+                if isinstance(self.sentence_model, CachedEmbeddingBackend) else None
+            ),
             'current_config': {
                 'min_confidence': self.config.min_confidence,
                 'fuzzy_threshold': self.config.fuzzy_threshold,
@@ -0,0 +1,76 @@
+"""
+Extraction Result Wire Formats
+Encodes CLI skill results as pretty/compact JSON, JSON Lines or length-prefixed binary frames,
+with optional field projection so the Node side only receives what it reads
+"""
+
+import json
+import struct
+from typing import Dict, Iterable, List, Optional, Sequence
+
+FORMATS = ('json', 'compact', 'jsonl', 'binary')
+
+# Every field the CLI can emit, in output order
+ALL_FIELDS = ('skill', 'skill_id', 'skill_db_id', 'skill_db_match', 'category', 'confidence',
+              'method', 'context', 'position')
+FIELD_PRESETS = {
+    'all': ALL_FIELDS,
+    'minimal': ('skill_id', 'confidence', 'category')
+}
+
+# Binary layout: MAGIC, then frames of [uint32 big-endian length][UTF-8 compact JSON].
+# The first frame is the list of field names, every following frame one record as a
+# positional array in that order, so key names are sent once instead of per skill.
+BINARY_MAGIC = b'SKL1'
+_LENGTH = struct.Struct('>I')
+_COMPACT = {'separators': (',', ':'), 'ensure_ascii': False}
+
+def parse_fields(spec: Optional[str]) -> Sequence[str]:
+    """'all', 'minimal' or a comma-separated list of field names"""
+    if not spec:
+        return ALL_FIELDS
+    if spec in FIELD_PRESETS:
+        return FIELD_PRESETS[spec]
+    fields = tuple(field.strip() for field in spec.split(',') if field.strip())
+    unknown = [field for field in fields if field not in ALL_FIELDS]
+    if unknown or not fields:
+        raise ValueError(f"Unknown fields {unknown}; choose from {', '.join(ALL_FIELDS)}")
+    return fields
+
+def project(records: Iterable[Dict], fields: Sequence[str]) -> List[Dict]:
+    return [{field: record.get(field) for field in fields} for record in records]
+
+def _frame(payload) -> bytes:
+    data = json.dumps(payload, **_COMPACT).encode('utf-8')
+    return _LENGTH.pack(len(data)) + data
+
+def encode_results(records: List[Dict], fmt: str = 'json', fields: Sequence[str] = ALL_FIELDS) -> bytes:
+    """Serialize result records in one of FORMATS"""
+    if fmt == 'json':
+        return (json.dumps(project(records, fields), indent=2) + '\n').encode('utf-8')
+    if fmt == 'compact':
+        return (json.dumps(project(records, fields), **_COMPACT) + '\n').encode('utf-8')
+    if fmt == 'jsonl':
+        return b''.join(json.dumps(record, **_COMPACT).encode('utf-8') + b'\n'
+                        for record in project(records, fields))
+    if fmt == 'binary':
+        frames = [BINARY_MAGIC, _frame(list(fields))]
+        frames.extend(_frame([record.get(field) for field in fields]) for record in records)
+        return b''.join(frames)
+    raise ValueError(f"Unknown format {fmt!r}, expected one of {FORMATS}")
+
+def decode_binary(data: bytes) -> List[Dict]:
+    """Inverse of the binary encoding, for Python consumers and round-trip checks"""
+    if data[:len(BINARY_MAGIC)] != BINARY_MAGIC:
+        raise ValueError("Not a binary skill result stream")
+    offset = len(BINARY_MAGIC)
+    frames = []
+    while offset < len(data):
+        (length,) = _LENGTH.unpack_from(data, offset)
+        offset += _LENGTH.size
+        frames.append(json.loads(data[offset:offset + length].decode('utf-8')))
+        offset += length
+    if not frames:
+        raise ValueError("Binary skill result stream has no header frame")
+    fields = frames[0]
+    return [dict(zip(fields, values)) for values in frames[1:]]
@@ -6,8 +6,9 @@ import os
 import json
 import fitz  # PyMuPDF
 import spacy
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
 import re
+from bisect import bisect_left
 
 # Set up paths
 CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -18,6 +19,9 @@ MODEL_PATH = os.path.abspath(os.path.join(RESUME_PROJECT_PATH, 'TrainedModel', '
 if RESUME_PROJECT_PATH not in sys.path:
     sys.path.append(RESUME_PROJECT_PATH)
 
+from skill_rules import DEFAULT_RULE_ENGINE
+from skill_normalizer import get_normalizer
+
 # Common tech skills by category
 TECH_SKILLS = {
     'programming_languages': {
@@ -48,6 +52,7 @@ TECH_SKILLS = {
 
 # Combine all skills into a single set
 ALL_TECH_SKILLS = {skill.lower() for category in TECH_SKILLS.values() for skill in category}
+CATEGORY_NORMALIZER = get_normalizer({}, categories=TECH_SKILLS)
 
 # Common words that might be falsely identified as skills
 NON_SKILL_WORDS = {
@@ -58,6 +63,45 @@ NON_SKILL_WORDS = {
     'degree', 'gpa', 'grade', 'score', 'team', 'project', 'work', 'experience'
 }
 
+# Very common false positives that get misclassified by the NER model
+FALSE_POSITIVE_WORDS = {
+    # Generic business/work terms
+    'experience', 'work', 'team', 'project', 'development', 'management', 
+    'support', 'service', 'business', 'company', 'position', 'role',
+    'skills', 'knowledge', 'ability', 'background', 'requirements',
+    'responsibilities', 'duties', 'tasks', 'expertise',
+    
+    # Time-related terms that get misclassified
+    'years', 'months', 'time', 'year', 'month', 'daily', 'weekly',
+    'january', 'february', 'march', 'april', 'may', 'june',
+    'july', 'august', 'september', 'october', 'november', 'december',
+    
+    # Action words/verbs that shouldn't be skills
+    'worked', 'developed', 'created', 'designed', 'managed', 'led',
+    'built', 'implemented', 'maintained', 'tested', 'deployed',
+    'coordinated', 'collaborated', 'analyzed', 'optimized',
+    
+    # Education/career terms
+    'degree', 'bachelor', 'master', 'phd', 'university', 'college', 'school',
+    'education', 'course', 'training', 'certification', 'graduate',
+    
+    # Location/workplace terms
+    'remote', 'office', 'location', 'city', 'state', 'onsite',
+    
+    # Generic tech terms that are too broad to be useful
+    'software', 'hardware', 'system', 'application', 'technology',
+    'platform', 'solution', 'tool', 'framework', 'database',
+    'server', 'client', 'web', 'mobile', 'desktop',
+    
+    # Common resume words
+    'strong', 'excellent', 'proficient', 'advanced', 'skilled',
+    'familiar', 'experienced', 'knowledgeable',
+    
+    # Numbers and basic words
+    'one', 'two', 'three', 'four', 'five', 'several', 'multiple',
+    'the', 'and', 'or', 'with', 'using', 'including', 'such'
+}
+
 def is_valid_skill(skill: str) -> bool:
     """
     Enhanced validation for skills with better handling of edge cases
@@ -108,59 +152,58 @@ def is_valid_skill(skill: str) -> bool:
 
 def categorize_skill(skill: str) -> str:
     """Categorize a skill into its appropriate category"""
-    skill = skill.lower()
-    for category, skills in TECH_SKILLS.items():
-        if skill in skills:
-            return category
-    return 'other'
+    return CATEGORY_NORMALIZER.categorize(skill)
+
+# Non-technical context indicators that suggest a false positive when they
+# appear within CONTEXT_WINDOW characters of a candidate skill
+NON_TECH_CONTEXTS = [
+    'experience at', 'worked at', 'employed by', 'company', 'corporation',
+    'university', 'college', 'school', 'degree in', 'studied at',
+    'inc', 'ltd', 'corp', 'llc', 'years of', 'months of'
+]
+CONTEXT_WINDOW = 50
+
+# Zero-width lookahead so overlapping indicators are all found; shortest first so
+# each start offset records the indicator that ends earliest
+_NON_TECH_PATTERN = re.compile(
+    '(?=(' + '|'.join(re.escape(c) for c in sorted(NON_TECH_CONTEXTS, key=len)) + '))'
+)
+_MIN_INDICATOR_LEN = min(len(c) for c in NON_TECH_CONTEXTS)
+
+class NonTechContextIndex:
+    """Sorted offsets of non-tech indicator phrases in one document, built in a single pass"""
+    
+    def __init__(self, text: str):
+        self.text_lower = text.lower()
+        self.starts = []
+        self.ends = []
+        for match in _NON_TECH_PATTERN.finditer(self.text_lower):
+            self.starts.append(match.start())
+            self.ends.append(match.start() + len(match.group(1)))
+    
+    def has_indicator_near(self, start: int, end: int, window: int = CONTEXT_WINDOW) -> bool:
+        """True if an indicator lies fully inside [start - window, end + window)"""
+        window_start = max(0, start - window)
+        window_end = min(len(self.text_lower), end + window)
+        k = bisect_left(self.starts, window_start)
+        while k < len(self.starts) and self.starts[k] <= window_end - _MIN_INDICATOR_LEN:
+            if self.ends[k] <= window_end:
+                return True
+            k += 1
+        return False
 
-def is_likely_false_positive(skill: str, context: str) -> bool:
+def is_likely_false_positive(skill: str, context: str, index: Optional['NonTechContextIndex'] = None,
+                             span: Optional[Tuple[int, int]] = None) -> bool:
     """
     Simple but effective false positive detection to reduce noise
+    
+    Pass a NonTechContextIndex built once for `context` (and the candidate's span,
+    when known) so the surrounding-context check is a bisect lookup instead of a
+    rescan of the whole document per candidate.
     """
     skill_lower = skill.lower().strip()
-    context_lower = context.lower()
     
-    # Skip very common false positives that get misclassified
-    false_positive_words = {
-        # Generic business/work terms
-        'experience', 'work', 'team', 'project', 'development', 'management', 
-        'support', 'service', 'business', 'company', 'position', 'role',
-        'skills', 'knowledge', 'ability', 'background', 'requirements',
-        'responsibilities', 'duties', 'tasks', 'expertise',
-        
-        # Time-related terms that get misclassified
-        'years', 'months', 'time', 'year', 'month', 'daily', 'weekly',
-        'january', 'february', 'march', 'april', 'may', 'june',
-        'july', 'august', 'september', 'october', 'november', 'december',
-        
-        # Action words/verbs that shouldn't be skills
-        'worked', 'developed', 'created', 'designed', 'managed', 'led',
-        'built', 'implemented', 'maintained', 'tested', 'deployed',
-        'coordinated', 'collaborated', 'analyzed', 'optimized',
-        
-        # Education/career terms
-        'degree', 'bachelor', 'master', 'phd', 'university', 'college', 'school',
-        'education', 'course', 'training', 'certification', 'graduate',
-        
-        # Location/workplace terms
-        'remote', 'office', 'location', 'city', 'state', 'onsite',
-        
-        # Generic tech terms that are too broad to be useful
-        'software', 'hardware', 'system', 'application', 'technology',
-        'platform', 'solution', 'tool', 'framework', 'database',
-        'server', 'client', 'web', 'mobile', 'desktop',
-        
-        # Common resume words
-        'strong', 'excellent', 'proficient', 'advanced', 'skilled',
-        'familiar', 'experienced', 'knowledgeable',
-        
-        # Numbers and basic words
-        'one', 'two', 'three', 'four', 'five', 'several', 'multiple',
-        'the', 'and', 'or', 'with', 'using', 'including', 'such'
-    }
-    
-    if skill_lower in false_positive_words:
+    if skill_lower in FALSE_POSITIVE_WORDS:
         return True
     
     # Skip very short words unless they're known tech abbreviations
@@ -176,22 +219,15 @@ def is_likely_false_positive(skill: str, context: str) -> bool:
         return True
     
     # Skip if it looks like a company name or proper noun in wrong context
-    skill_positions = [m.start() for m in re.finditer(re.escape(skill_lower), context_lower)]
+    if index is None:
+        index = NonTechContextIndex(context)
     
-    for pos in skill_positions:
-        # Check surrounding context (50 characters each way)
-        start = max(0, pos - 50)
-        end = min(len(context_lower), pos + len(skill_lower) + 50)
-        surrounding = context_lower[start:end]
-        
-        # Non-technical context indicators that suggest false positive
-        non_tech_contexts = [
-            'experience at', 'worked at', 'employed by', 'company', 'corporation',
-            'university', 'college', 'school', 'degree in', 'studied at',
-            'inc', 'ltd', 'corp', 'llc', 'years of', 'months of'
-        ]
-        
-        if any(ctx in surrounding for ctx in non_tech_contexts):
+    if span is not None:
+        return index.has_indicator_near(span[0], span[1])
+    
+    context_lower = index.text_lower
+    for match in re.finditer(re.escape(skill_lower), context_lower):
+        if index.has_indicator_near(match.start(), match.start() + len(skill_lower)):
             return True
     
     return False
@@ -204,53 +240,31 @@ def extract_skills_from_text(text: str) -> List[Dict[str, str]]:
         # Process with spaCy's NER
         doc = nlp(text)
         skills = set()
+        context_index = NonTechContextIndex(text)
 
         # Extract skills using NER with false positive filtering
         for ent in doc.ents:
             if ent.label_ in ["SKILL", "TECHNOLOGY", "TOOL", "FRAMEWORK", "LANGUAGE"]:
                 skill = ent.text.strip()
-                if is_valid_skill(skill) and not is_likely_false_positive(skill, text):
+                span = (ent.start_char, ent.end_char)
+                if is_valid_skill(skill) and not is_likely_false_positive(skill, text, context_index, span):
                     skills.add(skill.lower())
                     print(f"✓ Valid skill: {skill}", file=sys.stderr)
                 else:
                     print(f"✗ Filtered: {skill}", file=sys.stderr)
         
-        # Pattern-based extraction for specific programming languages
+        # Pattern-based extraction for C++, C#, C, .NET, R, databases and SQL
+        # (single pass over the rule table shared with the resume analyzer). R was
+        # matched by the unguarded keyword loop here, so context guards stay off.
         text_lower = text.lower()
-        original_text = text  # Keep original case for exact pattern matching
-        
-        # C++ - various ways it could appear 
-        if re.search(r'c\+\+', text_lower) or re.search(r'c\s*\+\s*\+', text_lower) or re.search(r'\bcpp\b', text_lower):
-            skills.add('c++')
-        
-        # C# - various ways it could appear
-        if re.search(r'c#', text_lower) or re.search(r'c\s*sharp', text_lower) or re.search(r'\bcsharp\b', text_lower):
-            skills.add('c#')
-        
-        # C language - should be standalone 'C'
-        c_patterns = [r'\bc\b', r'\bc\s+programming\b', r'\bc\s+language\b']
-        for pattern in c_patterns:
-            if re.search(pattern, text_lower):
-                skills.add('c')
-                break
-        
-        # .NET framework - check both lowercase and original case since dot might be affected by case conversion
-        if re.search(r'\.net\b', text_lower) or re.search(r'\.NET\b', original_text) or re.search(r'\bdotnet\b', text_lower):
-            skills.add('.net')
-        
-        # Database
-        database_patterns = [r'\bdatabase\b', r'\bdb\b', r'\bdatabases\b']
-        for pattern in database_patterns:
-            if re.search(pattern, text_lower):
-                skills.add('database')
-                break
+        skills.update(DEFAULT_RULE_ENGINE.skills(text, context_guards=False))
         
         # Extract skills using keyword matching for other skills
         for skill in ALL_TECH_SKILLS:
             # For single-token skills
             if ' ' not in skill:
-                # Skip the ones we've already handled specifically
-                if skill in {'c', 'c++', 'c#'}:
+                # Skip the ones the rule engine already handled
+                if skill in DEFAULT_RULE_ENGINE.skill_ids:
                     continue
                 
                 if re.search(r'\b' + re.escape(skill) + r'\b', text_lower):
@@ -269,14 +283,19 @@ def extract_skills_from_text(text: str) -> List[Dict[str, str]]:
         
         for section in skill_sections:
             skill_text = section.group(2)
+            section_offset = section.start(2)
             # Extract skills from bullet points, commas, or newlines
-            skill_items = re.findall(
+            skill_items = re.finditer(
                 r'[-•]\s*([^,\n]+)|\b([^,\n:]+?)(?=,|\n|$)',
                 skill_text
             )
             for item in skill_items:
-                skill = (item[0] or item[1]).strip()
-                if is_valid_skill(skill) and not is_likely_false_positive(skill, text):
+                group = 1 if item.group(1) else 2
+                raw = item.group(group) or ''
+                skill = raw.strip()
+                start = section_offset + item.start(group) + (len(raw) - len(raw.lstrip()))
+                span = (start, start + len(skill))
+                if is_valid_skill(skill) and not is_likely_false_positive(skill, text, context_index, span):
                     skills.add(skill.lower())
                     print(f"✓ Section skill: {skill}", file=sys.stderr)
         
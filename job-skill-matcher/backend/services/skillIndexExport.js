@@ -0,0 +1,66 @@
+// services/skillIndexExport.js
+// Exports the skills table for the Python extractor's database-id index (skill_db_index.py)
+const fs = require('fs');
+const path = require('path');
+const db = require('../config/database');
+
+const SKILL_INDEX_PATH = path.join(__dirname, '../data/skill_db_index.json');
+const MAX_AGE_MS = parseInt(process.env.SKILL_INDEX_MAX_AGE_MS, 10) || 10 * 60 * 1000;
+
+let exportInFlight = null;
+
+// Write the snapshot to a temp file and rename it, so the extractor never reads a partial export
+const exportSkillIndex = () => {
+    if (exportInFlight) return exportInFlight;
+
+    exportInFlight = (async () => {
+        const [rows] = await db.query('SELECT skill_id, skill_name FROM skills ORDER BY skill_id');
+        await fs.promises.mkdir(path.dirname(SKILL_INDEX_PATH), { recursive: true });
+
+        const tmpPath = `${SKILL_INDEX_PATH}.${process.pid}.tmp`;
+        await fs.promises.writeFile(tmpPath, JSON.stringify({
+            exported_at: new Date().toISOString(),
+            skills: rows.map(row => ({ skill_id: row.skill_id, skill_name: row.skill_name }))
+        }));
+        await fs.promises.rename(tmpPath, SKILL_INDEX_PATH);
+
+        console.log(`✅ Exported ${rows.length} skills to ${path.basename(SKILL_INDEX_PATH)}`);
+        return rows.length;
+    })().finally(() => {
+        exportInFlight = null;
+    });
+
+    return exportInFlight;
+};
+
+// Block only when there is no export yet; a stale one is refreshed in the background
+const ensureSkillIndex = async () => {
+    let stats = null;
+    try {
+        stats = await fs.promises.stat(SKILL_INDEX_PATH);
+    } catch (error) {
+        return exportSkillIndex();
+    }
+
+    if (Date.now() - stats.mtimeMs > MAX_AGE_MS) {
+        exportSkillIndex().catch(error => {
+            console.error('⚠️ Skill index refresh failed:', error.message);
+        });
+    }
+};
+
+module.exports = {
+    SKILL_INDEX_PATH,
+    exportSkillIndex,
+    ensureSkillIndex
+};
+
+// Allow `node services/skillIndexExport.js` from cron or deploy scripts
+if (require.main === module) {
+    exportSkillIndex()
+        .then(() => process.exit(0))
+        .catch(error => {
+            console.error('❌ Skill index export failed:', error);
+            process.exit(1);
+        });
+}
@@ -0,0 +1,134 @@
+"""
+Skill Database Id Index
+Maps extracted skills to `skills.skill_id` rows using an exported snapshot of the skills table,
+so the upload path no longer matches every extracted skill against every database skill in JS
+"""
+
+import json
+import os
+import re
+import sys
+import threading
+from typing import Dict, List, Optional, Tuple
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+# Written by services/skillIndexExport.js (see exportSkillIndex)
+DEFAULT_SKILL_INDEX_PATH = os.path.join(CURRENT_DIR, 'data', 'skill_db_index.json')
+
+_SEPARATORS = re.compile(r'[\s._\-]+')
+
+def name_key(name: str) -> str:
+    """Case- and separator-insensitive key: 'Node.js', 'node js' and 'NodeJS' agree"""
+    return _SEPARATORS.sub('', name.lower())
+
+def is_partial_match(skill: str, db_name: str) -> bool:
+    """Variation and substring rules the upload controller used to apply in JS (both lowercase)"""
+    return (
+        (skill == 'js' and 'javascript' in db_name)
+        or (skill == 'javascript' and 'js' in db_name)
+        or (skill in ('nodejs', 'node.js') and 'node' in db_name)
+        or ('react' in skill and 'react' in db_name)
+        or ('angular' in skill and 'angular' in db_name)
+        or (skill == 'mongodb' and 'mongo' in db_name)
+        or (skill == 'postgresql' and 'postgres' in db_name)
+        or skill in db_name
+        or db_name in skill
+    )
+
+class SkillDbIndex:
+    """Ontology skill ids and normalized names -> skills table ids for one export"""
+
+    def __init__(self, rows: List[Dict], normalizer, exported_at: Optional[str] = None):
+        self.normalizer = normalizer
+        self.exported_at = exported_at
+        self.by_name: Dict[str, int] = {}
+        self.by_ontology_id: Dict[str, int] = {}
+        # (skill_id, lowercase name) in skill_id order, for the partial-match fallback
+        self.names: List[Tuple[int, str]] = []
+        self._partial_matches: Dict[str, Optional[int]] = {}
+
+        # Lowest skill_id wins when two rows normalize to the same key
+        for row in sorted(rows, key=lambda r: r['skill_id']):
+            skill_name = row.get('skill_name') or ''
+            if not skill_name.strip():
+                continue
+            self.by_name.setdefault(name_key(skill_name), row['skill_id'])
+            self.names.append((row['skill_id'], skill_name.lower()))
+            ontology_id = normalizer.resolve(skill_name).skill_id
+            if ontology_id is not None:
+                self.by_ontology_id.setdefault(ontology_id, row['skill_id'])
+
+        self.stats = {'resolved': 0, 'partial': 0, 'unresolved': 0}
+
+    @classmethod
+    def load(cls, path: str, normalizer) -> 'SkillDbIndex':
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return cls(data.get('skills', []), normalizer, data.get('exported_at'))
+
+    def resolve(self, skill: str) -> Tuple[Optional[int], Optional[str]]:
+        """(skill_db_id, match_type) where match_type is 'exact', 'alias', 'partial' or None"""
+        db_id = self.by_name.get(name_key(skill))
+        if db_id is not None:
+            self.stats['resolved'] += 1
+            return db_id, 'exact'
+
+        resolved = self.normalizer.resolve(skill)
+        if resolved.skill_id is not None:
+            db_id = self.by_ontology_id.get(resolved.skill_id)
+            if db_id is None:
+                db_id = self.by_name.get(name_key(resolved.canonical_name))
+            if db_id is not None:
+                self.stats['resolved'] += 1
+                return db_id, 'alias'
+
+        db_id = self._partial_match(skill.lower().strip())
+        if db_id is not None:
+            self.stats['partial'] += 1
+            return db_id, 'partial'
+
+        self.stats['unresolved'] += 1
+        return None, None
+
+    def _partial_match(self, skill: str) -> Optional[int]:
+        """First row (by skill_id) matching a variation or substring rule, memoized per skill"""
+        if not skill:
+            return None
+        if skill not in self._partial_matches:
+            self._partial_matches[skill] = next(
+                (skill_id for skill_id, db_name in self.names if is_partial_match(skill, db_name)), None
+            )
+        return self._partial_matches[skill]
+
+    def get_stats(self) -> Dict:
+        return dict(self.stats,
+                    db_skills=len(self.by_name),
+                    ontology_ids=len(self.by_ontology_id),
+                    exported_at=self.exported_at)
+
+_indexes: Dict[str, Tuple[float, SkillDbIndex]] = {}
+_indexes_lock = threading.Lock()
+
+def load_skill_db_index(normalizer, path: str = DEFAULT_SKILL_INDEX_PATH) -> Optional[SkillDbIndex]:
+    """Index for the current export at `path`, rebuilt only when the file changes
+
+    Returns None when no export exists yet; callers then leave skill_db_id empty.
+    """
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        print(f"⚠️ No skill index export at {path}; database ids will not be resolved", file=sys.stderr)
+        return None
+
+    key = f'{path}:{id(normalizer)}'
+    with _indexes_lock:
+        cached = _indexes.get(key)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        try:
+            index = SkillDbIndex.load(path, normalizer)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"⚠️ Could not load skill index export {path}: {e}", file=sys.stderr)
+            return cached[1] if cached else None
+        _indexes[key] = (mtime, index)
+        return index
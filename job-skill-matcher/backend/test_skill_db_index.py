@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Skill Database Index Tests
+Exact, alias and partial-name resolution of skills table ids in skill_db_index.py
+"""
+
+import sys
+import os
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(CURRENT_DIR)
+sys.path.append(os.path.join(CURRENT_DIR, '..', '..', 'resume 1.0', 'Resume_Analyzer-NLP'))
+
+from skill_normalizer import SkillNormalizer
+from skill_db_index import SkillDbIndex
+
+ROWS = [
+    {'skill_id': 1, 'skill_name': 'JavaScript'},
+    {'skill_id': 2, 'skill_name': 'Node.js'},
+    {'skill_id': 3, 'skill_name': 'PostgreSQL Database'},
+    {'skill_id': 4, 'skill_name': 'React Native'},
+    {'skill_id': 5, 'skill_name': 'Machine Learning'},
+]
+
+def make_index() -> SkillDbIndex:
+    normalizer = SkillNormalizer({'machine_learning': 'Machine Learning'}, aliases={'machine_learning': ['ML']})
+    return SkillDbIndex(ROWS, normalizer)
+
+def test_exact_and_alias_first():
+    index = make_index()
+    assert index.resolve('node js') == (2, 'exact')
+    assert index.resolve('ML') == (5, 'alias')
+
+def test_partial_fallback_replaces_the_js_matching():
+    index = make_index()
+    assert index.resolve('JS') == (1, 'partial')
+    assert index.resolve('postgresql') == (3, 'partial')
+    assert index.resolve('React.js') == (4, 'partial')
+    assert index.resolve('Cobol') == (None, None)
+    assert index.resolve('  ') == (None, None)
+    assert index.get_stats()['partial'] == 3 and index.get_stats()['unresolved'] == 2
+
+def test_partial_matches_are_memoized():
+    index = make_index()
+    index.resolve('JS')
+    index.names.clear()  # a cached answer must not rescan the names
+    assert index.resolve('js') == (1, 'partial')
+
+def main():
+    """Run all checks without pytest"""
+    tests = [obj for name, obj in sorted(globals().items()) if name.startswith('test_') and callable(obj)]
+    for test in tests:
+        test()
+        print(f"✅ {test.__name__}")
+    print(f"\n🎉 {len(tests)} skill db index checks passed")
+
+if __name__ == "__main__":
+    main()
@@ -8,12 +8,13 @@ Date: October 2025
 """
 
 import spacy
-from spacy.training.example import Example
 import random
 import json
 import os
 from pathlib import Path
 
+from docbin_corpus import CORPUS_DIR, load_or_build_corpus, train_epochs, timing_summary
+
 # Comprehensive Skills Database - 5000+ Training Examples
 COMPREHENSIVE_SKILLS_DB = {
     # Programming Languages (100+ examples)
@@ -290,42 +291,36 @@ def train_large_scale_model(iterations=100, output_dir="TrainedModel/skills"):
     ner = nlp.add_pipe("ner", name="ner", last=True)
     ner.add_label("SKILL")
     
+    # Tokenize and align the corpus once; reruns on unchanged data load the DocBin
+    corpus_path = os.path.join(CORPUS_DIR, "large_scale_train.spacy")
+    examples, corpus = load_or_build_corpus(nlp, training_data, corpus_path)
+    source = "Loaded cached" if corpus["cached"] else f"Built in {corpus['build_seconds']:.2f}s:"
+    print(f"📦 {source} DocBin {corpus_path} ({len(examples):,} examples)")
+    
     # Begin training
     print("🔥 Starting training process...")
-    nlp.begin_training()
+    nlp.initialize(lambda: examples)
     
     # Track best loss
     best_loss = float('inf')
+    epoch_seconds = []
     
-    # Training loop with progress tracking
-    for iteration in range(iterations):
-        random.shuffle(training_data)
-        losses = {}
-        batch_size = 32
-        
-        # Process in batches
-        for i in range(0, len(training_data), batch_size):
-            batch = training_data[i:i + batch_size]
-            examples = []
-            
-            for text, annotations in batch:
-                doc = nlp.make_doc(text)
-                example = Example.from_dict(doc, annotations)
-                examples.append(example)
-            
-            nlp.update(examples, drop=0.3, losses=losses)
-        
-        current_loss = losses.get('ner', 0)
+    # Training loop with progress tracking; minibatches grow from 4 to 32 examples
+    for iteration, current_loss, seconds in train_epochs(nlp, examples, iterations, drop=0.3):
+        epoch_seconds.append(seconds)
         if current_loss < best_loss:
             best_loss = current_loss
             
         # Progress reporting
         if (iteration + 1) % 10 == 0:
-            print(f"🔄 Iteration {iteration + 1:3d}/{iterations} | Loss: {current_loss:.4f} | Best: {best_loss:.4f}")
+            print(f"🔄 Iteration {iteration + 1:3d}/{iterations} | Loss: {current_loss:.4f} | Best: {best_loss:.4f} | {seconds:.2f}s")
         elif (iteration + 1) % 25 == 0:
             print(f"🎯 Quarter milestone: {iteration + 1}/{iterations} iterations complete")
     
+    timings = timing_summary(epoch_seconds, corpus)
     print(f"\n✅ Training completed! Final loss: {best_loss:.4f}")
+    print(f"⏱️ Wall clock: {timings['training_seconds']:.1f}s total, "
+          f"{timings['seconds_per_iteration']:.2f}s/iteration, {timings['examples_per_second']:,.0f} examples/s")
     
     # Test the model
     print("\n🧪 Testing trained model...")
@@ -358,7 +353,8 @@ def train_large_scale_model(iterations=100, output_dir="TrainedModel/skills"):
         "unique_skills": skill_count,
         "final_loss": float(best_loss),  # Convert to regular float
         "skill_categories": list(COMPREHENSIVE_SKILLS_DB.keys()),
-        "category_counts": {cat: len(skills) for cat, skills in COMPREHENSIVE_SKILLS_DB.items()}
+        "category_counts": {cat: len(skills) for cat, skills in COMPREHENSIVE_SKILLS_DB.items()},
+        "timings": timings
     }
     
     with open(f"{output_dir}/training_metadata.json", "w") as f:
@@ -371,6 +367,7 @@ def train_large_scale_model(iterations=100, output_dir="TrainedModel/skills"):
     print(f"   • Unique Skills: {skill_count:,}")
     print(f"   • Training Iterations: {iterations}")
     print(f"   • Final Loss: {best_loss:.4f}")
+    print(f"   • Training Time: {timings['training_seconds']:.1f}s")
     print(f"   • Model Location: {output_dir}")
     
     return nlp
@@ -1,6 +1,7 @@
 import spacy
-import random
-from spacy.training.example import Example
+import os
+
+from docbin_corpus import CORPUS_DIR, load_or_build_corpus, train_epochs, timing_summary
 
 UPDATED_TRAIN_DATA = [
     ("Proficient in Python, Java, and C++", {"entities": [(13, 19, "SKILL"), (21, 25, "SKILL"), (30, 33, "SKILL")]}),
@@ -160,20 +161,15 @@ def train_spacy_ner_updated(data, iterations=20):
     ner = nlp.add_pipe("ner", name="ner", last=True)
     ner.add_label("SKILL")  # Add the label for skills recognition
 
-    # Begin training
-    nlp.begin_training()
+    # Build the Examples once from a serialized DocBin
+    examples, corpus = load_or_build_corpus(nlp, data, os.path.join(CORPUS_DIR, "updated_train.spacy"))
 
-    # Iterate through training data
-    for itn in range(iterations):
-        random.shuffle(data)
-        losses = {}
-        # Create examples and update the model
-        for text, annotations in data:
-            doc = nlp.make_doc(text)
-            example = Example.from_dict(doc, annotations)
-            nlp.update([example], drop=0.5, losses=losses)
+    # Begin training
+    nlp.initialize(lambda: examples)
 
-        print("Iteration:", itn+1, "Loss:", losses)
+    # Iterate through training data in compounding minibatches
+    for itn, loss, seconds in train_epochs(nlp, examples, iterations, drop=0.5):
+        print("Iteration:", itn+1, "Loss:", {"ner": loss}, f"({seconds:.2f}s)")
 
     return nlp
 
@@ -247,40 +243,31 @@ def train_enhanced_model(data, iterations=50):
     ner = nlp.add_pipe("ner", name="ner", last=True)
     ner.add_label("SKILL")
     
-    nlp.begin_training()
+    # Tokenize and align once; each iteration reuses the pre-built Examples
+    examples, corpus = load_or_build_corpus(nlp, data, os.path.join(CORPUS_DIR, "enhanced_train.spacy"))
+    nlp.initialize(lambda: examples)
     
     best_loss = float('inf')
+    epoch_seconds = []
     
     print("🚀 Starting Enhanced Training...")
     print(f"📊 Training examples: {len(data):,}")
     print("=" * 50)
     
-    for itn in range(iterations):
-        random.shuffle(data)
-        losses = {}
-        
-        # Process in batches for better performance
-        batch_size = 16
-        for i in range(0, len(data), batch_size):
-            batch = data[i:i + batch_size]
-            examples = []
-            
-            for text, annotations in batch:
-                doc = nlp.make_doc(text)
-                example = Example.from_dict(doc, annotations)
-                examples.append(example)
-            
-            nlp.update(examples, drop=0.3, losses=losses)
-        
-        current_loss = losses.get('ner', 0)
+    # Minibatches grow from 4 to 32 examples as training settles
+    for itn, current_loss, seconds in train_epochs(nlp, examples, iterations, drop=0.3):
+        epoch_seconds.append(seconds)
         if current_loss < best_loss:
             best_loss = current_loss
         
         # Progress reporting
         if (itn + 1) % 10 == 0:
-            print(f"🔄 Iteration {itn + 1:2d}/{iterations} | Loss: {current_loss:.4f} | Best: {best_loss:.4f}")
+            print(f"🔄 Iteration {itn + 1:2d}/{iterations} | Loss: {current_loss:.4f} | Best: {best_loss:.4f} | {seconds:.2f}s")
     
+    nlp.meta["timings"] = timing_summary(epoch_seconds, corpus)
     print(f"\n✅ Training complete! Best loss: {best_loss:.4f}")
+    print(f"⏱️ Wall clock: {nlp.meta['timings']['training_seconds']:.1f}s "
+          f"({nlp.meta['timings']['seconds_per_iteration']:.2f}s/iteration)")
     return nlp
 
 # Train with large-scale data
@@ -331,7 +318,8 @@ training_stats = {
     "iterations": 50,
     "test_cases": len(test_cases),
     "total_skills_detected": total_skills_detected,
-    "average_skills_per_case": total_skills_detected/len(test_cases)
+    "average_skills_per_case": total_skills_detected/len(test_cases),
+    "timings": trained_nlp_skills_enhanced.meta["timings"]
 }
 
 with open(f"{output_dir}/training_stats.json", "w") as f:
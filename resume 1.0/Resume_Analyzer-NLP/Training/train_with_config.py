@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Config-Driven Skills Model Training
+===================================
+Trains the SKILL NER model from config.cfg with spaCy's training loop: NER precision,
+recall, F1 and words/second are measured on held-out resumes every eval_frequency steps,
+training stops once F1 has not improved for `patience` steps, and model-best/ keeps the
+best checkpoint
+
+    python train_with_config.py --output TrainedModel/runs/latest
+    python train_with_config.py --output TrainedModel/runs/latest --training.patience 800
+"""
+
+import argparse
+import ast
+import csv
+import json
+import os
+import sys
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import spacy
+from spacy.cli.train import train as spacy_train
+from spacy.cli._util import parse_config_overrides
+
+TRAINING_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_DIR = os.path.dirname(TRAINING_DIR)
+sys.path.append(PROJECT_DIR)
+
+from docbin_corpus import CORPUS_DIR, ensure_docbin
+from train_large_scale import generate_contextual_training_data
+from feedback_finetuner import BENCHMARK_CSV, annotate, surface_forms
+from ensemble_skill_extractor import SkillOntology, MODEL_REGISTRY_DIR
+from model_registry import ModelRegistry
+
+CONFIG_PATH = os.path.join(TRAINING_DIR, 'config.cfg')
+RESUMES_DIR = os.path.join(PROJECT_DIR, '..', '..', 'test_resumes')
+LOG_FILE = 'training_log.jsonl'
+
+def resume_dev_data(nlp, size: int = 200, metadata_csv: str = BENCHMARK_CSV,
+                    resumes_dir: str = RESUMES_DIR) -> List[Tuple[str, Dict]]:
+    """(text, {"entities": [...]}) for the first `size` resumes, labelled with their expected skills
+
+    These are the resumes feedback_finetuner benchmarks on, so scores from both line up.
+    None of them appear in the generated training data.
+    """
+    forms = surface_forms(SkillOntology())
+    csv.field_size_limit(sys.maxsize)
+    dev_data = []
+    with open(metadata_csv, 'r', encoding='utf-8', newline='') as f:
+        for row in csv.DictReader(f):
+            if len(dev_data) >= size:
+                break
+            resume_path = os.path.join(resumes_dir, f"{row['resume_id']}.txt")
+            if os.path.exists(resume_path):
+                with open(resume_path, 'r', encoding='utf-8') as resume_file:
+                    text = resume_file.read()
+            else:
+                text = row['resume_text']
+            reference = annotate(nlp, text, ast.literal_eval(row['expected_skills']), forms).reference
+            entities = [(ent.start_char, ent.end_char, ent.label_) for ent in reference.ents]
+            dev_data.append((text, {'entities': entities}))
+    return dev_data
+
+def read_log(log_path: str) -> List[Dict]:
+    """One record per evaluation written by spacy.ConsoleLogger.v3"""
+    if not os.path.exists(log_path):
+        return []
+    with open(log_path, 'r', encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def train_with_config(output_dir: str, config_path: str = CONFIG_PATH, dev_size: int = 200,
+                      overrides: Optional[Dict] = None, publish: bool = False,
+                      corpus_dir: str = CORPUS_DIR) -> Dict:
+    """Build the corpora, run the config's training loop and describe the best checkpoint"""
+    print("🚀 Starting Config-Driven Skills Model Training")
+    print("=" * 60)
+    nlp = spacy.blank("en")
+
+    train_path = os.path.join(corpus_dir, "large_scale_train.spacy")
+    train_info = ensure_docbin(nlp, generate_contextual_training_data(), train_path)
+    dev_path = os.path.join(corpus_dir, f"dev_resumes_{dev_size}.spacy")
+    dev_info = ensure_docbin(nlp, resume_dev_data(nlp, dev_size), dev_path)
+    print(f"📦 Train: {train_info['examples']:,} generated examples | Dev: {dev_info['examples']:,} held-out resumes")
+
+    os.makedirs(output_dir, exist_ok=True)
+    log_path = os.path.join(output_dir, LOG_FILE)
+    if os.path.exists(log_path):
+        os.remove(log_path)  # the logger refuses to overwrite an old log
+    run_overrides = {
+        'paths.train': train_path,
+        'paths.dev': dev_path,
+        'training.logger.output_file': log_path,
+        **(overrides or {})
+    }
+
+    start_time = time.perf_counter()
+    spacy_train(config_path, output_dir, overrides=run_overrides)
+    training_seconds = time.perf_counter() - start_time
+
+    evaluations = read_log(log_path)
+    if not evaluations:
+        raise RuntimeError(f"Training wrote no evaluations to {log_path}")
+    best = max(evaluations, key=lambda record: record['score'])
+    config = spacy.util.load_config(config_path, overrides=run_overrides)
+    max_steps = config['training']['max_steps']
+    last_step = evaluations[-1]['step']
+
+    best_dir = os.path.join(output_dir, 'model-best')
+    metadata = {
+        "model_name": "Config-Trained Skills Model",
+        "training_date": datetime.now().isoformat(),
+        "config": os.path.abspath(config_path),
+        "training_examples": train_info['examples'],
+        "dev_examples": dev_info['examples'],
+        "eval_frequency": config['training']['eval_frequency'],
+        "patience": config['training']['patience'],
+        "steps_trained": last_step,
+        "stopped_early": bool(max_steps) and last_step < max_steps,
+        "best_step": best['step'],
+        # ConsoleLogger scales P/R/F to percentages; stored as 0-1 like the benchmark scores
+        "benchmark": {
+            'precision': best['scores'].get('ents_p', 0.0) / 100,
+            'recall': best['scores'].get('ents_r', 0.0) / 100,
+            'f1': best['scores'].get('ents_f', 0.0) / 100,
+            'words_per_second': best['scores'].get('speed', 0.0)
+        },
+        "training_seconds": round(training_seconds, 2)
+    }
+    with open(os.path.join(best_dir, "training_metadata.json"), "w") as f:
+        json.dump(metadata, f, indent=2)
+
+    print(f"\n✅ Best checkpoint: step {best['step']} | F1 {metadata['benchmark']['f1']:.3f} | "
+          f"P {metadata['benchmark']['precision']:.3f} | R {metadata['benchmark']['recall']:.3f}")
+    stop_reason = "no F1 improvement" if metadata['stopped_early'] else "max_steps reached"
+    print(f"⏱️ {last_step} steps in {training_seconds:.1f}s ({stop_reason})")
+    print(f"💾 Best model: {best_dir}")
+
+    if publish:
+        metadata['version'] = ModelRegistry(MODEL_REGISTRY_DIR).import_directory(best_dir, metadata)
+        print(f"📤 Published as model version {metadata['version']}")
+    return metadata
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Train the skills NER model from config.cfg with early stopping',
+        epilog='Extra --section.key value arguments override config.cfg'
+    )
+    parser.add_argument('--output', default=os.path.join('TrainedModel', 'runs', 'latest'))
+    parser.add_argument('--config', default=CONFIG_PATH)
+    parser.add_argument('--dev-size', type=int, default=200, help='Held-out resumes to evaluate on')
+    parser.add_argument('--publish', action='store_true',
+                        help='Publish model-best to the model registry for serving workers')
+    args, extra = parser.parse_known_args()
+
+    train_with_config(args.output, args.config, args.dev_size,
+                      overrides=parse_config_overrides(extra), publish=args.publish)
+
+if __name__ == "__main__":
+    main()
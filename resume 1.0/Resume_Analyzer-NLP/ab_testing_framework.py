@@ -3,15 +3,23 @@ A/B Testing Framework for Skill Extraction Models
 Supports continuous monitoring and performance comparison
 """
 
+import atexit
+import hashlib
 import json
+import math
+import os
 import random
+import sqlite3
+import sys
+import threading
+import time
 import uuid
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field, fields
 from enum import Enum
-import statistics
 from collections import defaultdict
+from contextlib import contextmanager
 
 class TestStatus(Enum):
     ACTIVE = "active"
@@ -28,6 +36,7 @@ class TestVariant:
     config: Dict
     traffic_percentage: float
     is_control: bool = False
+    status: str = "active"  # 'active', 'paused' or 'downweighted' (set by guardrails)
 
 @dataclass
 class TestMetrics:
@@ -38,10 +47,175 @@ class TestMetrics:
     extraction_time: float
     user_satisfaction: float
     total_extractions: int
+    memory_mb: float = 0.0  # RSS growth during the request (see current_rss_mb)
     
     def to_dict(self) -> Dict:
         return asdict(self)
 
+def current_rss_mb() -> float:
+    """Resident set size of this process in MB
+
+    TestMetrics.memory_mb is the difference across one extraction, not this total:
+    the whole-process figure is the same for every variant a worker serves. Without
+    /proc this falls back to the peak RSS, whose growth still marks requests that
+    raised it.
+    """
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError, AttributeError):
+        try:
+            import resource
+        except ImportError:
+            return 0.0
+        scale = 1024 * 1024 if sys.platform == 'darwin' else 1024
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale
+
+def metric_names() -> List[str]:
+    return [metric_field.name for metric_field in fields(TestMetrics)]
+
+def result_metric_names() -> List[str]:
+    """Metrics reported in test results (the float-valued ones)"""
+    return [metric_field.name for metric_field in fields(TestMetrics) if metric_field.type in (float, 'float')]
+
+@dataclass
+class MetricAccumulator:
+    """Running count/mean/variance (Welford) and min/max for one metric of one variant"""
+    count: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+    min_value: Optional[float] = None
+    max_value: Optional[float] = None
+
+    def update(self, value: float):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.min_value = value if self.min_value is None else min(self.min_value, value)
+        self.max_value = value if self.max_value is None else max(self.max_value, value)
+
+    def merge(self, other: 'MetricAccumulator'):
+        """Combine two partial aggregates (Chan et al.), e.g. from separate workers"""
+        if other.count == 0:
+            return
+        if self.count == 0:
+            self.count, self.mean, self.m2 = other.count, other.mean, other.m2
+            self.min_value, self.max_value = other.min_value, other.max_value
+            return
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / total
+        self.m2 += other.m2 + delta * delta * self.count * other.count / total
+        self.count = total
+        self.min_value = min(self.min_value, other.min_value)
+        self.max_value = max(self.max_value, other.max_value)
+
+    @property
+    def variance(self) -> float:
+        """Sample variance, matching statistics.variance"""
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self) -> float:
+        return max(self.variance, 0.0) ** 0.5
+
+    def summary(self) -> Dict:
+        return {'mean': self.mean, 'std': self.std, 'min': self.min_value, 'max': self.max_value}
+
+# Metrics whose tails matter (SLOs are on p95/p99), tracked with a quantile sketch as well
+SKETCHED_METRICS = ('extraction_time', 'memory_mb')
+REPORTED_QUANTILES = (0.5, 0.9, 0.95, 0.99)
+
+class QuantileSketch:
+    """DDSketch-style quantile sketch with relative accuracy `alpha`
+
+    A positive value x goes to bucket ceil(log_gamma(x)) with gamma = (1+a)/(1-a), so
+    every quantile estimate is within a factor (1 +/- a) of a real sample. Buckets are
+    plain counts, which makes sketches from different workers merge by addition.
+    """
+
+    ZERO_BUCKET = -2 ** 31   # values <= MIN_VALUE (e.g. 0.0 s)
+    MIN_VALUE = 1e-9
+
+    def __init__(self, alpha: float = 0.01, bins: Optional[Dict[int, int]] = None):
+        self.alpha = alpha
+        self.gamma = (1 + alpha) / (1 - alpha)
+        self._log_gamma = math.log(self.gamma)
+        self.bins: Dict[int, int] = defaultdict(int, bins or {})
+
+    def bucket(self, value: float) -> int:
+        if value <= self.MIN_VALUE:
+            return self.ZERO_BUCKET
+        return math.ceil(math.log(value) / self._log_gamma)
+
+    def add(self, value: float, count: int = 1):
+        self.bins[self.bucket(value)] += count
+
+    def merge(self, other: 'QuantileSketch'):
+        if abs(other.alpha - self.alpha) > 1e-12:
+            raise ValueError("Cannot merge sketches with different relative accuracy")
+        for bucket, count in other.bins.items():
+            self.bins[bucket] += count
+
+    @property
+    def count(self) -> int:
+        return sum(self.bins.values())
+
+    def quantile(self, q: float) -> Optional[float]:
+        total = self.count
+        if total == 0:
+            return None
+        rank = q * (total - 1)
+        seen = 0
+        for bucket in sorted(self.bins):
+            seen += self.bins[bucket]
+            if seen > rank:
+                if bucket == self.ZERO_BUCKET:
+                    return 0.0
+                # Midpoint (in relative terms) of (gamma^(k-1), gamma^k]
+                return 2 * self.gamma ** bucket / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.bins) / (self.gamma + 1)
+
+    def percentiles(self, quantiles=REPORTED_QUANTILES) -> Dict[str, Optional[float]]:
+        return {f"p{round(q * 100):d}": self.quantile(q) for q in quantiles}
+
+@dataclass
+class GuardrailRule:
+    """Limit on a variant's metric, absolute and/or relative to control
+
+    `statistic` is 'mean', 'max' or a percentile such as 'p95' (from the quantile
+    sketch). When the limit is exceeded the variant is paused (its traffic goes to
+    control) or downweighted to `downweight_factor` of its traffic.
+    """
+    metric: str
+    statistic: str = 'p95'
+    max_ratio_to_control: Optional[float] = None
+    max_absolute: Optional[float] = None
+    min_samples: int = 50
+    action: str = 'pause'  # 'pause' or 'downweight'
+    downweight_factor: float = 0.5
+
+    def describe(self) -> str:
+        limits = []
+        if self.max_ratio_to_control is not None:
+            limits.append(f"<= {self.max_ratio_to_control:g}x control")
+        if self.max_absolute is not None:
+            limits.append(f"<= {self.max_absolute:g}")
+        return f"{self.metric} {self.statistic} {' and '.join(limits)}"
+
+def default_guardrails() -> List[GuardrailRule]:
+    """p95 latency may not exceed control by more than 25%
+
+    No memory rule by default: per-request RSS growth is mostly zero once a worker is
+    warm and is shared between concurrent requests, so a ratio on it pauses variants
+    on noise. Add one explicitly (e.g. an absolute memory_mb max) where workers serve
+    one request at a time.
+    """
+    return [
+        GuardrailRule(metric='extraction_time', statistic='p95', max_ratio_to_control=1.25)
+    ]
+
 @dataclass
 class ABTest:
     """A/B test configuration and state"""
@@ -57,6 +231,8 @@ class ABTest:
     confidence_level: float = 0.95
     power: float = 0.8
     created_by: str = "system"
+    assignment_salt: str = ""
+    guardrails: List[GuardrailRule] = field(default_factory=list)
     
     def to_dict(self) -> Dict:
         return {
@@ -71,18 +247,579 @@ class ABTest:
             'minimum_sample_size': self.minimum_sample_size,
             'confidence_level': self.confidence_level,
             'power': self.power,
-            'created_by': self.created_by
+            'created_by': self.created_by,
+            'assignment_salt': self.assignment_salt,
+            'guardrails': [asdict(rule) for rule in self.guardrails]
         }
 
+ASSIGNMENT_BUCKETS = 2 ** 64
+
+def assignment_point(test_id: str, user_id: str, salt: str = "") -> float:
+    """Stable position of a user in [0, 100) for one test
+
+    Hashing (salt, test_id, user_id) gives every user the same variant on every call
+    and in every process without storing anything, while separate tests (or a new
+    salt) shuffle users independently.
+    """
+    digest = hashlib.sha256(f"{salt}\x1f{test_id}\x1f{user_id}".encode('utf-8')).digest()
+    return int.from_bytes(digest[:8], 'big') / ASSIGNMENT_BUCKETS * 100.0
+
+def pick_variant(variants: List[TestVariant], point: float) -> TestVariant:
+    """Map a point in [0, 100) onto the variants' cumulative traffic percentages"""
+    cumulative = 0.0
+    for variant in variants:
+        cumulative += variant.traffic_percentage
+        if point < cumulative:
+            return variant
+    # Rounding in the percentages; never fall through to a paused (0%) variant
+    return next((v for v in reversed(variants) if v.traffic_percentage > 0), variants[-1])
+
+class ABTestStore:
+    """SQLite persistence for tests, variants, assignments and metric events
+
+    Runs in WAL mode so readers never block the single writer; every write is a
+    small insert/update of the affected rows instead of rewriting all state.
+    Several processes may share one database: writes take SQLite's write lock up
+    front (BEGIN IMMEDIATE) and metric updates are merges done by the upsert itself.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        );
+        CREATE TABLE IF NOT EXISTS tests (
+            test_id TEXT PRIMARY KEY,
+            name TEXT NOT NULL,
+            description TEXT,
+            start_date TEXT NOT NULL,
+            end_date TEXT NOT NULL,
+            status TEXT NOT NULL,
+            target_metric TEXT NOT NULL,
+            minimum_sample_size INTEGER NOT NULL,
+            confidence_level REAL NOT NULL,
+            power REAL NOT NULL,
+            created_by TEXT,
+            assignment_salt TEXT NOT NULL DEFAULT '',
+            guardrails TEXT NOT NULL DEFAULT '[]'
+        );
+        CREATE TABLE IF NOT EXISTS variants (
+            test_id TEXT NOT NULL REFERENCES tests(test_id),
+            variant_id TEXT NOT NULL,
+            position INTEGER NOT NULL,
+            name TEXT NOT NULL,
+            description TEXT,
+            config TEXT NOT NULL,
+            traffic_percentage REAL NOT NULL,
+            is_control INTEGER NOT NULL,
+            status TEXT NOT NULL DEFAULT 'active',
+            PRIMARY KEY (test_id, variant_id)
+        );
+        CREATE TABLE IF NOT EXISTS assignment_overrides (
+            test_id TEXT NOT NULL,
+            user_id TEXT NOT NULL,
+            variant_id TEXT NOT NULL,
+            pinned_at TEXT,
+            PRIMARY KEY (test_id, user_id)
+        );
+        CREATE TABLE IF NOT EXISTS metric_events (
+            event_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            test_id TEXT NOT NULL,
+            variant_id TEXT NOT NULL,
+            recorded_at TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_metric_events_variant ON metric_events (test_id, variant_id);
+        CREATE TABLE IF NOT EXISTS metric_aggregates (
+            test_id TEXT NOT NULL,
+            variant_id TEXT NOT NULL,
+            metric TEXT NOT NULL,
+            count INTEGER NOT NULL,
+            mean REAL NOT NULL,
+            m2 REAL NOT NULL,
+            min_value REAL,
+            max_value REAL,
+            PRIMARY KEY (test_id, variant_id, metric)
+        );
+        CREATE TABLE IF NOT EXISTS guardrail_events (
+            event_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            test_id TEXT NOT NULL,
+            variant_id TEXT NOT NULL,
+            rule TEXT NOT NULL,
+            observed REAL,
+            threshold REAL,
+            action TEXT NOT NULL,
+            reason TEXT NOT NULL,
+            triggered_at TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_guardrail_events_test ON guardrail_events (test_id);
+        CREATE TABLE IF NOT EXISTS metric_sketch_bins (
+            test_id TEXT NOT NULL,
+            variant_id TEXT NOT NULL,
+            metric TEXT NOT NULL,
+            bucket INTEGER NOT NULL,
+            count INTEGER NOT NULL,
+            PRIMARY KEY (test_id, variant_id, metric, bucket)
+        );
+    """
+
+    def __init__(self, db_path: str, sketch_alpha: float = 0.01):
+        self.db_path = db_path
+        self.sketch_alpha = sketch_alpha
+        self._bucketer = QuantileSketch(sketch_alpha)
+        directory = os.path.dirname(os.path.abspath(db_path))
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.RLock()
+        self._depth = 0
+        # Transactions are managed explicitly (see transaction), so autocommit mode
+        self.conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        with self._lock:
+            self.conn.executescript(self.SCHEMA)
+        with self.transaction():
+            self._upgrade_schema()
+            self._ensure_metric_columns()
+            self._backfill_aggregates()
+            self._backfill_sketches()
+
+    @contextmanager
+    def transaction(self):
+        """One write transaction across threads and processes; nested uses join the outer one"""
+        with self._lock:
+            if self._depth:
+                self._depth += 1
+                try:
+                    yield self.conn
+                finally:
+                    self._depth -= 1
+                return
+
+            self.conn.execute("BEGIN IMMEDIATE")
+            self._depth = 1
+            try:
+                yield self.conn
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+            else:
+                self.conn.execute("COMMIT")
+            finally:
+                self._depth = 0
+
+    def _upgrade_schema(self):
+        """Bring databases written by older versions up to the current layout"""
+        test_columns = {row['name'] for row in self.conn.execute("PRAGMA table_info(tests)")}
+        if 'assignment_salt' not in test_columns:
+            self.conn.execute("ALTER TABLE tests ADD COLUMN assignment_salt TEXT NOT NULL DEFAULT ''")
+        if 'guardrails' not in test_columns:
+            self.conn.execute("ALTER TABLE tests ADD COLUMN guardrails TEXT NOT NULL DEFAULT '[]'")
+        variant_columns = {row['name'] for row in self.conn.execute("PRAGMA table_info(variants)")}
+        if 'status' not in variant_columns:
+            self.conn.execute("ALTER TABLE variants ADD COLUMN status TEXT NOT NULL DEFAULT 'active'")
+
+        # Per-user random assignments are no longer stored; keep the existing ones
+        # as pins so nobody changes variant in the middle of a running test
+        legacy = self.conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'assignments'"
+        ).fetchone()
+        if legacy:
+            self.conn.execute(
+                """INSERT OR IGNORE INTO assignment_overrides (test_id, user_id, variant_id, pinned_at)
+                   SELECT test_id, user_id, variant_id, assigned_at FROM assignments"""
+            )
+            self.conn.execute("DROP TABLE assignments")
+
+    def _ensure_metric_columns(self):
+        """One REAL column per TestMetrics field; new fields are added in place"""
+        existing = {row['name'] for row in self.conn.execute("PRAGMA table_info(metric_events)")}
+        for metric_field in fields(TestMetrics):
+            if metric_field.name not in existing:
+                column_type = 'INTEGER' if metric_field.type in (int, 'int') else 'REAL'
+                self.conn.execute(f'ALTER TABLE metric_events ADD COLUMN "{metric_field.name}" {column_type}')
+
+    def _backfill_aggregates(self):
+        """Fold metric events recorded before aggregates existed into metric_aggregates, once"""
+        done = self.conn.execute("SELECT value FROM meta WHERE key = 'aggregates_backfilled'").fetchone()
+        if done:
+            return
+        for row in self.conn.execute(
+            "SELECT DISTINCT test_id, variant_id FROM metric_events "
+            "WHERE NOT EXISTS (SELECT 1 FROM metric_aggregates a WHERE a.test_id = metric_events.test_id "
+            "AND a.variant_id = metric_events.variant_id)"
+        ).fetchall():
+            self._accumulate([(row['test_id'], row['variant_id'], metrics, None)
+                              for metrics in self._load_metrics_unlocked(row['test_id'], row['variant_id'])])
+        self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('aggregates_backfilled', '1')")
+
+    def _backfill_sketches(self):
+        """Sketch buckets for raw events recorded before sketches existed, once"""
+        done = self.conn.execute("SELECT value FROM meta WHERE key = 'sketches_backfilled'").fetchone()
+        if done:
+            return
+        has_sketches = self.conn.execute("SELECT 1 FROM metric_sketch_bins LIMIT 1").fetchone()
+        if not has_sketches:
+            for row in self.conn.execute("SELECT DISTINCT test_id, variant_id FROM metric_events").fetchall():
+                sketches = defaultdict(lambda: QuantileSketch(self.sketch_alpha))
+                for metrics in self._load_metrics_unlocked(row['test_id'], row['variant_id']):
+                    for name in SKETCHED_METRICS:
+                        value = getattr(metrics, name, None)
+                        if value is not None:
+                            sketches[name].add(value)
+                for name, sketch in sketches.items():
+                    self._add_sketch_bins(row['test_id'], row['variant_id'], name, sketch.bins)
+        self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('sketches_backfilled', '1')")
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+    # Meta
+    def get_meta(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row['value'] if row else None
+
+    def set_meta(self, key: str, value: str):
+        with self.transaction():
+            self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    # Tests and variants
+    def save_test(self, test: ABTest):
+        """Insert or update one test row and its variants in a single transaction"""
+        with self.transaction():
+            self.conn.execute(
+                """INSERT OR REPLACE INTO tests
+                   (test_id, name, description, start_date, end_date, status, target_metric,
+                    minimum_sample_size, confidence_level, power, created_by, assignment_salt, guardrails)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                (test.test_id, test.name, test.description, test.start_date.isoformat(),
+                 test.end_date.isoformat(), test.status.value, test.target_metric,
+                 test.minimum_sample_size, test.confidence_level, test.power, test.created_by,
+                 test.assignment_salt, json.dumps([asdict(rule) for rule in test.guardrails]))
+            )
+            self.conn.executemany(
+                """INSERT OR REPLACE INTO variants
+                   (test_id, variant_id, position, name, description, config, traffic_percentage,
+                    is_control, status)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                [(test.test_id, v.variant_id, i, v.name, v.description, json.dumps(v.config),
+                  v.traffic_percentage, int(v.is_control), v.status) for i, v in enumerate(test.variants)]
+            )
+            self._bump_tests_version()
+
+    def update_test_status(self, test: ABTest):
+        with self.transaction():
+            self.conn.execute(
+                "UPDATE tests SET status = ?, start_date = ?, end_date = ? WHERE test_id = ?",
+                (test.status.value, test.start_date.isoformat(), test.end_date.isoformat(), test.test_id)
+            )
+            self._bump_tests_version()
+
+    def _bump_tests_version(self):
+        """Counter other processes poll to know their copy of the tests is stale"""
+        self.conn.execute(
+            """INSERT INTO meta (key, value) VALUES ('tests_version', '1')
+               ON CONFLICT (key) DO UPDATE SET value = CAST(value AS INTEGER) + 1"""
+        )
+
+    def tests_version(self) -> str:
+        return self.get_meta('tests_version') or '0'
+
+    def load_tests(self, test_id: Optional[str] = None) -> Dict[str, ABTest]:
+        """All tests, or just `test_id`, read from one consistent snapshot"""
+        where, params = ("WHERE test_id = ?", (test_id,)) if test_id else ("", ())
+        with self.transaction():
+            test_rows = self.conn.execute(f"SELECT * FROM tests {where}", params).fetchall()
+            variant_rows = self.conn.execute(
+                f"SELECT * FROM variants {where} ORDER BY test_id, position", params
+            ).fetchall()
+
+        variants_by_test = defaultdict(list)
+        for row in variant_rows:
+            variants_by_test[row['test_id']].append(TestVariant(
+                variant_id=row['variant_id'],
+                name=row['name'],
+                description=row['description'],
+                config=json.loads(row['config']),
+                traffic_percentage=row['traffic_percentage'],
+                is_control=bool(row['is_control']),
+                status=row['status']
+            ))
+
+        tests = {}
+        for row in test_rows:
+            tests[row['test_id']] = ABTest(
+                test_id=row['test_id'],
+                name=row['name'],
+                description=row['description'],
+                variants=variants_by_test[row['test_id']],
+                start_date=datetime.fromisoformat(row['start_date']),
+                end_date=datetime.fromisoformat(row['end_date']),
+                status=TestStatus(row['status']),
+                target_metric=row['target_metric'],
+                minimum_sample_size=row['minimum_sample_size'],
+                confidence_level=row['confidence_level'],
+                power=row['power'],
+                created_by=row['created_by'],
+                assignment_salt=row['assignment_salt'],
+                guardrails=[GuardrailRule(**rule) for rule in json.loads(row['guardrails'])]
+            )
+        return tests
+
+    # Guardrail decisions
+    def record_guardrail_event(self, test_id: str, variant_id: str, rule: GuardrailRule,
+                               observed: float, threshold: float, reason: str):
+        with self.transaction():
+            self.conn.execute(
+                """INSERT INTO guardrail_events
+                   (test_id, variant_id, rule, observed, threshold, action, reason, triggered_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+                (test_id, variant_id, json.dumps(asdict(rule)), observed, threshold, rule.action,
+                 reason, datetime.now().isoformat())
+            )
+
+    def load_guardrail_events(self, test_id: str) -> List[Dict]:
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT variant_id, action, reason, observed, threshold, triggered_at "
+                "FROM guardrail_events WHERE test_id = ? ORDER BY event_id",
+                (test_id,)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    # Assignment overrides (pinned users only; everyone else is assigned by hash)
+    def get_override(self, test_id: str, user_id: str) -> Optional[str]:
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT variant_id FROM assignment_overrides WHERE test_id = ? AND user_id = ?",
+                (test_id, user_id)
+            ).fetchone()
+        return row['variant_id'] if row else None
+
+    def set_override(self, test_id: str, user_id: str, variant_id: str):
+        with self.transaction():
+            self.conn.execute(
+                """INSERT OR REPLACE INTO assignment_overrides (test_id, user_id, variant_id, pinned_at)
+                   VALUES (?, ?, ?, ?)""",
+                (test_id, user_id, variant_id, datetime.now().isoformat())
+            )
+
+    def delete_override(self, test_id: str, user_id: str) -> bool:
+        with self.transaction():
+            cursor = self.conn.execute(
+                "DELETE FROM assignment_overrides WHERE test_id = ? AND user_id = ?", (test_id, user_id)
+            )
+        return cursor.rowcount > 0
+
+    # Metrics: O(1) aggregate updates, raw events only when asked for
+    def _accumulate(self, samples: List[Tuple[str, str, TestMetrics, Optional[datetime]]]):
+        """Fold a batch of samples locally, then merge it into the stored aggregates
+
+        The merge (Chan et al., as in MetricAccumulator.merge) is done by the upsert:
+        all right-hand sides in an UPDATE see the row's old values, so concurrent
+        writers never lose an update and a batch costs one row write per metric.
+        """
+        aggregates = defaultdict(MetricAccumulator)
+        bins = defaultdict(lambda: defaultdict(int))
+        for test_id, variant_id, metrics, _ in samples:
+            for name, value in metrics.to_dict().items():
+                if value is not None:
+                    aggregates[(test_id, variant_id, name)].update(float(value))
+            for name in SKETCHED_METRICS:
+                value = getattr(metrics, name, None)
+                if value is not None:
+                    bins[(test_id, variant_id, name)][self._bucketer.bucket(float(value))] += 1
+
+        self.conn.executemany(
+            """INSERT INTO metric_aggregates (test_id, variant_id, metric, count, mean, m2, min_value, max_value)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+               ON CONFLICT (test_id, variant_id, metric) DO UPDATE SET
+                   count = count + excluded.count,
+                   mean = mean + (excluded.mean - mean) * excluded.count / (count + excluded.count),
+                   m2 = m2 + excluded.m2
+                        + (excluded.mean - mean) * (excluded.mean - mean) * count * excluded.count
+                          / (count + excluded.count),
+                   min_value = min(min_value, excluded.min_value),
+                   max_value = max(max_value, excluded.max_value)""",
+            [(test_id, variant_id, name, acc.count, acc.mean, acc.m2, acc.min_value, acc.max_value)
+             for (test_id, variant_id, name), acc in aggregates.items()]
+        )
+        for (test_id, variant_id, name), metric_bins in bins.items():
+            self._add_sketch_bins(test_id, variant_id, name, metric_bins)
+
+    def _add_sketch_bins(self, test_id: str, variant_id: str, metric: str, bins: Dict[int, int]):
+        """Add bucket counts; merging sketches from any number of writers is just this upsert"""
+        self.conn.executemany(
+            """INSERT INTO metric_sketch_bins (test_id, variant_id, metric, bucket, count)
+               VALUES (?, ?, ?, ?, ?)
+               ON CONFLICT (test_id, variant_id, metric, bucket) DO UPDATE SET count = count + excluded.count""",
+            [(test_id, variant_id, metric, bucket, count) for bucket, count in bins.items() if count]
+        )
+
+    def record_metrics(self, test_id: str, variant_id: str, metrics: TestMetrics,
+                       keep_raw: bool = False, recorded_at: Optional[datetime] = None):
+        """Update the variant's aggregates and optionally append the raw event, atomically"""
+        self.record_batch([(test_id, variant_id, metrics, recorded_at)], keep_raw=keep_raw)
+
+    def record_batch(self, samples: List[Tuple[str, str, TestMetrics, Optional[datetime]]],
+                     keep_raw: bool = False):
+        """Record (test_id, variant_id, metrics, recorded_at) samples in one transaction"""
+        if not samples:
+            return
+        with self.transaction():
+            self._accumulate(samples)
+            if keep_raw:
+                for test_id, variant_id, metrics, recorded_at in samples:
+                    self._append_event(test_id, variant_id, metrics, recorded_at)
+
+    def append_metrics(self, test_id: str, variant_id: str, metrics: TestMetrics,
+                       recorded_at: Optional[datetime] = None):
+        """Record a sample and keep its raw event (imports and audits)"""
+        self.record_metrics(test_id, variant_id, metrics, keep_raw=True, recorded_at=recorded_at)
+
+    def _append_event(self, test_id: str, variant_id: str, metrics: TestMetrics,
+                      recorded_at: Optional[datetime] = None):
+        values = metrics.to_dict()
+        columns = ', '.join(f'"{name}"' for name in values)
+        placeholders = ', '.join('?' for _ in values)
+        recorded = (recorded_at or datetime.now()).isoformat()
+        self.conn.execute(
+            f"INSERT INTO metric_events (test_id, variant_id, recorded_at, {columns}) "
+            f"VALUES (?, ?, ?, {placeholders})",
+            (test_id, variant_id, recorded, *values.values())
+        )
+
+    def load_aggregates(self, test_id: str) -> Dict[str, Dict[str, MetricAccumulator]]:
+        """variant_id -> metric -> accumulator, in one indexed query"""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT * FROM metric_aggregates WHERE test_id = ?", (test_id,)
+            ).fetchall()
+        aggregates = defaultdict(dict)
+        for row in rows:
+            aggregates[row['variant_id']][row['metric']] = MetricAccumulator(
+                count=row['count'], mean=row['mean'], m2=row['m2'],
+                min_value=row['min_value'], max_value=row['max_value']
+            )
+        return aggregates
+
+    def load_sketches(self, test_id: str) -> Dict[str, Dict[str, QuantileSketch]]:
+        """variant_id -> metric -> merged quantile sketch"""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT variant_id, metric, bucket, count FROM metric_sketch_bins WHERE test_id = ?",
+                (test_id,)
+            ).fetchall()
+        sketches = defaultdict(dict)
+        for row in rows:
+            variant_sketches = sketches[row['variant_id']]
+            if row['metric'] not in variant_sketches:
+                variant_sketches[row['metric']] = QuantileSketch(self.sketch_alpha)
+            variant_sketches[row['metric']].bins[row['bucket']] += row['count']
+        return sketches
+
+    def _load_metrics_unlocked(self, test_id: str, variant_id: str) -> List[TestMetrics]:
+        names = metric_names()
+        available = {row['name'] for row in self.conn.execute("PRAGMA table_info(metric_events)")}
+        columns = ', '.join(f'"{name}"' for name in names if name in available)
+        rows = self.conn.execute(
+            f"SELECT {columns} FROM metric_events WHERE test_id = ? AND variant_id = ? ORDER BY event_id",
+            (test_id, variant_id)
+        ).fetchall()
+        return [TestMetrics(**{name: row[name] for name in row.keys()}) for row in rows]
+
+    def load_metrics(self, test_id: str, variant_id: str) -> List[TestMetrics]:
+        """Raw events (only those recorded with keep_raw)"""
+        with self._lock:
+            return self._load_metrics_unlocked(test_id, variant_id)
+
+    def count_metrics(self, test_id: str, variant_id: str) -> int:
+        """Samples recorded for a variant, from the aggregates"""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT MAX(count) AS n FROM metric_aggregates WHERE test_id = ? AND variant_id = ?",
+                (test_id, variant_id)
+            ).fetchone()
+        return row['n'] or 0
+
+def default_db_path(storage_path: str) -> str:
+    """ab_tests.json -> ab_tests.db; explicit .db/.sqlite paths are used as-is"""
+    root, ext = os.path.splitext(storage_path)
+    return storage_path if ext in ('.db', '.sqlite', '.sqlite3') else root + '.db'
+
+def migrate_json_storage(json_path: str, store: ABTestStore) -> bool:
+    """Import a legacy ab_tests.json (tests, assignments, metric lists) into the store, once"""
+    if store.get_meta('migrated_from') or not os.path.exists(json_path):
+        return False
+
+    with open(json_path, 'r') as f:
+        data = json.load(f)
+
+    for test_id, test_data in data.get('tests', {}).items():
+        test_data = dict(test_data)
+        test_data['variants'] = [TestVariant(**v) for v in test_data['variants']]
+        test_data['start_date'] = datetime.fromisoformat(test_data['start_date'])
+        test_data['end_date'] = datetime.fromisoformat(test_data['end_date'])
+        test_data['status'] = TestStatus(test_data['status'])
+        test_data['guardrails'] = [GuardrailRule(**rule) for rule in test_data.get('guardrails', [])]
+        store.save_test(ABTest(**test_data))
+
+    # Legacy random assignments become pins so existing users keep their variant
+    for user_id, tests in data.get('user_assignments', {}).items():
+        for test_id, variant_id in tests.items():
+            store.set_override(test_id, user_id, variant_id)
+
+    known = {metric_field.name for metric_field in fields(TestMetrics)}
+    for test_id, variants in data.get('test_results', {}).items():
+        for variant_id, metrics_list in variants.items():
+            for m in metrics_list:
+                store.append_metrics(test_id, variant_id,
+                                     TestMetrics(**{k: v for k, v in m.items() if k in known}))
+
+    store.set_meta('migrated_from', os.path.abspath(json_path))
+    return True
+
 class ABTestManager:
-    """Manages A/B tests for skill extraction models"""
+    """Manages A/B tests for skill extraction models
+
+    Safe to run in several processes against the same storage. Metrics can be
+    buffered per process (`batch_size` / `flush_interval`) and are flushed as one
+    transaction within `flush_interval` seconds. Tests changed by another process
+    (status, guardrail decisions) are reloaded at most every `refresh_interval`
+    seconds.
+    """
     
-    def __init__(self, storage_path: str = "ab_tests.json"):
+    def __init__(self, storage_path: str = "ab_tests.json", keep_raw_events: bool = False,
+                 guardrail_check_interval: int = 50, batch_size: int = 1,
+                 flush_interval: float = 5.0, refresh_interval: float = 5.0):
+        # A legacy .json path maps to a SQLite file next to it and is migrated on first use
         self.storage_path = storage_path
+        self.keep_raw_events = keep_raw_events
+        self.guardrail_check_interval = guardrail_check_interval
+        self._records_since_check: Dict[str, int] = defaultdict(int)
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.refresh_interval = refresh_interval
+        self._pending: List[Tuple[str, str, TestMetrics, datetime]] = []
+        self._pending_lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        self._last_refresh = time.monotonic()
+        self._tests_version: Optional[str] = None
+        self.store = ABTestStore(default_db_path(storage_path))
+        if storage_path.endswith('.json') and migrate_json_storage(storage_path, self.store):
+            # stderr: the backend CLI writes its results to stdout
+            print(f"✅ Migrated {storage_path} to {self.store.db_path}", file=sys.stderr)
         self.tests: Dict[str, ABTest] = {}
-        self.test_results: Dict[str, Dict[str, List[TestMetrics]]] = defaultdict(lambda: defaultdict(list))
-        self.user_assignments: Dict[str, Dict[str, str]] = defaultdict(dict)  # user_id -> test_id -> variant_id
         self.load_tests()
+        self._stop_flusher = threading.Event()
+        self._flusher = None
+        if self.batch_size > 1:
+            atexit.register(self.flush)
+            # Flush on a timer too, so an idle worker does not sit on samples until the
+            # next request (atexit never runs on SIGKILL or an OOM kill)
+            self._flusher = threading.Thread(target=self._flush_periodically, name='ab-metrics-flush', daemon=True)
+            self._flusher.start()
     
     def create_test(self, 
                    name: str,
@@ -90,8 +827,10 @@ class ABTestManager:
                    variants: List[TestVariant],
                    duration_days: int = 14,
                    target_metric: str = "f1_score",
-                   minimum_sample_size: int = 100) -> str:
-        """Create a new A/B test"""
+                   minimum_sample_size: int = 100,
+                   assignment_salt: str = "",
+                   guardrails: Optional[List[GuardrailRule]] = None) -> str:
+        """Create a new A/B test (default_guardrails() unless guardrails are given; [] disables them)"""
         
         # Validate variants
         total_traffic = sum(v.traffic_percentage for v in variants)
@@ -115,11 +854,13 @@ class ABTestManager:
             end_date=end_date,
             status=TestStatus.DRAFT,
             target_metric=target_metric,
-            minimum_sample_size=minimum_sample_size
+            minimum_sample_size=minimum_sample_size,
+            assignment_salt=assignment_salt,
+            guardrails=default_guardrails() if guardrails is None else list(guardrails)
         )
         
         self.tests[test_id] = test
-        self.save_tests()
+        self.store.save_test(test)
         
         return test_id
     
@@ -134,7 +875,7 @@ class ABTestManager:
         
         test.status = TestStatus.ACTIVE
         test.start_date = datetime.now()
-        self.save_tests()
+        self.store.update_test_status(test)
         
         return True
     
@@ -148,7 +889,7 @@ class ABTestManager:
             return False
         
         test.status = TestStatus.PAUSED
-        self.save_tests()
+        self.store.update_test_status(test)
         
         return True
     
@@ -163,35 +904,43 @@ class ABTestManager:
         
         test.status = TestStatus.COMPLETED
         test.end_date = datetime.now()
-        self.save_tests()
+        self.store.update_test_status(test)
         
         return True
     
     def assign_user_to_variant(self, user_id: str, test_id: str) -> Optional[str]:
-        """Assign user to a test variant using weighted random selection"""
-        if test_id not in self.tests:
+        """Assign user to a test variant: pinned variant if any, otherwise by stable hash
+
+        A pin to a variant a guardrail has paused is ignored while it stays paused, so
+        pinned users fall back to hash assignment (control takes the paused traffic).
+        """
+        # Refresh first: the test may have been created by another process
+        self.refresh_tests()
+        if test_id not in self.tests and not self.refresh_tests(force_check=True):
             return None
-        
-        test = self.tests[test_id]
-        if test.status != TestStatus.ACTIVE:
+        test = self.tests.get(test_id)
+        if test is None or test.status != TestStatus.ACTIVE:
             return None
         
-        # Check if user already assigned
-        if test_id in self.user_assignments[user_id]:
-            return self.user_assignments[user_id][test_id]
-        
-        # Weighted random assignment
-        rand_val = random.uniform(0, 100)
-        cumulative = 0
-        
-        for variant in test.variants:
-            cumulative += variant.traffic_percentage
-            if rand_val <= cumulative:
-                self.user_assignments[user_id][test_id] = variant.variant_id
-                return variant.variant_id
+        user_id = str(user_id)
+        pinned = self.store.get_override(test_id, user_id)
+        if pinned and all(v.status != 'paused' for v in test.variants if v.variant_id == pinned):
+            return pinned
         
-        # Fallback to first variant
-        return test.variants[0].variant_id
+        point = assignment_point(test_id, user_id, test.assignment_salt)
+        return pick_variant(test.variants, point).variant_id
+    
+    def pin_user(self, test_id: str, user_id: str, variant_id: str) -> bool:
+        """Force a user into a specific variant (QA accounts, support cases)"""
+        test = self.tests.get(test_id)
+        if test is None or all(v.variant_id != variant_id for v in test.variants):
+            return False
+        self.store.set_override(test_id, str(user_id), variant_id)
+        return True
+    
+    def unpin_user(self, test_id: str, user_id: str) -> bool:
+        """Return a pinned user to hash-based assignment"""
+        return self.store.delete_override(test_id, str(user_id))
     
     def get_user_config(self, user_id: str, test_id: str) -> Optional[Dict]:
         """Get configuration for user's assigned variant"""
@@ -205,14 +954,140 @@ class ABTestManager:
         return variant.config if variant else None
     
     def record_metrics(self, test_id: str, variant_id: str, metrics: TestMetrics):
-        """Record metrics for a test variant"""
-        self.test_results[test_id][variant_id].append(metrics)
+        """Record metrics for a test variant (buffered up to batch_size, then one merge per metric)"""
+        with self._pending_lock:
+            self._pending.append((test_id, variant_id, metrics, datetime.now()))
+            due = (len(self._pending) >= self.batch_size
+                   or time.monotonic() - self._last_flush >= self.flush_interval)
+        if due:
+            self.flush()
+    
+    def flush(self) -> int:
+        """Write buffered metrics in one transaction; returns the number of samples written"""
+        with self._pending_lock:
+            batch, self._pending = self._pending, []
+            self._last_flush = time.monotonic()
+        if not batch:
+            return 0
+        
+        try:
+            self.store.record_batch(batch, keep_raw=self.keep_raw_events)
+        except sqlite3.Error:
+            with self._pending_lock:
+                self._pending[:0] = batch
+            raise
+        
+        # Guardrails are re-evaluated from the aggregates every few samples
+        for test_id, _, _, _ in batch:
+            self._records_since_check[test_id] += 1
+        for test_id in {sample[0] for sample in batch}:
+            if self._records_since_check[test_id] >= self.guardrail_check_interval:
+                self._records_since_check[test_id] = 0
+                self.evaluate_guardrails(test_id)
+        return len(batch)
+    
+    def _flush_periodically(self):
+        while not self._stop_flusher.wait(self.flush_interval):
+            if not self._pending:
+                continue
+            try:
+                self.flush()
+            except sqlite3.Error as e:
+                # The batch stays buffered and is retried on the next tick
+                print(f"⚠️ Could not flush A/B metrics: {e}", file=sys.stderr)
+    
+    def close(self):
+        """Flush buffered metrics and release the database connection"""
+        self._stop_flusher.set()
+        if self._flusher is not None:
+            self._flusher.join()
+        self.flush()
+        atexit.unregister(self.flush)
+        self.store.close()
+    
+    def evaluate_guardrails(self, test_id: str) -> List[Dict]:
+        """Pause or downweight non-control variants that break a guardrail; returns what fired"""
+        with self.store.transaction():
+            # Re-read the test under the write lock so two workers never both act on stale traffic
+            test = self.store.load_tests(test_id).get(test_id)
+            if test is None:
+                return []
+            self.tests[test_id] = test
+            if test.status != TestStatus.ACTIVE or not test.guardrails:
+                return []
+            return self._apply_guardrails(test)
+    
+    def _apply_guardrails(self, test: ABTest) -> List[Dict]:
+        test_id = test.test_id
+        aggregates = self.store.load_aggregates(test_id)
+        sketches = self.store.load_sketches(test_id)
+        control = next(v for v in test.variants if v.is_control)
+        triggered = []
+        
+        for variant in test.variants:
+            if variant.is_control or variant.status != 'active':
+                continue
+            for rule in test.guardrails:
+                observed = self._guardrail_statistic(aggregates, sketches, variant.variant_id, rule)
+                if observed is None:
+                    continue
+                
+                limits = []
+                if rule.max_absolute is not None:
+                    limits.append(rule.max_absolute)
+                if rule.max_ratio_to_control is not None:
+                    baseline = self._guardrail_statistic(aggregates, sketches, control.variant_id, rule)
+                    if baseline:
+                        limits.append(baseline * rule.max_ratio_to_control)
+                if not limits or observed <= min(limits):
+                    continue
+                
+                threshold = min(limits)
+                reason = f"{rule.metric} {rule.statistic} = {observed:.4g} exceeds {threshold:.4g} ({rule.describe()})"
+                self._apply_guardrail(variant, control, rule)
+                self.store.record_guardrail_event(test_id, variant.variant_id, rule, observed, threshold, reason)
+                print(f"⚠️ Guardrail {variant.status} variant {variant.variant_id} of test {test_id}: {reason}",
+                      file=sys.stderr)
+                triggered.append({'variant_id': variant.variant_id, 'action': rule.action, 'reason': reason})
+                break
+        
+        if triggered:
+            self.store.save_test(test)
+        return triggered
+    
+    def _guardrail_statistic(self, aggregates: Dict, sketches: Dict, variant_id: str,
+                             rule: GuardrailRule) -> Optional[float]:
+        """The rule's statistic for one variant, or None below min_samples"""
+        accumulator = aggregates.get(variant_id, {}).get(rule.metric)
+        if accumulator is None or accumulator.count < rule.min_samples:
+            return None
+        if rule.statistic == 'mean':
+            return accumulator.mean
+        if rule.statistic == 'max':
+            return accumulator.max_value
+        sketch = sketches.get(variant_id, {}).get(rule.metric)
+        if sketch is None or not rule.statistic.startswith('p'):
+            return None
+        return sketch.quantile(float(rule.statistic[1:]) / 100.0)
+    
+    def _apply_guardrail(self, variant: TestVariant, control: TestVariant, rule: GuardrailRule):
+        """Hand the variant's traffic (or part of it) to control; totals stay at 100%"""
+        if rule.action == 'downweight':
+            moved = variant.traffic_percentage * (1.0 - rule.downweight_factor)
+            variant.status = 'downweighted'
+        else:
+            moved = variant.traffic_percentage
+            variant.status = 'paused'
+        variant.traffic_percentage -= moved
+        control.traffic_percentage += moved
     
     def get_test_results(self, test_id: str) -> Dict:
         """Get comprehensive test results"""
         if test_id not in self.tests:
             return {}
         
+        self.flush()
+        self.refresh_tests()
         test = self.tests[test_id]
         results = {
             'test_info': test.to_dict(),
@@ -221,36 +1096,24 @@ class ABTestManager:
             'recommendations': []
         }
         
-        # Calculate metrics for each variant
+        # Per-variant summaries straight from the running aggregates and latency sketches
+        aggregates = self.store.load_aggregates(test_id)
+        sketches = self.store.load_sketches(test_id)
         for variant in test.variants:
-            variant_metrics = self.test_results[test_id][variant.variant_id]
+            variant_aggregates = aggregates.get(variant.variant_id, {})
+            sample_size = max((acc.count for acc in variant_aggregates.values()), default=0)
             
-            if variant_metrics:
+            if sample_size:
                 variant_results = {
-                    'sample_size': len(variant_metrics),
+                    'sample_size': sample_size,
                     'metrics': {
-                        'precision': {
-                            'mean': statistics.mean(m.precision for m in variant_metrics),
-                            'std': statistics.stdev(m.precision for m in variant_metrics) if len(variant_metrics) > 1 else 0
-                        },
-                        'recall': {
-                            'mean': statistics.mean(m.recall for m in variant_metrics),
-                            'std': statistics.stdev(m.recall for m in variant_metrics) if len(variant_metrics) > 1 else 0
-                        },
-                        'f1_score': {
-                            'mean': statistics.mean(m.f1_score for m in variant_metrics),
-                            'std': statistics.stdev(m.f1_score for m in variant_metrics) if len(variant_metrics) > 1 else 0
-                        },
-                        'extraction_time': {
-                            'mean': statistics.mean(m.extraction_time for m in variant_metrics),
-                            'std': statistics.stdev(m.extraction_time for m in variant_metrics) if len(variant_metrics) > 1 else 0
-                        },
-                        'user_satisfaction': {
-                            'mean': statistics.mean(m.user_satisfaction for m in variant_metrics),
-                            'std': statistics.stdev(m.user_satisfaction for m in variant_metrics) if len(variant_metrics) > 1 else 0
-                        }
+                        name: variant_aggregates[name].summary()
+                        for name in result_metric_names() if name in variant_aggregates
                     }
                 }
+                for name, sketch in sketches.get(variant.variant_id, {}).items():
+                    if name in variant_results['metrics']:
+                        variant_results['metrics'][name].update(sketch.percentiles())
             else:
                 variant_results = {
                     'sample_size': 0,
@@ -265,26 +1128,30 @@ class ABTestManager:
         # Statistical significance testing
         if len(test.variants) >= 2:
             results['statistical_significance'] = self._calculate_statistical_significance(
-                test_id, test.target_metric, test.confidence_level
+                test_id, test.target_metric, test.confidence_level, aggregates
             )
         
+        results['guardrail_events'] = self.store.load_guardrail_events(test_id)
+        
         # Generate recommendations
         results['recommendations'] = self._generate_recommendations(test_id, results)
         
         return results
     
-    def _calculate_statistical_significance(self, test_id: str, target_metric: str, confidence_level: float) -> Dict:
+    def _calculate_statistical_significance(self, test_id: str, target_metric: str, confidence_level: float,
+                                            aggregates: Optional[Dict] = None) -> Dict:
         """Calculate statistical significance between variants"""
         # Simplified implementation - in production use proper statistical tests
         test = self.tests[test_id]
         control_variant = next(v for v in test.variants if v.is_control)
+        if aggregates is None:
+            aggregates = self.store.load_aggregates(test_id)
         
-        control_metrics = self.test_results[test_id][control_variant.variant_id]
-        if not control_metrics:
+        control_stats = aggregates.get(control_variant.variant_id, {}).get(target_metric)
+        if not control_stats or not control_stats.count:
             return {'error': 'No control metrics available'}
         
-        control_values = [getattr(m, target_metric) for m in control_metrics]
-        control_mean = statistics.mean(control_values)
+        control_mean = control_stats.mean
         
         significance_results = {}
         
@@ -292,18 +1159,17 @@ class ABTestManager:
             if variant.is_control:
                 continue
             
-            variant_metrics = self.test_results[test_id][variant.variant_id]
-            if not variant_metrics:
+            variant_stats = aggregates.get(variant.variant_id, {}).get(target_metric)
+            if not variant_stats or not variant_stats.count:
                 continue
             
-            variant_values = [getattr(m, target_metric) for m in variant_metrics]
-            variant_mean = statistics.mean(variant_values)
+            variant_mean = variant_stats.mean
             
             # Simplified significance calculation
             improvement = (variant_mean - control_mean) / control_mean * 100
             
             # Mock p-value calculation (use proper statistical tests in production)
-            sample_size = len(variant_metrics)
+            sample_size = variant_stats.count
             mock_p_value = max(0.001, 0.5 / (sample_size ** 0.5))  # Simplified
             
             is_significant = mock_p_value < (1 - confidence_level)
@@ -325,6 +1191,9 @@ class ABTestManager:
         
         test = self.tests[test_id]
         
+        for event in results.get('guardrail_events', []):
+            recommendations.append(f"🛑 Variant {event['variant_id']} {event['action']}d by guardrail: {event['reason']}")
+        
         # Check sample sizes
         min_sample_reached = all(
             variant_data['results']['sample_size'] >= test.minimum_sample_size
@@ -371,55 +1240,37 @@ class ABTestManager:
     
     def get_active_tests(self) -> List[ABTest]:
         """Get all active tests"""
+        self.refresh_tests()
         return [test for test in self.tests.values() if test.status == TestStatus.ACTIVE]
     
     def save_tests(self):
-        """Save tests to storage"""
-        data = {
-            'tests': {test_id: test.to_dict() for test_id, test in self.tests.items()},
-            'user_assignments': dict(self.user_assignments),
-            'test_results': {
-                test_id: {
-                    variant_id: [m.to_dict() for m in metrics]
-                    for variant_id, metrics in variants.items()
-                }
-                for test_id, variants in self.test_results.items()
-            }
-        }
-        
-        with open(self.storage_path, 'w') as f:
-            json.dump(data, f, indent=2, default=str)
+        """Save tests to storage (tests and variants only; assignments and metrics are written as they happen)"""
+        for test in self.tests.values():
+            self.store.save_test(test)
     
     def load_tests(self):
         """Load tests from storage"""
         try:
-            with open(self.storage_path, 'r') as f:
-                data = json.load(f)
-            
-            # Load tests
-            for test_id, test_data in data.get('tests', {}).items():
-                variants = [TestVariant(**v) for v in test_data['variants']]
-                test_data['variants'] = variants
-                test_data['start_date'] = datetime.fromisoformat(test_data['start_date'])
-                test_data['end_date'] = datetime.fromisoformat(test_data['end_date'])
-                test_data['status'] = TestStatus(test_data['status'])
-                
-                self.tests[test_id] = ABTest(**test_data)
-            
-            # Load user assignments
-            self.user_assignments = defaultdict(dict, data.get('user_assignments', {}))
-            
-            # Load test results
-            for test_id, variants in data.get('test_results', {}).items():
-                for variant_id, metrics_list in variants.items():
-                    self.test_results[test_id][variant_id] = [
-                        TestMetrics(**m) for m in metrics_list
-                    ]
-        
-        except FileNotFoundError:
-            pass  # No existing data
-        except Exception as e:
-            print(f"Error loading tests: {e}")
+            version = self.store.tests_version()
+            self.tests = self.store.load_tests()
+            self._tests_version = version
+        except (sqlite3.Error, ValueError, KeyError) as e:
+            print(f"⚠️ Error loading tests: {e}", file=sys.stderr)
+    
+    def refresh_tests(self, force: bool = False, force_check: bool = False) -> bool:
+        """Reload tests if another process changed them since the last load
+
+        `force_check` skips the `refresh_interval` wait but still reloads only on a
+        version change; `force` reloads unconditionally.
+        """
+        now = time.monotonic()
+        if not (force or force_check) and now - self._last_refresh < self.refresh_interval:
+            return False
+        self._last_refresh = now
+        if not force and self.store.tests_version() == self._tests_version:
+            return False
+        self.load_tests()
+        return True
 
 # Example usage and utility functions
 def create_ensemble_comparison_test(ab_manager: ABTestManager) -> str:
@@ -6,6 +6,8 @@ import re
 from collections import Counter
 import difflib
 
+from skill_rules import DEFAULT_RULE_ENGINE
+
 # Set up paths
 current_dir = os.path.dirname(os.path.abspath(__file__))
 MODEL_PATH = os.path.join(current_dir, 'TrainedModel', 'test')
@@ -93,81 +95,14 @@ def extract_skills_advanced(text, nlp):
             if is_valid_skill(ent.text):
                 skills.add(ent.text.lower())
     
-    # 2. Rule-based extraction for specific language patterns
-    
-    # C++ - various ways it could appear
-    cpp_patterns = [
-        r'\bc\+\+\b', 
-        r'\bc\s*\+\s*\+\b', 
-        r'\bcpp\b',
-        r'\bc\s+plus\s+plus\b'
-    ]
-    for pattern in cpp_patterns:
-        if re.search(pattern, text_lower):
-            skills.add('c++')
-    
-    # C# - various ways it could appear
-    csharp_patterns = [
-        r'\bc#\b', 
-        r'\bc\s*sharp\b', 
-        r'\bcsharp\b',
-        r'(?<!\w)c\s*#(?!\w)'
-    ]
-    for pattern in csharp_patterns:
-        if re.search(pattern, text_lower):
-            skills.add('c#')
-    
-    # C language - should be standalone 'C'
-    c_patterns = [
-        r'(?<!\w)c(?!\w|\+|\#)',
-        r'(?<!\w)c\s+programming(?!\w)',
-        r'(?<!\w)c\s+language(?!\w)',
-        r'\bin\s+c[\s,\.]',
-        r'using\s+c[\s,\.]'
-    ]
-    for pattern in c_patterns:
-        if re.search(pattern, text_lower):
-            skills.add('c')
-    
-    # .NET framework - various ways it appears
-    dotnet_patterns = [
-        r'\b\.net\b', 
-        r'\bdotnet\b',
-        r'\bnet\s+framework\b',
-        r'\basp\.net\b'
-    ]
-    for pattern in dotnet_patterns:
-        if re.search(pattern, text_lower):
-            skills.add('.net')
-    
-    # R language - standalone 'R'
-    r_patterns = [
-        r'\br\b(?!\w)',
-        r'\br\s+programming(?!\w)',
-        r'\br\s+language(?!\w)'
-    ]
-    for pattern in r_patterns:
-        if re.search(pattern, text_lower):
-            skills.add('r')
-    
-    # Database related skills
-    db_patterns = [
-        r'\bdatabase\b',
-        r'\bdatabases\b',
-        r'\bdb\b',
-        r'\bdata\s+store\b',
-        r'\bdata\s+storage\b'
-    ]
-    for pattern in db_patterns:
-        if re.search(pattern, text_lower):
-            skills.add('database')
-    
-    # SQL database
-    if re.search(r'\bsql\b', text_lower):
-        skills.add('sql')
+    # 2. Rule-based extraction for C++, C#, C, .NET, R, databases and SQL
+    # (single pass over the shared rule table; R has always been unguarded here)
+    skills.update(DEFAULT_RULE_ENGINE.skills(text, context_guards=False))
     
     # 3. Dictionary-based matching for standard skills
     for skill in ALL_TECH_SKILLS:
+        if skill in DEFAULT_RULE_ENGINE.skill_ids:
+            continue  # Already handled by the rule engine
         # For single-token skills
         if ' ' not in skill:
             if re.search(r'\b' + re.escape(skill) + r'\b', text_lower):
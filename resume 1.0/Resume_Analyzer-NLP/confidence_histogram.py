@@ -0,0 +1,109 @@
+"""
+Confidence Histogram for Threshold Tuning
+Per-confidence-bucket true/false positive counts kept as feedback arrives, so the
+min_confidence threshold is retuned in O(buckets) instead of re-extracting every resume
+"""
+
+import threading
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+DEFAULT_BUCKETS = 100
+
+class ConfidenceHistogram:
+    """TP/FP counts per confidence bucket over [0, max_confidence]
+
+    Bucket i covers [edges[i], edges[i + 1]); a threshold at edges[i] keeps buckets
+    i and above. Correct skills that never appeared as a candidate are counted in
+    `missed`; they are false negatives at every threshold.
+    """
+
+    def __init__(self, buckets: int = DEFAULT_BUCKETS, max_confidence: float = 1.0):
+        self.buckets = buckets
+        self.max_confidence = max_confidence
+        self.edges = np.linspace(0.0, max_confidence, buckets + 1)
+        self.tp = np.zeros(buckets, dtype=np.int64)
+        self.fp = np.zeros(buckets, dtype=np.int64)
+        self.missed = 0
+        self._lock = threading.Lock()
+
+    def bucket(self, confidence: float) -> int:
+        # Ensemble scores can exceed 1.0 after section scaling; they share the top bucket
+        index = int(confidence / self.max_confidence * self.buckets)
+        return min(max(index, 0), self.buckets - 1)
+
+    def add(self, confidence: float, correct: bool):
+        with self._lock:
+            (self.tp if correct else self.fp)[self.bucket(confidence)] += 1
+
+    def add_feedback(self, candidates: Dict[str, float], correct_skills: Iterable[str]):
+        """Fold one document: every scored candidate skill vs. the skills the user confirmed"""
+        correct = set(correct_skills)
+        with self._lock:
+            for skill, confidence in candidates.items():
+                (self.tp if skill in correct else self.fp)[self.bucket(confidence)] += 1
+            self.missed += len(correct - set(candidates))
+
+    def merge(self, other: 'ConfidenceHistogram'):
+        if other.buckets != self.buckets or other.max_confidence != self.max_confidence:
+            raise ValueError("Histograms with different buckets cannot be merged")
+        with self._lock:
+            self.tp += other.tp
+            self.fp += other.fp
+            self.missed += other.missed
+
+    @property
+    def total(self) -> int:
+        return int(self.tp.sum() + self.fp.sum())
+
+    def sweep(self) -> Dict[str, np.ndarray]:
+        """Precision, recall and F1 for a threshold at every bucket edge, in one pass"""
+        with self._lock:
+            # Reverse cumulative sums: predictions kept by a threshold at edges[i]
+            kept_tp = np.cumsum(self.tp[::-1])[::-1]
+            kept_fp = np.cumsum(self.fp[::-1])[::-1]
+            relevant = self.tp.sum() + self.missed
+        false_negatives = relevant - kept_tp
+        with np.errstate(divide='ignore', invalid='ignore'):
+            precision = np.where(kept_tp + kept_fp > 0, kept_tp / (kept_tp + kept_fp), 0.0)
+            recall = np.where(relevant > 0, kept_tp / max(relevant, 1), 0.0)
+            f1 = np.where(2 * kept_tp + kept_fp + false_negatives > 0,
+                          2 * kept_tp / (2 * kept_tp + kept_fp + false_negatives), 0.0)
+        return {'threshold': self.edges[:-1], 'precision': precision, 'recall': recall, 'f1': f1}
+
+    def best_threshold(self, bounds: Tuple[float, float] = (0.0, 1.0)) -> Optional[Dict[str, float]]:
+        """F1-optimal threshold within bounds, or None before any feedback"""
+        if self.total == 0:
+            return None
+        curve = self.sweep()
+        allowed = (curve['threshold'] >= bounds[0]) & (curve['threshold'] <= bounds[1])
+        if not allowed.any():
+            return None
+        # Highest F1; ties go to the higher (more precise) threshold
+        f1 = np.where(allowed, curve['f1'], -1.0)
+        best = len(f1) - 1 - int(np.argmax(f1[::-1]))
+        return {
+            'threshold': float(curve['threshold'][best]),
+            'f1': float(curve['f1'][best]),
+            'precision': float(curve['precision'][best]),
+            'recall': float(curve['recall'][best])
+        }
+
+    def to_dict(self) -> Dict:
+        with self._lock:
+            return {
+                'buckets': self.buckets,
+                'max_confidence': self.max_confidence,
+                'tp': self.tp.tolist(),
+                'fp': self.fp.tolist(),
+                'missed': self.missed
+            }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'ConfidenceHistogram':
+        histogram = cls(data['buckets'], data['max_confidence'])
+        histogram.tp[:] = data['tp']
+        histogram.fp[:] = data['fp']
+        histogram.missed = data['missed']
+        return histogram
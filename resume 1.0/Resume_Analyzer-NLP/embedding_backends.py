@@ -0,0 +1,246 @@
+"""
+Pluggable Sentence Embedding Backends
+PyTorch SentenceTransformer or an exported ONNX graph (optionally dynamic-int8 quantized)
+behind the same encode() interface used by EnsembleSkillExtractor.sentence_model
+"""
+
+import logging
+import os
+from abc import ABC, abstractmethod
+import shutil
+import time
+import uuid
+from typing import Dict, List, Optional
+
+import numpy as np
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+ONNX_EXPORT_DIR = os.path.join(CURRENT_DIR, 'TrainedModel', 'onnx')
+# Lowest per-text cosine against the reference for a backend to count as a drop-in
+PARITY_MIN_COSINE = 0.99
+
+class EmbeddingBackend(ABC):
+    """Common interface: encode(texts) -> float32 array of shape (len(texts), dim)"""
+
+    name = 'base'
+
+    @abstractmethod
+    def encode(self, texts, batch_size: int = 32, **kwargs) -> np.ndarray:
+        """Embed a text or a list of texts, one row per text"""
+
+class TorchEmbeddingBackend(EmbeddingBackend):
+    """The original SentenceTransformer path on PyTorch"""
+
+    name = 'torch'
+
+    def __init__(self, model_name: str = 'all-MiniLM-L6-v2'):
+        from sentence_transformers import SentenceTransformer
+        self.model_name = model_name
+        self.model = SentenceTransformer(model_name)
+
+    def encode(self, texts, batch_size: int = 32, **kwargs) -> np.ndarray:
+        if isinstance(texts, str):
+            texts = [texts]
+        return np.asarray(self.model.encode(texts, batch_size=batch_size, **kwargs), dtype=np.float32)
+
+class OnnxEmbeddingBackend(EmbeddingBackend):
+    """MiniLM exported to ONNX and run through onnxruntime on CPU
+
+    Reproduces the SentenceTransformer head (mean pooling over the attention mask,
+    then L2 normalisation) so outputs are directly comparable with the torch backend.
+    """
+
+    name = 'onnx'
+
+    def __init__(self, model_name: str = 'all-MiniLM-L6-v2', export_dir: str = None,
+                 quantize: bool = True, max_seq_length: int = 256, num_threads: Optional[int] = None):
+        import onnxruntime as ort
+        from transformers import AutoTokenizer
+
+        self.logger = logging.getLogger(__name__)
+        self.model_name = model_name
+        self.max_seq_length = max_seq_length
+        self.export_dir = export_dir or os.path.join(ONNX_EXPORT_DIR, model_name.replace('/', '_'))
+        model_path = self._ensure_exported(quantize)
+
+        self.tokenizer = AutoTokenizer.from_pretrained(self.export_dir)
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+        self.session = ort.InferenceSession(model_path, options, providers=['CPUExecutionProvider'])
+        self.input_names = {inp.name for inp in self.session.get_inputs()}
+        self.name = 'onnx-int8' if quantize else 'onnx'
+
+    def _ensure_exported(self, quantize: bool) -> str:
+        """Export the transformer once (and quantize it) on first use
+
+        Both steps write to a temp path and rename it into place, so a worker that is
+        interrupted (or races another worker) never leaves a truncated model behind.
+        """
+        fp32_path = os.path.join(self.export_dir, 'model.onnx')
+        int8_path = os.path.join(self.export_dir, 'model.int8.onnx')
+
+        if not os.path.exists(fp32_path):
+            self._export(fp32_path)
+        if not quantize:
+            return fp32_path
+
+        if not os.path.exists(int8_path):
+            from onnxruntime.quantization import quantize_dynamic, QuantType
+            tmp_path = f"{int8_path}.{os.getpid()}.{uuid.uuid4().hex}.tmp"
+            try:
+                quantize_dynamic(fp32_path, tmp_path, weight_type=QuantType.QInt8)
+                os.replace(tmp_path, int8_path)
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+            self.logger.info(f"✅ Wrote dynamic int8 model to {int8_path}")
+        return int8_path
+
+    def _export(self, fp32_path: str):
+        """Export the graph and tokenizer into a temp directory, then rename it to export_dir"""
+        parent = os.path.dirname(os.path.abspath(self.export_dir))
+        os.makedirs(parent, exist_ok=True)
+        tmp_dir = os.path.join(parent, f".tmp-{uuid.uuid4().hex}")
+        os.makedirs(tmp_dir)
+        try:
+            self._export_to(os.path.join(tmp_dir, os.path.basename(fp32_path)))
+            if os.path.exists(fp32_path):
+                return  # another worker finished first; use theirs
+            if os.path.exists(self.export_dir):
+                # Left behind by an interrupted export; a directory can't be replaced while non-empty
+                old_dir = os.path.join(parent, f".old-{uuid.uuid4().hex}")
+                os.replace(self.export_dir, old_dir)
+                shutil.rmtree(old_dir, ignore_errors=True)
+            os.replace(tmp_dir, self.export_dir)
+            self.logger.info(f"✅ Exported {self.model_name} to {fp32_path}")
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    def _export_to(self, fp32_path: str):
+        import torch
+        from sentence_transformers import SentenceTransformer
+
+        sentence_model = SentenceTransformer(self.model_name, device='cpu')
+        transformer = sentence_model[0].auto_model.eval()
+        tokenizer = sentence_model.tokenizer
+        tokenizer.save_pretrained(os.path.dirname(fp32_path))
+
+        sample = tokenizer(['Python developer with AWS experience'], return_tensors='pt')
+        input_names = [name for name in ('input_ids', 'attention_mask', 'token_type_ids') if name in sample]
+        dynamic_axes = {name: {0: 'batch', 1: 'sequence'} for name in input_names}
+        dynamic_axes['last_hidden_state'] = {0: 'batch', 1: 'sequence'}
+
+        with torch.no_grad():
+            torch.onnx.export(
+                transformer,
+                tuple(sample[name] for name in input_names),
+                fp32_path,
+                input_names=input_names,
+                output_names=['last_hidden_state'],
+                dynamic_axes=dynamic_axes,
+                opset_version=14
+            )
+
+    def encode(self, texts, batch_size: int = 32, **kwargs) -> np.ndarray:
+        if isinstance(texts, str):
+            texts = [texts]
+        outputs = []
+        for start in range(0, len(texts), batch_size):
+            batch = list(texts[start:start + batch_size])
+            tokens = self.tokenizer(batch, padding=True, truncation=True,
+                                    max_length=self.max_seq_length, return_tensors='np')
+            feed = {name: tokens[name].astype(np.int64) for name in self.input_names if name in tokens}
+            hidden = self.session.run(None, feed)[0]
+
+            mask = tokens['attention_mask'][..., None].astype(np.float32)
+            pooled = (hidden * mask).sum(axis=1) / np.maximum(mask.sum(axis=1), 1e-9)
+            pooled /= np.maximum(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12)
+            outputs.append(pooled.astype(np.float32))
+
+        if not outputs:
+            dim = self.session.get_outputs()[0].shape[-1]
+            return np.zeros((0, dim if isinstance(dim, int) else 0), dtype=np.float32)
+        return np.vstack(outputs)
+
+def create_embedding_backend(backend: str = 'torch', model_name: str = 'all-MiniLM-L6-v2',
+                             **kwargs) -> EmbeddingBackend:
+    """Build the requested backend, falling back to torch if the ONNX runtime is unavailable"""
+    logger = logging.getLogger(__name__)
+    if backend in ('onnx', 'onnx-int8'):
+        try:
+            return OnnxEmbeddingBackend(model_name, quantize=(backend == 'onnx-int8'), **kwargs)
+        except ImportError as e:
+            logger.warning(f"⚠️ ONNX backend unavailable ({e}), falling back to torch")
+    elif backend != 'torch':
+        raise ValueError(f"Unknown embedding backend: {backend}")
+    return TorchEmbeddingBackend(model_name)
+
+def check_parity(reference: EmbeddingBackend, candidate: EmbeddingBackend, texts: List[str]) -> Dict:
+    """Cosine agreement between two backends on the same texts"""
+    ref = reference.encode(texts)
+    cand = candidate.encode(texts)
+    ref = ref / np.maximum(np.linalg.norm(ref, axis=1, keepdims=True), 1e-12)
+    cand = cand / np.maximum(np.linalg.norm(cand, axis=1, keepdims=True), 1e-12)
+    cosines = (ref * cand).sum(axis=1)
+    return {
+        'backend': candidate.name,
+        'min_cosine': float(cosines.min()),
+        'mean_cosine': float(cosines.mean()),
+        'max_abs_diff': float(np.abs(ref - cand).max())
+    }
+
+def measure_throughput(backend: EmbeddingBackend, texts: List[str], batch_size: int = 32) -> Dict:
+    """Texts per second encoding one text at a time and in batches"""
+    backend.encode(texts[:2])  # warm-up
+
+    start = time.perf_counter()
+    for text in texts:
+        backend.encode([text])
+    single_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    backend.encode(texts, batch_size=batch_size)
+    batch_time = time.perf_counter() - start
+
+    return {
+        'backend': backend.name,
+        'single_texts_per_sec': len(texts) / single_time if single_time else 0.0,
+        'batch_texts_per_sec': len(texts) / batch_time if batch_time else 0.0
+    }
+
+def main():
+    """Parity and throughput comparison of the available backends on test_resumes/"""
+    import glob
+    from text_chunker import TextChunker
+
+    corpus_dir = os.path.join(CURRENT_DIR, '..', '..', 'test_resumes')
+    chunker = TextChunker(max_chars=1000, overlap_chars=0)
+    texts = []
+    for path in sorted(glob.glob(os.path.join(corpus_dir, '*.txt')))[:50]:
+        with open(path, 'r', encoding='utf-8') as f:
+            texts.extend(chunk.text for chunk in chunker.chunks(f.read()))
+
+    reference = TorchEmbeddingBackend()
+    backends = [reference]
+    for name in ('onnx', 'onnx-int8'):
+        try:
+            backends.append(OnnxEmbeddingBackend(quantize=(name == 'onnx-int8')))
+        except ImportError as e:
+            print(f"⚠️ Skipping {name}: {e}")
+
+    print(f"📊 Embedding backends on {len(texts)} resume chunks")
+    for backend in backends[1:]:
+        parity = check_parity(reference, backend, texts)
+        status = "✅" if parity['min_cosine'] >= PARITY_MIN_COSINE else "⚠️"
+        print(f"  {status} {parity['backend']:<10} min cosine {parity['min_cosine']:.4f}, "
+              f"mean {parity['mean_cosine']:.4f}")
+
+    for backend in backends:
+        stats = measure_throughput(backend, texts)
+        print(f"  {stats['backend']:<10} single: {stats['single_texts_per_sec']:.1f}/s  "
+              f"batch: {stats['batch_texts_per_sec']:.1f}/s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+"""
+Sentence Embedding Cache
+Bounded set-associative CLOCK cache keyed by normalized sentence hash, sitting in front of
+every MiniLM encode; optionally backed by memory-mapped files so workers share entries
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import shutil
+import threading
+import uuid
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: mapped caches are then only safe within one process
+    fcntl = None
+
+import numpy as np
+
+from embedding_backends import EmbeddingBackend
+
+KEY_BYTES = 16
+_WHITESPACE = re.compile(r'\s+')
+
+def normalize_sentence(text: str) -> str:
+    """Case- and whitespace-insensitive form used for cache keys (MiniLM is uncased)"""
+    return _WHITESPACE.sub(' ', text).strip().lower()
+
+def sentence_key(text: str) -> bytes:
+    return hashlib.blake2b(normalize_sentence(text).encode('utf-8'), digest_size=KEY_BYTES).digest()
+
+class EmbeddingCache:
+    """Fixed-capacity cache: `ways` slots per set, CLOCK replacement inside each set
+
+    All state lives in flat arrays (keys, vectors, reference bits, one version word
+    per set). With `path` set they are np.memmap files, so every worker mapping the
+    same directory sees the others' entries.
+
+    Each set is a seqlock: a writer makes the set's version odd, writes the slot and
+    makes it even again; a reader that sees an odd version, or a different version
+    after copying the vector, treats the lookup as a miss. Writers in different
+    processes take a byte-range lock on the set, so a hit is never a torn or wrong vector.
+    """
+
+    def __init__(self, capacity: int, dim: int, path: Optional[str] = None,
+                 ways: int = 8, fingerprint: str = ''):
+        self.ways = ways
+        self.n_sets = max(1, capacity // ways)
+        self.capacity = self.n_sets * ways
+        self.dim = dim
+        self.path = path
+        self.fingerprint = fingerprint
+        self._lock = threading.Lock()
+        self._lock_fd = None
+        self.stats = {'hits': 0, 'misses': 0, 'inserts': 0, 'evictions': 0}
+
+        if path:
+            self._open_mapped(path)
+        else:
+            self.keys = np.zeros((self.capacity, KEY_BYTES), dtype=np.uint8)
+            self.vectors = np.zeros((self.capacity, dim), dtype=np.float32)
+            self.refs = np.zeros(self.capacity, dtype=np.uint8)
+            self.versions = np.zeros(self.n_sets, dtype=np.uint32)
+
+    def _open_mapped(self, path: str):
+        """Map the files for this layout, creating them in a temp dir and renaming into place
+
+        Each layout (capacity, ways, dim, fingerprint) has its own subdirectory, so a
+        worker with a different layout never truncates files other workers have mapped.
+        """
+        meta = {'capacity': self.capacity, 'ways': self.ways, 'dim': self.dim,
+                'fingerprint': self.fingerprint}
+        layout = hashlib.blake2b(json.dumps(meta, sort_keys=True).encode('utf-8'), digest_size=8).hexdigest()
+        directory = os.path.join(path, layout)
+        os.makedirs(path, exist_ok=True)
+
+        if not os.path.exists(os.path.join(directory, 'cache.json')):
+            tmp_dir = os.path.join(path, f".tmp-{uuid.uuid4().hex}")
+            os.makedirs(tmp_dir)
+            try:
+                self._map_arrays(tmp_dir, 'w+')
+                self.flush()
+                with open(os.path.join(tmp_dir, 'cache.json'), 'w', encoding='utf-8') as f:
+                    json.dump(meta, f)
+                try:
+                    os.replace(tmp_dir, directory)
+                    logging.getLogger(__name__).info(f"Created embedding cache {directory}")
+                except OSError:
+                    pass  # another worker created it first; map theirs
+            finally:
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+
+        self._map_arrays(directory, 'r+')
+        if fcntl is not None:
+            self._lock_fd = os.open(os.path.join(directory, 'sets.lock'), os.O_RDWR | os.O_CREAT, 0o644)
+
+    def _map_arrays(self, directory: str, mode: str):
+        self.keys = np.memmap(os.path.join(directory, 'keys.bin'), dtype=np.uint8, mode=mode,
+                              shape=(self.capacity, KEY_BYTES))
+        self.vectors = np.memmap(os.path.join(directory, 'vectors.bin'), dtype=np.float32, mode=mode,
+                                 shape=(self.capacity, self.dim))
+        self.refs = np.memmap(os.path.join(directory, 'refs.bin'), dtype=np.uint8, mode=mode,
+                              shape=(self.capacity,))
+        self.versions = np.memmap(os.path.join(directory, 'versions.bin'), dtype=np.uint32, mode=mode,
+                                  shape=(self.n_sets,))
+
+    @contextmanager
+    def _locked_set(self, set_index: int):
+        """Exclusive write access to one set, across threads and (when mapped) processes"""
+        with self._lock:
+            if self._lock_fd is None:
+                yield
+                return
+            fcntl.lockf(self._lock_fd, fcntl.LOCK_EX, 1, set_index)
+            try:
+                yield
+            finally:
+                fcntl.lockf(self._lock_fd, fcntl.LOCK_UN, 1, set_index)
+
+    def _set_base(self, key: bytes) -> int:
+        return (int.from_bytes(key[:8], 'little') % self.n_sets) * self.ways
+
+    def _find(self, key_row: np.ndarray, base: int) -> int:
+        matches = np.flatnonzero((self.keys[base:base + self.ways] == key_row).all(axis=1))
+        return base + int(matches[0]) if matches.size else -1
+
+    def get(self, key: bytes) -> Optional[np.ndarray]:
+        key_row = np.frombuffer(key, dtype=np.uint8)
+        base = self._set_base(key)
+        set_index = base // self.ways
+        version = int(self.versions[set_index])
+        if not version & 1:
+            slot = self._find(key_row, base)
+            if slot >= 0:
+                vector = np.array(self.vectors[slot])
+                if int(self.versions[set_index]) == version and (self.keys[slot] == key_row).all():
+                    self.refs[slot] = 1
+                    self.stats['hits'] += 1
+                    return vector
+        self.stats['misses'] += 1
+        return None
+
+    def put(self, key: bytes, vector: np.ndarray):
+        key_row = np.frombuffer(key, dtype=np.uint8)
+        base = self._set_base(key)
+        set_index = base // self.ways
+        with self._locked_set(set_index):
+            # Odd = write in progress. Already odd means a writer died mid-write; the set
+            # stays invisible to readers until this write completes it
+            if not int(self.versions[set_index]) & 1:
+                self.versions[set_index] += 1
+            slot = self._find(key_row, base)
+            if slot < 0:
+                slot = self._victim(base)
+            self.vectors[slot] = vector
+            self.keys[slot] = key_row
+            self.refs[slot] = 1
+            self.versions[set_index] += 1
+            self.stats['inserts'] += 1
+
+    def _victim(self, base: int) -> int:
+        """CLOCK within the set: first empty or unreferenced slot, clearing bits as we pass"""
+        for offset in range(self.ways):
+            slot = base + offset
+            if not self.keys[slot].any():
+                return slot
+        for _ in range(2):
+            for offset in range(self.ways):
+                slot = base + offset
+                if self.refs[slot]:
+                    self.refs[slot] = 0
+                else:
+                    self.stats['evictions'] += 1
+                    return slot
+        return base
+
+    def flush(self):
+        if self.path:
+            for array in (self.keys, self.vectors, self.refs, self.versions):
+                array.flush()
+
+    def get_stats(self) -> Dict:
+        lookups = self.stats['hits'] + self.stats['misses']
+        return dict(self.stats,
+                    capacity=self.capacity,
+                    hit_rate=self.stats['hits'] / lookups if lookups else 0.0,
+                    shared=bool(self.path))
+
+class CachedEmbeddingBackend(EmbeddingBackend):
+    """Wraps a backend so only sentences missing from the cache reach the model"""
+
+    def __init__(self, backend: EmbeddingBackend, capacity: int = 50000, path: Optional[str] = None):
+        self.backend = backend
+        self.name = backend.name
+        self.capacity = capacity
+        self.path = path
+        self.cache = None
+        self.encode_calls = 0
+        self.requested_texts = 0
+        self.encoded_texts = 0
+
+    def _ensure_cache(self, dim: int):
+        if self.cache is None:
+            path = os.path.join(self.path, self.name) if self.path else None
+            self.cache = EmbeddingCache(self.capacity, dim, path=path,
+                                        fingerprint=getattr(self.backend, 'model_name', self.name))
+
+    def encode(self, texts, batch_size: int = 32, **kwargs) -> np.ndarray:
+        if isinstance(texts, str):
+            texts = [texts]
+        texts = list(texts)
+        keys = [sentence_key(text) for text in texts]
+        self.requested_texts += len(texts)
+
+        results: List[Optional[np.ndarray]] = [None] * len(texts)
+        if self.cache is not None:
+            for i, key in enumerate(keys):
+                results[i] = self.cache.get(key)
+
+        # Encode each distinct missing sentence once
+        missing = {}
+        for i, key in enumerate(keys):
+            if results[i] is None:
+                missing.setdefault(key, []).append(i)
+
+        if missing:
+            to_encode = [texts[positions[0]] for positions in missing.values()]
+            vectors = self.backend.encode(to_encode, batch_size=batch_size, **kwargs)
+            self.encode_calls += 1
+            self.encoded_texts += len(to_encode)
+            self._ensure_cache(vectors.shape[1])
+            for (key, positions), vector in zip(missing.items(), vectors):
+                self.cache.put(key, vector)
+                for i in positions:
+                    results[i] = vector
+
+        if not results:
+            return np.zeros((0, self.cache.dim if self.cache else 0), dtype=np.float32)
+        return np.vstack(results).astype(np.float32, copy=False)
+
+    def get_stats(self) -> Dict:
+        stats = self.cache.get_stats() if self.cache else {'hits': 0, 'misses': 0, 'hit_rate': 0.0}
+        stats.update({
+            'encode_calls': self.encode_calls,
+            'requested_texts': self.requested_texts,
+            'encoded_texts': self.encoded_texts,
+            # Share of requested sentences that never reached the model
+            'served_without_encode': (
+                1.0 - self.encoded_texts / self.requested_texts if self.requested_texts else 0.0
+            )
+        })
+        return stats
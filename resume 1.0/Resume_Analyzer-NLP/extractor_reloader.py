@@ -0,0 +1,78 @@
+"""
+Extractor Hot Reload
+Keeps the serving EnsembleSkillExtractor of a worker and replaces it, without a restart,
+when a new spaCy model or skill ontology version is published to its registry
+"""
+
+import logging
+import threading
+import time
+from typing import Dict, Optional
+
+from ensemble_skill_extractor import EnsembleSkillExtractor, EnsembleConfig
+
+# Run once through a freshly built extractor before it takes traffic
+WARMUP_TEXT = "Technical Skills: Python, React, Docker, AWS and PostgreSQL"
+
+class ExtractorReloader:
+    """Hands out the current extractor and rebuilds it in the background when versions move
+
+    A request takes one extractor from acquire() and uses it to the end, so a swap never
+    changes the model or ontology under a request in flight. The replaced extractor is
+    released when the last request holding it returns.
+    """
+
+    def __init__(self, config: Optional[EnsembleConfig] = None, check_interval: float = 30.0):
+        self.check_interval = check_interval
+        self._extractor = EnsembleSkillExtractor(config or EnsembleConfig())
+        self._lock = threading.Lock()
+        self._reload = None
+        self._failed_versions = None
+        self._next_check = time.monotonic() + check_interval
+        self.reloads = 0
+        self.logger = logging.getLogger(__name__)
+
+    @property
+    def extractor(self) -> EnsembleSkillExtractor:
+        return self._extractor
+
+    def acquire(self) -> EnsembleSkillExtractor:
+        """The extractor for one request; starts a background reload if versions moved"""
+        self.check_for_update()
+        return self._extractor
+
+    def check_for_update(self, force: bool = False, wait: bool = False) -> bool:
+        """Returns True if a rebuild was started (at most one runs at a time)"""
+        now = time.monotonic()
+        if not force and (self.check_interval <= 0 or now < self._next_check):
+            return False
+        self._next_check = now + self.check_interval
+
+        published = self._extractor.published_versions()
+        if published == self._failed_versions or not self._extractor.is_outdated(published):
+            return False
+        with self._lock:
+            if self._reload is not None and self._reload.is_alive():
+                return False
+            self._reload = threading.Thread(
+                target=self._rebuild, args=(published,), name='extractor-reload', daemon=True
+            )
+            self._reload.start()
+        if wait:
+            self._reload.join()
+        return True
+
+    def _rebuild(self, published: Dict[str, Optional[str]]):
+        current = self._extractor
+        try:
+            # Config, feedback count and histogram live on a LearningState both instances
+            # share, so feedback or a retune reaching `current` during the build still counts
+            replacement = EnsembleSkillExtractor(shared_from=current)
+            replacement.ensemble_extract(WARMUP_TEXT)
+        except Exception as e:
+            self._failed_versions = published
+            self.logger.error(f"❌ Could not load {published}, still serving {current.versions}: {e}")
+            return
+        self._extractor = replacement
+        self.reloads += 1
+        self.logger.info(f"🔄 Serving {replacement.versions} (was {current.versions})")
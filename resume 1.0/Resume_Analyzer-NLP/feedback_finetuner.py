@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Background NER Fine-Tuning from Feedback
+Turns accumulated feedback into SKILL span annotations, fine-tunes a copy of the current
+spaCy pipeline in minibatches, validates it on the benchmark resumes and publishes it to
+the model registry, where serving extractors swap it in without a restart
+
+Run it as its own process so training never competes with request handling:
+    python feedback_finetuner.py --interval 3600
+"""
+
+import argparse
+import ast
+import csv
+import logging
+import os
+import random
+import re
+import sys
+import time
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+import spacy
+from spacy.training import Example
+from spacy.util import filter_spans, minibatch
+from thinc.api import compounding
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(CURRENT_DIR)
+sys.path.append(os.path.join(CURRENT_DIR, 'Training'))
+
+from ensemble_skill_extractor import SkillOntology, CUSTOM_MODEL_DIR, FEEDBACK_DIR, MODEL_REGISTRY_DIR
+from feedback_store import FeedbackStore
+from model_registry import ModelRegistry
+
+# Benchmark resumes with their expected skills (resume_text, expected_skills columns)
+BENCHMARK_CSV = os.path.join(CURRENT_DIR, '..', '..', 'test_results', 'resume_metadata.csv')
+
+logger = logging.getLogger(__name__)
+
+def surface_forms(ontology: SkillOntology) -> Dict[str, List[str]]:
+    """Display name -> strings that mention it in text (the name itself plus its aliases)"""
+    forms = {}
+    for key, name in ontology.canonical_skills.items():
+        forms[name] = [name] + [alias for alias in ontology.aliases.get(key, []) if alias]
+    return forms
+
+def annotate(nlp, text: str, skills: Iterable[str], forms: Dict[str, List[str]]) -> Example:
+    """Example with a SKILL span at every mention of the given skills; all else is O"""
+    doc = nlp.make_doc(text)
+    spans = []
+    for skill in skills:
+        for form in forms.get(skill, [skill]):
+            # Word-ish boundaries that still allow C++, C#, Node.js and CI/CD
+            pattern = r'(?<![\w+#])' + re.escape(form) + r'(?![\w+#])'
+            for match in re.finditer(pattern, text, flags=re.IGNORECASE):
+                span = doc.char_span(match.start(), match.end(), label='SKILL', alignment_mode='contract')
+                if span is not None and len(span) > 0:
+                    spans.append(span)
+    # Overlapping mentions (e.g. "AWS" inside "AWS Lambda") keep the longest
+    entities = [(span.start_char, span.end_char, 'SKILL') for span in filter_spans(spans)]
+    return Example.from_dict(doc, {'entities': entities})
+
+def feedback_examples(nlp, records: Iterable[Dict], forms: Dict[str, List[str]]) -> List[Example]:
+    """One example per feedback record whose text is still stored"""
+    return [annotate(nlp, record['text'], record['correct'], forms)
+            for record in records if record.get('text')]
+
+def load_benchmark(nlp, forms: Dict[str, List[str]], path: str = BENCHMARK_CSV,
+                   limit: Optional[int] = 200) -> List[Example]:
+    """The benchmark resumes annotated with their expected skills"""
+    examples = []
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        for row in csv.DictReader(f):
+            if limit is not None and len(examples) >= limit:
+                break
+            examples.append(annotate(nlp, row['resume_text'], ast.literal_eval(row['expected_skills']), forms))
+    return examples
+
+def rehearsal_examples(nlp, count: int, seed: int = 0) -> List[Example]:
+    """Examples from the original training corpus, mixed in so old skills are not forgotten"""
+    from train_large_scale import generate_contextual_training_data
+
+    corpus = generate_contextual_training_data()
+    random.Random(seed).shuffle(corpus)
+    return [Example.from_dict(nlp.make_doc(text), annotations) for text, annotations in corpus[:count]]
+
+def evaluate(nlp, examples: List[Example]) -> Dict[str, float]:
+    """NER precision, recall and F1 on the benchmark"""
+    scores = nlp.evaluate(examples)
+    return {
+        'precision': float(scores.get('ents_p') or 0.0),
+        'recall': float(scores.get('ents_r') or 0.0),
+        'f1': float(scores.get('ents_f') or 0.0),
+        'words_per_second': float(scores.get('speed') or 0.0)
+    }
+
+class FeedbackFineTuner:
+    """Fine-tunes the current model on feedback that arrived since it was published"""
+
+    def __init__(self, registry: ModelRegistry, feedback_store: FeedbackStore,
+                 ontology: SkillOntology = None, base_model_path: str = CUSTOM_MODEL_DIR,
+                 benchmark_csv: str = BENCHMARK_CSV, benchmark_size: int = 200,
+                 min_feedback: int = 50, epochs: int = 5, drop: float = 0.2,
+                 batch_start: float = 4.0, batch_stop: float = 32.0, batch_compound: float = 1.001,
+                 rehearsal_ratio: float = 1.0, min_f1_gain: float = 0.0, keep_versions: int = 5):
+        self.registry = registry
+        self.feedback_store = feedback_store
+        self.forms = surface_forms(ontology or SkillOntology())
+        self.base_model_path = base_model_path
+        self.benchmark_csv = benchmark_csv
+        self.benchmark_size = benchmark_size
+        self.min_feedback = min_feedback
+        self.epochs = epochs
+        self.drop = drop
+        self.batch_sizes = (batch_start, batch_stop, batch_compound)
+        self.rehearsal_ratio = rehearsal_ratio
+        self.min_f1_gain = min_f1_gain
+        self.keep_versions = keep_versions
+
+    def pending_feedback(self) -> List[Dict]:
+        """Feedback (with text) newer than what the current version was trained on"""
+        since = self.registry.metadata(self.registry.current_version()).get('feedback_until')
+        records = self.feedback_store.iter_feedback(
+            since=datetime.fromisoformat(since) if since else None, with_text=True
+        )
+        return [record for record in records if not since or record['timestamp'] > since]
+
+    def run_once(self) -> Dict:
+        """One fine-tuning round; publishes only if the benchmark F1 does not regress"""
+        records = self.pending_feedback()
+        if len(records) < self.min_feedback:
+            return {'status': 'skipped', 'pending_feedback': len(records)}
+
+        parent = self.registry.current_version()
+        base_path = self.registry.current_path() or self.base_model_path
+        nlp = spacy.load(base_path)
+
+        train = feedback_examples(nlp, records, self.forms)
+        train += rehearsal_examples(nlp, int(len(train) * self.rehearsal_ratio))
+        benchmark = load_benchmark(nlp, self.forms, self.benchmark_csv, self.benchmark_size)
+        before = evaluate(nlp, benchmark)
+
+        start_time = time.perf_counter()
+        losses = {}
+        # Only the NER weights move; minibatches grow as training settles
+        with nlp.select_pipes(enable=['ner']):
+            optimizer = nlp.resume_training()
+            for epoch in range(self.epochs):
+                random.shuffle(train)
+                for batch in minibatch(train, size=compounding(*self.batch_sizes)):
+                    nlp.update(batch, sgd=optimizer, drop=self.drop, losses=losses)
+        training_seconds = time.perf_counter() - start_time
+        after = evaluate(nlp, benchmark)
+
+        result = {
+            'parent': parent or os.path.basename(os.path.normpath(base_path)),
+            'feedback_records': len(records),
+            'training_examples': len(train),
+            'training_seconds': round(training_seconds, 2),
+            'loss': float(losses.get('ner', 0.0)),
+            'benchmark_before': before,
+            'benchmark_after': after,
+            'feedback_until': max(record['timestamp'] for record in records)
+        }
+        if after['f1'] < before['f1'] + self.min_f1_gain:
+            logger.warning(f"⚠️ Fine-tuned model rejected: benchmark F1 {after['f1']:.3f} "
+                           f"vs {before['f1']:.3f} for {result['parent']}")
+            return dict(result, status='rejected')
+
+        staged = self.registry.stage()
+        try:
+            nlp.to_disk(staged)
+            version = self.registry.publish(staged, result)
+        except Exception:
+            self.registry.discard(staged)
+            raise
+        self.registry.prune(self.keep_versions)
+        logger.info(f"✅ Published model {version}: benchmark F1 {before['f1']:.3f} -> {after['f1']:.3f} "
+                    f"({len(records)} feedback records, {training_seconds:.1f}s)")
+        return dict(result, status='published', version=version)
+
+    def run_forever(self, interval: float = 3600.0):
+        while True:
+            try:
+                self.run_once()
+            except Exception as e:
+                logger.error(f"❌ Fine-tuning round failed: {e}")
+            time.sleep(interval)
+
+def main():
+    parser = argparse.ArgumentParser(description='Fine-tune the skills NER model from user feedback')
+    parser.add_argument('--registry-dir', default=MODEL_REGISTRY_DIR)
+    parser.add_argument('--feedback-dir', default=FEEDBACK_DIR)
+    parser.add_argument('--min-feedback', type=int, default=50)
+    parser.add_argument('--epochs', type=int, default=5)
+    parser.add_argument('--interval', type=float, default=3600.0, help='Seconds between rounds')
+    parser.add_argument('--once', action='store_true', help='Run a single round and exit')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    tuner = FeedbackFineTuner(
+        ModelRegistry(args.registry_dir),
+        FeedbackStore(args.feedback_dir),
+        min_feedback=args.min_feedback,
+        epochs=args.epochs
+    )
+    if args.once:
+        print(tuner.run_once())
+    else:
+        tuner.run_forever(args.interval)
+
+if __name__ == "__main__":
+    main()
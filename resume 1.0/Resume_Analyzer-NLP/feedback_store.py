@@ -0,0 +1,216 @@
+"""
+Durable Feedback Store for Active Learning
+Append-only gzip JSON Lines log of feedback records, with resume text stored once per
+content hash, a retention policy and streaming readers for retraining
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional
+
+DEFAULT_SEGMENT_BYTES = 8 * 1024 * 1024
+SEGMENT_PREFIX = 'feedback-'
+SEGMENT_SUFFIX = '.jsonl.gz'
+# A segment written to this recently may still be open in another process
+ACTIVE_SEGMENT_SECONDS = 5.0
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+class FeedbackStore:
+    """Feedback log under one directory
+
+    Layout:
+        segments/feedback-<YYYYmmddHHMMSS>-<pid>-<n>.jsonl.gz   one record per line
+        texts/<sha[:2]>/<sha>.txt.gz                             each distinct resume once
+
+    Every process writes its own segment and starts a new one past `max_segment_bytes`,
+    so writers never share a file. Records are flushed as they are appended; a reader
+    sees everything up to the last flush, even in a segment that is still open.
+    """
+
+    def __init__(self, root: str, max_segment_bytes: int = DEFAULT_SEGMENT_BYTES,
+                 retention_days: Optional[float] = None, max_total_bytes: Optional[int] = None):
+        self.root = root
+        self.segment_dir = os.path.join(root, 'segments')
+        self.text_dir = os.path.join(root, 'texts')
+        os.makedirs(self.segment_dir, exist_ok=True)
+        os.makedirs(self.text_dir, exist_ok=True)
+        self.max_segment_bytes = max_segment_bytes
+        self.retention_days = retention_days
+        self.max_total_bytes = max_total_bytes
+
+        self._lock = threading.Lock()
+        self._segment = None
+        self._segment_path = None
+        self._raw = None
+        self._sequence = 0
+        self.stats = {'appended': 0, 'texts_written': 0, 'texts_deduplicated': 0}
+
+    # Writing
+    def append(self, text: str, predicted: List[str], correct: List[str], user_id: str = None,
+               confidences: Optional[Dict[str, float]] = None,
+               timestamp: Optional[datetime] = None) -> Dict:
+        """Append one feedback record; the text is stored only if this content is new"""
+        record = {
+            'feedback_id': uuid.uuid4().hex,
+            'timestamp': (timestamp or datetime.now()).isoformat(),
+            'text_sha256': self._store_text(text),
+            'predicted': list(predicted),
+            'confidences': {skill: float(value) for skill, value in (confidences or {}).items()},
+            'correct': list(correct),
+            'user_id': user_id
+        }
+        line = (json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n').encode('utf-8')
+        with self._lock:
+            if self._segment is None or self._raw.tell() >= self.max_segment_bytes:
+                self._open_segment()
+            self._segment.write(line)
+            self._segment.flush()
+            self.stats['appended'] += 1
+        return record
+
+    def _open_segment(self):
+        self._close_segment()
+        self._sequence += 1
+        stamp = datetime.now().strftime('%Y%m%d%H%M%S')
+        name = f"{SEGMENT_PREFIX}{stamp}-{os.getpid()}-{self._sequence}{SEGMENT_SUFFIX}"
+        self._segment_path = os.path.join(self.segment_dir, name)
+        self._raw = open(self._segment_path, 'ab')
+        self._segment = gzip.GzipFile(fileobj=self._raw, mode='ab')
+
+    def _close_segment(self):
+        if self._segment is not None:
+            self._segment.close()
+            self._raw.close()
+            self._segment = self._raw = self._segment_path = None
+
+    def _text_path(self, sha: str) -> str:
+        return os.path.join(self.text_dir, sha[:2], f"{sha}.txt.gz")
+
+    def _store_text(self, text: str) -> str:
+        sha = text_hash(text)
+        path = self._text_path(sha)
+        if os.path.exists(path):
+            self.stats['texts_deduplicated'] += 1
+            return sha
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write then rename, so a concurrent writer of the same text never leaves half a file
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with gzip.open(tmp_path, 'wb') as f:
+            f.write(text.encode('utf-8'))
+        os.replace(tmp_path, path)
+        self.stats['texts_written'] += 1
+        return sha
+
+    # Reading
+    def segments(self) -> List[str]:
+        """Segment paths, oldest first"""
+        names = [name for name in os.listdir(self.segment_dir)
+                 if name.startswith(SEGMENT_PREFIX) and name.endswith(SEGMENT_SUFFIX)]
+        return [os.path.join(self.segment_dir, name) for name in sorted(names)]
+
+    def _read_segment(self, path: str) -> Iterator[Dict]:
+        try:
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                for line in f:
+                    if line.endswith('\n'):
+                        yield json.loads(line)
+        except EOFError:
+            # Segment still being written: everything flushed so far has been read
+            pass
+
+    def iter_feedback(self, since: Optional[datetime] = None, with_text: bool = False) -> Iterator[Dict]:
+        """Stream records oldest first; one segment is decompressed at a time"""
+        since_iso = since.isoformat() if since else None
+        for path in self.segments():
+            for record in self._read_segment(path):
+                if since_iso and record['timestamp'] < since_iso:
+                    continue
+                if with_text:
+                    record['text'] = self.load_text(record['text_sha256'])
+                yield record
+
+    def load_text(self, sha: str) -> Optional[str]:
+        try:
+            with gzip.open(self._text_path(sha), 'rb') as f:
+                return f.read().decode('utf-8')
+        except FileNotFoundError:
+            return None
+
+    def count(self) -> int:
+        return sum(1 for _ in self.iter_feedback())
+
+    def disk_usage(self) -> int:
+        total = 0
+        for directory, _, files in os.walk(self.root):
+            total += sum(os.path.getsize(os.path.join(directory, name)) for name in files)
+        return total
+
+    # Retention
+    def apply_retention(self, now: Optional[datetime] = None) -> Dict:
+        """Drop whole segments older than retention_days, then oldest-first past max_total_bytes
+
+        A text is deleted together with the last segment that references it, so each
+        removal lowers disk_usage() by what it actually frees. Segments modified in the
+        last ACTIVE_SEGMENT_SECONDS (possibly open in another process) and the segment
+        this store is writing to are never removed.
+        """
+        now = now or datetime.now()
+        removed = {'segments': 0, 'texts': 0}
+        with self._lock:
+            segments = self.segments()
+            active_cutoff = now.timestamp() - ACTIVE_SEGMENT_SECONDS
+            candidates = [path for path in segments
+                          if path != self._segment_path and os.path.getmtime(path) < active_cutoff]
+            if not candidates or (self.retention_days is None and self.max_total_bytes is None):
+                return removed
+
+            # Segments referencing each text; a text goes when its count reaches zero
+            texts_by_segment = {path: {record['text_sha256'] for record in self._read_segment(path)}
+                                for path in segments}
+            references: Dict[str, int] = {}
+            for shas in texts_by_segment.values():
+                for sha in shas:
+                    references[sha] = references.get(sha, 0) + 1
+
+            def remove_segment(path: str) -> int:
+                freed = os.path.getsize(path)
+                os.remove(path)
+                removed['segments'] += 1
+                for sha in texts_by_segment[path]:
+                    references[sha] -= 1
+                    if references[sha] == 0:
+                        text_path = self._text_path(sha)
+                        try:
+                            freed += os.path.getsize(text_path)
+                            os.remove(text_path)
+                            removed['texts'] += 1
+                        except FileNotFoundError:
+                            pass
+                return freed
+
+            if self.retention_days is not None:
+                cutoff = (now - timedelta(days=self.retention_days)).timestamp()
+                for path in list(candidates):
+                    if os.path.getmtime(path) < cutoff:
+                        remove_segment(path)
+                        candidates.remove(path)
+
+            if self.max_total_bytes is not None:
+                total = self.disk_usage()
+                while candidates and total > self.max_total_bytes:
+                    total -= remove_segment(candidates.pop(0))
+        return removed
+
+    def get_stats(self) -> Dict:
+        return dict(self.stats, segments=len(self.segments()), disk_bytes=self.disk_usage())
+
+    def close(self):
+        with self._lock:
+            self._close_segment()
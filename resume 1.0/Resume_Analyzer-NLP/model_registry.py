@@ -0,0 +1,115 @@
+"""
+Versioned Model Registry
+Immutable version directories plus a CURRENT pointer file that is replaced atomically,
+so a published model is never half-written and readers always see one complete version
+"""
+
+import json
+import os
+import shutil
+import uuid
+from datetime import datetime
+from typing import Dict, List, Optional
+
+CURRENT_FILE = 'CURRENT'
+METADATA_FILE = 'registry.json'
+
+class ModelRegistry:
+    """Versions of one artifact (a spaCy pipeline, an ontology.json, ...) under one directory
+
+    Layout:
+        versions/<YYYYmmdd-HHMMSS-micros>-<id>/   the saved artifact plus registry.json
+        staging/<id>/                             work in progress, invisible to readers
+        CURRENT                                   name of the version serving workers load
+
+    Versions are written to staging and renamed into versions/ in one step. CURRENT is
+    then swapped with os.replace, which readers observe either before or after, never
+    in between.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        self.versions_dir = os.path.join(root, 'versions')
+        self.staging_dir = os.path.join(root, 'staging')
+        self.current_file = os.path.join(root, CURRENT_FILE)
+        os.makedirs(self.versions_dir, exist_ok=True)
+        os.makedirs(self.staging_dir, exist_ok=True)
+
+    # Reading
+    def current_version(self) -> Optional[str]:
+        """Version named by CURRENT, or None before the first publish"""
+        try:
+            with open(self.current_file, 'r', encoding='utf-8') as f:
+                version = f.read().strip()
+        except FileNotFoundError:
+            return None
+        return version if version and os.path.isdir(self.version_path(version)) else None
+
+    def current_path(self) -> Optional[str]:
+        version = self.current_version()
+        return self.version_path(version) if version else None
+
+    def version_path(self, version: str) -> str:
+        return os.path.join(self.versions_dir, version)
+
+    def list_versions(self) -> List[str]:
+        """Published versions, oldest first"""
+        return sorted(name for name in os.listdir(self.versions_dir)
+                      if os.path.isdir(self.version_path(name)))
+
+    def metadata(self, version: Optional[str]) -> Dict:
+        if not version:
+            return {}
+        try:
+            with open(os.path.join(self.version_path(version), METADATA_FILE), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    # Writing
+    def stage(self) -> str:
+        """Fresh directory to write a candidate into before publish()"""
+        path = os.path.join(self.staging_dir, uuid.uuid4().hex)
+        os.makedirs(path)
+        return path
+
+    def discard(self, staged_path: str):
+        shutil.rmtree(staged_path, ignore_errors=True)
+
+    def publish(self, staged_path: str, metadata: Dict = None, make_current: bool = True) -> str:
+        """Move a staged directory into versions/ and (by default) point CURRENT at it"""
+        # Sortable by publish time; the random suffix only separates concurrent publishers
+        version = f"{datetime.now():%Y%m%d-%H%M%S-%f}-{uuid.uuid4().hex[:6]}"
+        record = dict(metadata or {}, version=version, published_at=datetime.now().isoformat())
+        with open(os.path.join(staged_path, METADATA_FILE), 'w', encoding='utf-8') as f:
+            json.dump(record, f, indent=2)
+        os.rename(staged_path, self.version_path(version))
+        if make_current:
+            self.set_current(version)
+        return version
+
+    def import_directory(self, path: str, metadata: Dict = None) -> str:
+        """Publish a copy of an existing model directory (e.g. the legacy TrainedModel/skills)"""
+        staged_path = self.stage()
+        shutil.copytree(path, staged_path, dirs_exist_ok=True)
+        return self.publish(staged_path, dict(metadata or {}, imported_from=os.path.abspath(path)))
+
+    def set_current(self, version: str):
+        """Point CURRENT at a published version; also how to roll back"""
+        if not os.path.isdir(self.version_path(version)):
+            raise ValueError(f"Unknown model version: {version}")
+        tmp_path = f"{self.current_file}.{os.getpid()}.{uuid.uuid4().hex}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(version + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.current_file)
+
+    def prune(self, keep: int = 5) -> List[str]:
+        """Delete the oldest versions beyond `keep`, never the current one"""
+        current = self.current_version()
+        removable = [v for v in self.list_versions() if v != current]
+        doomed = removable[:max(len(removable) - (keep - 1 if current else keep), 0)]
+        for version in doomed:
+            shutil.rmtree(self.version_path(version), ignore_errors=True)
+        return doomed
@@ -24,8 +24,13 @@ from sklearn.metrics import (
 CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
 sys.path.append(CURRENT_DIR)
 
+# Plain-text benchmark resumes (resume_0001.txt ...)
+TEST_RESUMES_DIR = os.path.join(CURRENT_DIR, '..', '..', 'test_resumes')
+
 try:
     from ensemble_skill_extractor import EnsembleSkillExtractor
+    from reference_index import ReferenceEmbeddingIndex
+    from text_chunker import batched
 except ImportError as e:
     print(f"❌ Import error: {e}")
     sys.exit(1)
@@ -51,6 +56,17 @@ class PerformanceTester:
             print("Please run generate_test_resumes.py first")
             sys.exit(1)
     
+    def load_test_resume_texts(self, limit: int = None) -> List[str]:
+        """Load the plain-text benchmark resumes from test_resumes/"""
+        files = sorted(f for f in os.listdir(TEST_RESUMES_DIR) if f.endswith('.txt'))
+        if limit:
+            files = files[:limit]
+        texts = []
+        for filename in files:
+            with open(os.path.join(TEST_RESUMES_DIR, filename), 'r', encoding='utf-8') as f:
+                texts.append(f.read())
+        return texts
+    
     def resume_to_text(self, resume: Dict) -> str:
         """Convert resume JSON to text format"""
         text_parts = []
@@ -453,6 +469,159 @@ class PerformanceTester:
         
         print(f"\n✅ All results saved to: {output_dir}/")
 
+    def measure_section_routing_savings(self, resumes: List[Dict], output_dir: str = 'performance_results') -> Dict:
+        """Time each resume with and without section routing and report the savings"""
+        os.makedirs(output_dir, exist_ok=True)
+        
+        print(f"\n✂️ Measuring section routing savings on {len(resumes)} resumes...")
+        
+        full_config = self.extractor.config.with_overrides(use_section_routing=False)
+        routed_config = self.extractor.config.with_overrides(use_section_routing=True)
+        rows = []
+        for resume in resumes:
+            text = self.resume_to_text(resume)
+            routed = self.extractor.section_segmenter.route(text)
+            
+            start_time = time.perf_counter()
+            self.extractor.ensemble_extract(text, config=full_config)
+            full_time = time.perf_counter() - start_time
+            
+            start_time = time.perf_counter()
+            self.extractor.ensemble_extract(text, config=routed_config)
+            routed_time = time.perf_counter() - start_time
+            
+            rows.append({
+                'resume_id': resume['id'],
+                'total_chars': len(text),
+                'skipped_chars': routed.skipped_chars,
+                'full_time_ms': full_time * 1000,
+                'routed_time_ms': routed_time * 1000,
+                'time_saved_ms': (full_time - routed_time) * 1000
+            })
+        
+        df = pd.DataFrame(rows)
+        df.to_csv(f'{output_dir}/section_routing_savings.csv', index=False)
+        
+        summary = {
+            'documents': len(rows),
+            'avg_skipped_fraction': float((df['skipped_chars'] / df['total_chars']).mean()) if rows else 0.0,
+            'avg_time_saved_ms': float(df['time_saved_ms'].mean()) if rows else 0.0,
+            'avg_full_time_ms': float(df['full_time_ms'].mean()) if rows else 0.0,
+            'avg_routed_time_ms': float(df['routed_time_ms'].mean()) if rows else 0.0
+        }
+        
+        print(f"  Skipped text:        {summary['avg_skipped_fraction']*100:.1f}% per resume")
+        print(f"  Avg time (full):     {summary['avg_full_time_ms']:.1f}ms")
+        print(f"  Avg time (routed):   {summary['avg_routed_time_ms']:.1f}ms")
+        print(f"  Avg time saved:      {summary['avg_time_saved_ms']:.1f}ms per resume")
+        print(f"  ✓ Saved per-document report to {output_dir}/section_routing_savings.csv")
+        
+        return summary
+
+    def measure_embedding_cache(self, texts: List[str], passes: int = 2) -> Dict:
+        """Re-score the same texts several times and report sentence-cache effectiveness"""
+        model = self.extractor.sentence_model
+        if not hasattr(model, 'get_stats'):
+            print("⚠️ Embedding cache disabled (embedding_cache_size=0)")
+            return {}
+        
+        print(f"\n🗄️ Measuring embedding cache over {passes} passes of {len(texts)} resumes...")
+        
+        per_pass = []
+        for pass_number in range(1, passes + 1):
+            before = model.get_stats()
+            start_time = time.perf_counter()
+            for text in texts:
+                self.extractor.extract_skills_embeddings(text)
+            elapsed = time.perf_counter() - start_time
+            after = model.get_stats()
+            
+            requested = after['requested_texts'] - before['requested_texts']
+            encoded = after['encoded_texts'] - before['encoded_texts']
+            per_pass.append({
+                'pass': pass_number,
+                'requested_sentences': requested,
+                'encoded_sentences': encoded,
+                'served_without_encode': 1.0 - encoded / requested if requested else 0.0,
+                'seconds': elapsed
+            })
+            print(f"  Pass {pass_number}: encoded {encoded}/{requested} sentences "
+                  f"({per_pass[-1]['served_without_encode']*100:.1f}% from cache) in {elapsed:.2f}s")
+        
+        return {'passes': per_pass, 'cache': model.get_stats()}
+    
+    def measure_embedding_quantization(self, texts: List[str], output_dir: str = 'performance_results') -> Dict:
+        """Compare exact, float16 and int8 reference scoring for accuracy and latency"""
+        os.makedirs(output_dir, exist_ok=True)
+        
+        print(f"\n🔢 Measuring embedding quantization on {len(texts)} resumes...")
+        
+        extractor = self.extractor
+        config = extractor.config
+        exact_vectors = np.asarray(extractor.reference_index.embeddings, dtype=np.float32)
+        skills = extractor.reference_skills
+        chunker = extractor._chunker(config.embedding_chunk_chars, config)
+        
+        # Encode every document once, in the same sentence batches extract_skills_embeddings
+        # scores, so only the reference scan is timed
+        queries = [
+            [extractor.sentence_model.encode([chunk.text for chunk in batch], batch_size=len(batch))
+             for batch in batched(chunker.sentences(text), config.chunk_batch_size)]
+            for text in texts
+        ]
+        
+        indexes = {
+            'float32': ReferenceEmbeddingIndex.build(skills, exact_vectors, None),
+            'float16': ReferenceEmbeddingIndex.build(skills, exact_vectors, 'float16',
+                                                     rerank_k=config.embedding_rerank_k),
+            'int8': ReferenceEmbeddingIndex.build(skills, exact_vectors, 'int8',
+                                                  rerank_k=config.embedding_rerank_k),
+        }
+        
+        def matched(index, batches, threshold=0.0):
+            best = np.full(len(skills), -1.0, dtype=np.float32)
+            for batch in batches:
+                best = np.maximum(best, index.similarities(batch, threshold).max(axis=0))
+            return set(np.flatnonzero(best >= config.embedding_threshold)), best
+        
+        exact_results = [matched(indexes['float32'], batches) for batches in queries]
+        
+        rows = []
+        for name, index in indexes.items():
+            start_time = time.perf_counter()
+            results = [matched(index, batches, config.embedding_threshold) for batches in queries]
+            elapsed = time.perf_counter() - start_time
+            
+            tp = fp = fn = 0
+            max_error = 0.0
+            for (exact_set, exact_best), (found_set, best) in zip(exact_results, results):
+                tp += len(exact_set & found_set)
+                fp += len(found_set - exact_set)
+                fn += len(exact_set - found_set)
+                if found_set:
+                    reported = sorted(found_set)
+                    max_error = max(max_error, float(np.abs(best[reported] - exact_best[reported]).max()))
+            
+            rows.append({
+                'quantization': name,
+                'scoring_bytes': index.nbytes,
+                'avg_scan_ms': elapsed / max(len(texts), 1) * 1000,
+                'precision_vs_exact': tp / (tp + fp) if tp + fp else 1.0,
+                'recall_vs_exact': tp / (tp + fn) if tp + fn else 1.0,
+                'max_reported_score_error': max_error
+            })
+        
+        df = pd.DataFrame(rows)
+        df.to_csv(f'{output_dir}/embedding_quantization_report.csv', index=False)
+        
+        for row in rows:
+            print(f"  {row['quantization']:<8} {row['scoring_bytes'] / 1024:8.1f} KiB  "
+                  f"{row['avg_scan_ms']:.3f}ms/doc  P={row['precision_vs_exact']:.4f} "
+                  f"R={row['recall_vs_exact']:.4f}  max err={row['max_reported_score_error']:.2e}")
+        print(f"  ✓ Saved report to {output_dir}/embedding_quantization_report.csv")
+        
+        return {row['quantization']: row for row in rows}
+
 def main():
     """Main testing function"""
     print("="*80)
@@ -485,6 +654,16 @@ def main():
     # Save results
     tester.save_detailed_results()
     
+    # Report per-document savings from section routing
+    tester.measure_section_routing_savings(resumes[:100])
+    
+    # Accuracy vs latency of quantized reference embeddings on the text benchmark
+    benchmark_texts = tester.load_test_resume_texts(limit=200)
+    tester.measure_embedding_quantization(benchmark_texts)
+    
+    # Sentence cache hit rates when re-scoring the same corpus
+    tester.measure_embedding_cache(benchmark_texts)
+    
     print("\n" + "="*80)
     print("✅ TESTING COMPLETE!")
     print("="*80)
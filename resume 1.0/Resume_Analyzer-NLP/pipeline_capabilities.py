@@ -0,0 +1,65 @@
+"""
+spaCy Pipeline Capability Detection
+Inspects a loaded pipeline once so extractors never probe for missing stages per call
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Tuple
+
+# Components the skill extractors actually read from; everything else
+# (lemmatizer, textcat, ...) is disabled
+EXTRACTION_COMPONENTS = {
+    'tok2vec', 'transformer', 'ner', 'entity_ruler', 'span_ruler',
+    'parser', 'senter', 'sentencizer'
+}
+
+# Any of these sets Token.is_sent_start, which makes Span.sent usable
+SENTENCE_COMPONENTS = {'parser', 'senter', 'sentencizer'}
+
+# English noun_chunks filters on Token.pos_, so these stay enabled alongside the parser
+POS_COMPONENTS = {'tagger', 'attribute_ruler', 'morphologizer'}
+
+@dataclass(frozen=True)
+class PipelineCapabilities:
+    """What the loaded pipeline can provide, decided once at load time"""
+    has_ner: bool
+    has_noun_chunks: bool
+    has_sentences: bool
+    added_sentencizer: bool
+    disabled: Tuple[str, ...]
+
+def configure_pipeline(nlp, need_sentences: bool = True) -> PipelineCapabilities:
+    """Disable stages the extractors don't use and add a sentencizer if boundaries are missing"""
+    logger = logging.getLogger(__name__)
+
+    needed = set(EXTRACTION_COMPONENTS)
+    if 'parser' in nlp.pipe_names:
+        needed |= POS_COMPONENTS
+    unused = [name for name in nlp.pipe_names if name not in needed]
+    if unused:
+        nlp.select_pipes(disable=unused)
+
+    added_sentencizer = False
+    if need_sentences and not SENTENCE_COMPONENTS.intersection(nlp.pipe_names):
+        # Rule-based and nearly free compared to a parser
+        nlp.add_pipe('sentencizer')
+        added_sentencizer = True
+
+    # noun_chunks needs dependency labels, coarse POS tags and a language-level syntax iterator
+    has_pos = bool({'morphologizer', 'attribute_ruler'}.intersection(nlp.pipe_names))
+    has_noun_chunks = ('parser' in nlp.pipe_names and has_pos
+                       and nlp.vocab.get_noun_chunks is not None)
+
+    capabilities = PipelineCapabilities(
+        has_ner='ner' in nlp.pipe_names or 'entity_ruler' in nlp.pipe_names,
+        has_noun_chunks=has_noun_chunks,
+        has_sentences=bool(SENTENCE_COMPONENTS.intersection(nlp.pipe_names)),
+        added_sentencizer=added_sentencizer,
+        disabled=tuple(unused)
+    )
+    logger.info(
+        f"spaCy pipeline {nlp.pipe_names}: noun_chunks={capabilities.has_noun_chunks}, "
+        f"sentences={capabilities.has_sentences}, disabled={list(capabilities.disabled)}"
+    )
+    return capabilities
@@ -0,0 +1,184 @@
+"""
+Quantized Reference Skill Embeddings
+int8/float16 first-pass scoring over the reference skills with exact float32 re-ranking,
+persisted as an on-disk artifact so workers memory-map it instead of re-encoding
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import uuid
+from typing import List, Optional
+
+import numpy as np
+
+QUANTIZATIONS = (None, 'int8', 'float16')
+
+def reference_fingerprint(skills: List[str], model_name: str) -> str:
+    """Stable id for a (model, reference skill list) pair; names the artifact directory"""
+    digest = hashlib.sha1(model_name.encode('utf-8'))
+    for skill in skills:
+        digest.update(b'\0' + skill.encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+class ReferenceEmbeddingIndex:
+    """Unit-normalised reference embeddings with an optional quantized scoring copy"""
+
+    BLOCK_ROWS = 4096
+
+    def __init__(self, skills: List[str], embeddings: np.ndarray, quantization: Optional[str] = 'int8',
+                 rerank_k: int = 32, rerank_margin: float = 0.02):
+        if quantization not in QUANTIZATIONS:
+            raise ValueError(f"Unknown quantization {quantization!r}, expected one of {QUANTIZATIONS}")
+        self.skills = list(skills)
+        self.quantization = quantization
+        self.rerank_k = rerank_k
+        self.rerank_margin = rerank_margin
+        # Exact vectors; may be a read-only memmap, only touched for re-ranking
+        self.embeddings = embeddings
+        self.codes = None
+        self.scales = None
+
+    @classmethod
+    def build(cls, skills: List[str], embeddings: np.ndarray, quantization: Optional[str] = 'int8',
+              **kwargs) -> 'ReferenceEmbeddingIndex':
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        embeddings = embeddings / np.maximum(norms, 1e-12)
+        index = cls(skills, embeddings, quantization, **kwargs)
+        index._quantize()
+        return index
+
+    def _quantize(self):
+        embeddings = np.asarray(self.embeddings, dtype=np.float32)
+        if self.quantization == 'int8':
+            # Symmetric per-row scale: code = round(x / scale), scale = max|x| / 127
+            scales = np.abs(embeddings).max(axis=1) / 127.0
+            scales = np.maximum(scales, 1e-12).astype(np.float32)
+            self.codes = np.clip(np.rint(embeddings / scales[:, None]), -127, 127).astype(np.int8)
+            self.scales = scales
+        elif self.quantization == 'float16':
+            self.codes = embeddings.astype(np.float16)
+            self.scales = None
+
+    @property
+    def nbytes(self) -> int:
+        """Resident bytes used for first-pass scoring"""
+        if self.codes is None:
+            return int(self.embeddings.nbytes)
+        return int(self.codes.nbytes + (self.scales.nbytes if self.scales is not None else 0))
+
+    def _approximate_scores(self, queries: np.ndarray) -> np.ndarray:
+        # Widen the codes a block at a time so the transient float32 copy stays small
+        scores = np.empty((queries.shape[0], self.codes.shape[0]), dtype=np.float32)
+        for start in range(0, self.codes.shape[0], self.BLOCK_ROWS):
+            block = self.codes[start:start + self.BLOCK_ROWS].astype(np.float32)
+            scores[:, start:start + block.shape[0]] = queries @ block.T
+        if self.quantization == 'int8':
+            scores *= self.scales
+        return scores
+
+    def similarities(self, queries: np.ndarray, threshold: float = 0.0) -> np.ndarray:
+        """Cosine similarity of each query row to every skill
+
+        With quantization enabled, scores are exact for each query's top `rerank_k`
+        skills and for anything within `rerank_margin` of `threshold`; the rest keep
+        their approximate score, which is already too low to matter.
+        """
+        queries = np.asarray(queries, dtype=np.float32)
+        norms = np.linalg.norm(queries, axis=1, keepdims=True)
+        queries = queries / np.maximum(norms, 1e-12)
+
+        if self.quantization is None:
+            return queries @ np.asarray(self.embeddings).T
+
+        scores = self._approximate_scores(queries)
+        k = min(self.rerank_k, scores.shape[1])
+        candidates = scores >= threshold - self.rerank_margin
+        if k:
+            top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+            np.put_along_axis(candidates, top, True, axis=1)
+
+        columns = np.flatnonzero(candidates.any(axis=0))
+        if columns.size:
+            exact = queries @ np.asarray(self.embeddings[columns]).T
+            scores[:, columns] = np.where(candidates[:, columns], exact, scores[:, columns])
+        return scores
+
+    def save(self, directory: str, metadata: Optional[dict] = None):
+        """Write skills, exact vectors and the quantized copy as plain .npy files
+
+        Files are written into a sibling temp directory that is renamed into place, so a
+        worker that has `directory` memory-mapped never sees a half-written array.
+        """
+        parent = os.path.dirname(os.path.abspath(directory))
+        os.makedirs(parent, exist_ok=True)
+        tmp_dir = os.path.join(parent, f".tmp-{uuid.uuid4().hex}")
+        os.makedirs(tmp_dir)
+        try:
+            np.save(os.path.join(tmp_dir, 'embeddings.npy'), np.asarray(self.embeddings, dtype=np.float32))
+            if self.quantization == 'int8':
+                np.save(os.path.join(tmp_dir, 'codes_int8.npy'), self.codes)
+                np.save(os.path.join(tmp_dir, 'scales.npy'), self.scales)
+            elif self.quantization == 'float16':
+                np.save(os.path.join(tmp_dir, 'codes_float16.npy'), self.codes)
+
+            meta = dict(metadata or {})
+            meta.update({'skills': self.skills, 'dimension': int(self.embeddings.shape[1])})
+            with open(os.path.join(tmp_dir, 'reference.json'), 'w', encoding='utf-8') as f:
+                json.dump(meta, f, indent=2)
+
+            if os.path.exists(directory):
+                # A directory can't be replaced while non-empty; move the old artifact aside.
+                # Mapped files stay valid for the workers still holding them.
+                old_dir = os.path.join(parent, f".old-{uuid.uuid4().hex}")
+                os.replace(directory, old_dir)
+                shutil.rmtree(old_dir, ignore_errors=True)
+            os.replace(tmp_dir, directory)
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    @classmethod
+    def load(cls, directory: str, quantization: Optional[str] = 'int8', mmap: bool = True,
+             **kwargs) -> 'ReferenceEmbeddingIndex':
+        """Load an artifact; exact vectors are memory-mapped so idle rows cost no RSS"""
+        with open(os.path.join(directory, 'reference.json'), 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        embeddings = np.load(os.path.join(directory, 'embeddings.npy'), mmap_mode='r' if mmap else None)
+        index = cls(meta['skills'], embeddings, quantization, **kwargs)
+
+        codes_file = {'int8': 'codes_int8.npy', 'float16': 'codes_float16.npy'}.get(quantization)
+        if codes_file and os.path.exists(os.path.join(directory, codes_file)):
+            index.codes = np.load(os.path.join(directory, codes_file))
+            if quantization == 'int8':
+                index.scales = np.load(os.path.join(directory, 'scales.npy'))
+        elif quantization:
+            # Artifact was saved with a different quantization - derive it in memory
+            index._quantize()
+        return index
+
+def load_or_build_reference_index(skills: List[str], encode, model_name: str, artifact_root: str,
+                                  quantization: Optional[str] = 'int8',
+                                  **kwargs) -> ReferenceEmbeddingIndex:
+    """Reuse the artifact for this (model, skill list) if present, otherwise encode and persist it"""
+    logger = logging.getLogger(__name__)
+    directory = os.path.join(artifact_root, reference_fingerprint(skills, model_name))
+
+    if os.path.exists(os.path.join(directory, 'reference.json')):
+        try:
+            index = ReferenceEmbeddingIndex.load(directory, quantization, **kwargs)
+            if index.skills == list(skills):
+                logger.info(f"✅ Loaded reference embeddings from {directory}")
+                return index
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"⚠️ Could not load reference embeddings from {directory}: {e}")
+
+    index = ReferenceEmbeddingIndex.build(skills, encode(skills), quantization, **kwargs)
+    try:
+        index.save(directory, {'model_name': model_name, 'quantization': quantization})
+        logger.info(f"Saved reference embeddings to {directory}")
+    except OSError as e:
+        logger.warning(f"⚠️ Could not persist reference embeddings: {e}")
+    return index
@@ -0,0 +1,158 @@
+"""
+Resume Section Segmentation
+Splits resume text into headed sections so extractors only scan skill-bearing regions
+"""
+
+import re
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+# Heading aliases (lowercase, no trailing colon) -> canonical section name
+SECTION_ALIASES = {
+    'summary': ['professional summary', 'summary', 'profile', 'professional profile',
+                'objective', 'career objective', 'about me'],
+    'skills': ['technical skills', 'skills', 'core competencies', 'key skills',
+               'skills summary', 'technical expertise', 'tech stack'],
+    'experience': ['work experience', 'experience', 'professional experience',
+                   'employment history', 'work history', 'employment'],
+    'projects': ['projects', 'personal projects', 'key projects', 'academic projects'],
+    'education': ['education', 'academic background', 'education and training'],
+    'certifications': ['certifications', 'certification', 'certificates',
+                       'licenses and certifications', 'licenses & certifications'],
+}
+
+# Sections that are worth running the extractors on. Anything before the first
+# heading (name, email, phone) is the 'header' and is never routed.
+SKILL_BEARING_SECTIONS = {'summary', 'skills', 'experience', 'projects', 'certifications', 'unknown'}
+
+# Multiplier applied to a match's weighted score based on where it was found
+SECTION_CONFIDENCE = {
+    'skills': 1.10,
+    'certifications': 1.05,
+    'experience': 1.00,
+    'projects': 1.00,
+    'summary': 0.95,
+    'unknown': 1.00,
+}
+
+_HEADING_LOOKUP = {
+    alias: section for section, aliases in SECTION_ALIASES.items() for alias in aliases
+}
+
+# A heading is a short line of words, optionally followed by a colon (and inline content)
+_HEADING_PATTERN = re.compile(
+    r'^[ \t]*(?P<heading>[A-Za-z][A-Za-z &/]{2,40}?)[ \t]*(?P<colon>:[^\n]*)?$',
+    re.MULTILINE
+)
+
+@dataclass
+class SectionSpan:
+    """A contiguous region of the resume belonging to one section"""
+    name: str
+    heading: str
+    start: int
+    end: int
+
+    @property
+    def is_skill_bearing(self) -> bool:
+        return self.name in SKILL_BEARING_SECTIONS
+
+@dataclass
+class RoutedText:
+    """Skill-bearing sections joined into one string, with offsets back to the original"""
+    text: str
+    original_length: int
+    # (routed_start, original_start, length, section_name), sorted by routed_start
+    pieces: List[Tuple[int, int, int, str]] = field(default_factory=list)
+
+    @classmethod
+    def identity(cls, text: str) -> 'RoutedText':
+        return cls(text=text, original_length=len(text), pieces=[(0, 0, len(text), 'unknown')])
+
+    def _piece_at(self, routed_pos: int) -> Optional[Tuple[int, int, int, str]]:
+        if routed_pos < 0 or not self.pieces:
+            return None
+        idx = bisect_right([p[0] for p in self.pieces], routed_pos) - 1
+        return self.pieces[max(idx, 0)]
+
+    def to_original(self, routed_pos: int) -> int:
+        """Map a routed offset back to an offset in the original text"""
+        piece = self._piece_at(routed_pos)
+        if piece is None:
+            return routed_pos
+        routed_start, original_start, _, _ = piece
+        return original_start + (routed_pos - routed_start)
+
+    def to_original_span(self, span: Tuple[int, int]) -> Tuple[int, int]:
+        start, end = span
+        if start < 0:
+            return span
+        original_start = self.to_original(start)
+        return (original_start, original_start + max(0, end - start))
+
+    def section_at(self, routed_pos: int) -> str:
+        piece = self._piece_at(routed_pos)
+        return piece[3] if piece else 'unknown'
+
+    @property
+    def skipped_chars(self) -> int:
+        return self.original_length - sum(p[2] for p in self.pieces)
+
+class SectionSegmenter:
+    """Fast line-based section segmenter for resumes in the test_resumes/ format"""
+
+    def segment(self, text: str) -> List[SectionSpan]:
+        """Return section spans covering the whole text, in order"""
+        headings = []
+        for match in _HEADING_PATTERN.finditer(text):
+            heading = match.group('heading').strip()
+            section = _HEADING_LOOKUP.get(heading.lower())
+            if section is None:
+                continue
+            # Bare headings must stand out: either ALL CAPS or followed by a colon
+            if not match.group('colon') and not heading.isupper():
+                continue
+            headings.append((match.start(), section, heading))
+
+        if not headings:
+            return [SectionSpan('unknown', '', 0, len(text))]
+
+        spans = []
+        if headings[0][0] > 0:
+            spans.append(SectionSpan('header', '', 0, headings[0][0]))
+
+        for i, (start, section, heading) in enumerate(headings):
+            end = headings[i + 1][0] if i + 1 < len(headings) else len(text)
+            # Merge repeated headings of the same section (e.g. "Skills:" then "Technical Skills:")
+            if spans and spans[-1].name == section:
+                spans[-1].end = end
+            else:
+                spans.append(SectionSpan(section, heading, start, end))
+
+        return spans
+
+    def route(self, text: str) -> RoutedText:
+        """Join skill-bearing sections into a single text for the extractors"""
+        parts = []
+        pieces = []
+        routed_pos = 0
+        for span in self.segment(text):
+            if not span.is_skill_bearing:
+                continue
+            if parts:
+                parts.append('\n')
+                routed_pos += 1
+            chunk = text[span.start:span.end]
+            parts.append(chunk)
+            pieces.append((routed_pos, span.start, len(chunk), span.name))
+            routed_pos += len(chunk)
+
+        return RoutedText(text=''.join(parts), original_length=len(text), pieces=pieces)
+
+    def section_summary(self, text: str) -> Dict[str, int]:
+        """Character counts per section, useful for reporting routing savings"""
+        summary = {}
+        for span in self.segment(text):
+            summary[span.name] = summary.get(span.name, 0) + (span.end - span.start)
+        return summary
@@ -0,0 +1,219 @@
+"""
+Shared Read-only Model Tensors
+Publishes MiniLM weights, reference embeddings and spaCy vectors as .npy files on a shared
+(tmpfs) directory and maps them into every worker process instead of each holding a copy
+"""
+
+import hashlib
+import logging
+import os
+import re
+import sys
+import tempfile
+from typing import Dict, List, Optional
+
+import numpy as np
+
+def default_shared_dir() -> str:
+    """/dev/shm when available (RAM-backed, shared by all processes), else the temp dir"""
+    base = '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir()
+    return os.path.join(base, 'skill_extractor_tensors')
+
+def array_digest(array: np.ndarray) -> str:
+    """Content fingerprint: equal names do not imply equal weights across versions"""
+    digest = hashlib.blake2b(digest_size=8)
+    digest.update(f'{array.dtype.str}{array.shape}'.encode('ascii'))
+    digest.update(memoryview(np.ascontiguousarray(array)).cast('B'))
+    return digest.hexdigest()
+
+class SharedArrayStore:
+    """Named read-only arrays backed by files; every attach() is a zero-copy mapping
+
+    Files are keyed by name plus a digest of the content, so a new ontology or a
+    fine-tuned model that keeps its name publishes a new file instead of mapping stale
+    values. Arrays are published once (write to a temp file, then os.replace, so
+    concurrent workers never see a partial file) and mapped copy-on-write: pages stay
+    shared across processes unless someone writes to them, which inference never does.
+    """
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = root or default_shared_dir()
+        os.makedirs(self.root, exist_ok=True)
+        self.logger = logging.getLogger(__name__)
+
+    def _prefix(self, name: str) -> str:
+        return re.sub(r'[^A-Za-z0-9_.-]+', '_', name) + '.'
+
+    def _path(self, name: str, digest: str) -> str:
+        return os.path.join(self.root, f'{self._prefix(name)}{digest}.npy')
+
+    def _versions(self, name: str) -> List[str]:
+        """Published files for `name` (any content), oldest first"""
+        prefix = self._prefix(name)
+        paths = [os.path.join(self.root, entry) for entry in os.listdir(self.root)
+                 if entry.startswith(prefix) and entry.endswith('.npy')
+                 and '.' not in entry[len(prefix):-len('.npy')]]
+        return sorted(paths, key=os.path.getmtime)
+
+    def publish(self, name: str, array: np.ndarray) -> np.ndarray:
+        """Store `array` under `name` unless a file with the same content exists; return the mapping"""
+        array = np.ascontiguousarray(array)
+        path = self._path(name, array_digest(array))
+        if os.path.exists(path):
+            try:
+                return np.load(path, mmap_mode='c')
+            except (OSError, ValueError):
+                pass
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, suffix='.npy.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.save(f, array)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        mapped = np.load(path, mmap_mode='c')
+
+        # Older contents under this name are unlinked; workers still mapping them keep
+        # their pages until they reload
+        for old_path in self._versions(name):
+            if old_path != path:
+                try:
+                    os.remove(old_path)
+                except OSError:
+                    pass
+        return mapped
+
+    def attach(self, name: str) -> Optional[np.ndarray]:
+        """Mapping of the most recently published content for `name`"""
+        versions = self._versions(name)
+        if not versions:
+            return None
+        return np.load(versions[-1], mmap_mode='c')
+
+def share_torch_module(module, store: SharedArrayStore, prefix: str) -> int:
+    """Swap every parameter/buffer of a CPU module for a tensor viewing the shared mapping"""
+    import torch
+
+    shared_bytes = 0
+    with torch.no_grad():
+        for name, tensor in list(module.named_parameters()) + list(module.named_buffers()):
+            if tensor.device.type != 'cpu':
+                continue
+            mapped = store.publish(f'{prefix}.{name}', tensor.detach().numpy())
+            tensor.data = torch.from_numpy(mapped)
+            shared_bytes += mapped.nbytes
+    return shared_bytes
+
+def share_extractor_tensors(extractor, store: SharedArrayStore) -> Dict[str, int]:
+    """Map an EnsembleSkillExtractor's large read-only arrays from the shared store"""
+    logger = logging.getLogger(__name__)
+    report = {}
+    model_name = extractor.config.embedding_model_name
+
+    # Reference skill embeddings (exact vectors plus the quantized scoring copy)
+    index = extractor.reference_index
+    if index is not None:
+        key = f'reference.{model_name}'
+        if not isinstance(index.embeddings, np.memmap):
+            # Already file-backed when loaded from the reference artifact
+            index.embeddings = store.publish(f'{key}.embeddings', np.asarray(index.embeddings))
+        shared = index.embeddings.nbytes
+        if index.codes is not None:
+            index.codes = store.publish(f'{key}.codes.{index.quantization}', index.codes)
+            shared += index.codes.nbytes
+        if index.scales is not None:
+            index.scales = store.publish(f'{key}.scales', index.scales)
+            shared += index.scales.nbytes
+        report['reference_embeddings'] = shared
+
+    # MiniLM weights (torch backend only; ONNX Runtime manages its own buffers)
+    backend = getattr(extractor.sentence_model, 'backend', extractor.sentence_model)
+    torch_model = getattr(backend, 'model', None)
+    if torch_model is not None and hasattr(torch_model, 'named_parameters'):
+        report['sentence_model'] = share_torch_module(torch_model, store, f'minilm.{model_name}')
+
+    # spaCy static vectors, if the pipeline has any
+    vectors = extractor.nlp.vocab.vectors
+    if vectors.shape[0] > 0:
+        vectors.data = store.publish(f'spacy.{extractor.nlp.meta.get("name", "model")}.vectors',
+                                     np.asarray(vectors.data))
+        report['spacy_vectors'] = vectors.data.nbytes
+
+    logger.info(f"Mapped shared tensors from {store.root}: "
+                f"{sum(report.values()) / 1e6:.1f} MB")
+    return report
+
+def read_process_memory() -> Dict[str, float]:
+    """RSS and PSS (proportional share of shared pages) of this process in MB"""
+    memory = {'rss_mb': 0.0, 'pss_mb': 0.0}
+    try:
+        with open('/proc/self/status', 'r') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    memory['rss_mb'] = int(line.split()[1]) / 1024
+        with open('/proc/self/smaps_rollup', 'r') as f:
+            for line in f:
+                if line.startswith('Pss:'):
+                    memory['pss_mb'] = int(line.split()[1]) / 1024
+    except OSError:
+        import resource
+        scale = 1024 * 1024 if sys.platform == 'darwin' else 1024
+        memory['rss_mb'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale
+    return memory
+
+def _worker(shared_dir: Optional[str], text: str, barrier, results):
+    from ensemble_skill_extractor import EnsembleSkillExtractor, EnsembleConfig
+
+    extractor = EnsembleSkillExtractor(EnsembleConfig(shared_tensor_dir=shared_dir))
+    extractor.ensemble_extract(text)
+    barrier.wait()  # measure only once every worker is fully loaded
+    results.put(read_process_memory())
+    barrier.wait()  # stay alive until everyone has measured, so shared pages stay shared
+
+def measure_worker_memory(num_workers: int = 8, shared_dir: Optional[str] = None,
+                          text: str = "Python developer with AWS, Docker and React experience.") -> Dict:
+    """Start `num_workers` extractor processes and collect each one's RSS/PSS"""
+    import multiprocessing as mp
+
+    ctx = mp.get_context('spawn')
+    barrier = ctx.Barrier(num_workers)
+    results = ctx.Queue()
+    workers = [ctx.Process(target=_worker, args=(shared_dir, text, barrier, results))
+               for _ in range(num_workers)]
+    for worker in workers:
+        worker.start()
+
+    per_worker = [results.get(timeout=900) for _ in workers]
+    for worker in workers:
+        worker.join()
+
+    return {
+        'workers': num_workers,
+        'shared': shared_dir is not None,
+        'per_worker': per_worker,
+        'total_rss_mb': sum(m['rss_mb'] for m in per_worker),
+        'total_pss_mb': sum(m['pss_mb'] for m in per_worker)
+    }
+
+def main():
+    """Memory report: 8 workers with private tensors vs tensors mapped from shared memory"""
+    num_workers = 8
+    shared_dir = default_shared_dir()
+
+    print(f"📊 Worker memory with {num_workers} extractor processes")
+    reports = [measure_worker_memory(num_workers), measure_worker_memory(num_workers, shared_dir)]
+
+    for report in reports:
+        label = "shared tensors" if report['shared'] else "private copies"
+        print(f"\n  {label}:")
+        for i, memory in enumerate(report['per_worker']):
+            print(f"    worker {i}: RSS {memory['rss_mb']:7.1f} MB   PSS {memory['pss_mb']:7.1f} MB")
+        print(f"    total:    RSS {report['total_rss_mb']:7.1f} MB   PSS {report['total_pss_mb']:7.1f} MB")
+
+    saved = reports[0]['total_pss_mb'] - reports[1]['total_pss_mb']
+    print(f"\n✅ Host memory saved (PSS): {saved:.1f} MB across {num_workers} workers")
+
+if __name__ == "__main__":
+    main()
@@ -8,8 +8,12 @@ import plotly.express as px
 import plotly.graph_objects as go
 from ensemble_skill_extractor import EnsembleSkillExtractor, EnsembleConfig
 import json
+from collections import deque
 from datetime import datetime, timedelta
 
+# Newest feedback entries shown in the history table
+FEEDBACK_HISTORY_ROWS = 500
+
 class SkillExtractionDashboard:
     """Interactive dashboard for skill extraction monitoring and feedback"""
     
@@ -316,16 +320,18 @@ class SkillExtractionDashboard:
         # Feedback history
         st.subheader("📊 Feedback History")
         
-        if self.extractor.feedback_data:
+        # Stream the on-disk log and keep only the most recent entries in memory
+        recent_feedback = deque(self.extractor.feedback_store.iter_feedback(), maxlen=FEEDBACK_HISTORY_ROWS)
+        if recent_feedback:
             feedback_df = pd.DataFrame([
                 {
-                    'Timestamp': entry['timestamp'].strftime('%Y-%m-%d %H:%M'),
-                    'User': entry.get('user_id', 'anonymous'),
+                    'Timestamp': datetime.fromisoformat(entry['timestamp']).strftime('%Y-%m-%d %H:%M'),
+                    'User': entry.get('user_id') or 'anonymous',
                     'Predicted Count': len(entry['predicted']),
                     'Correct Count': len(entry['correct']),
                     'Accuracy': len(set(entry['predicted']) & set(entry['correct'])) / max(len(entry['predicted']), 1)
                 }
-                for entry in self.extractor.feedback_data
+                for entry in reversed(recent_feedback)
             ])
             
             st.dataframe(feedback_df, use_container_width=True)
@@ -370,17 +376,21 @@ class SkillExtractionDashboard:
             embedding_threshold = st.slider("Embedding Threshold", 0.0, 1.0, self.extractor.config.embedding_threshold, 0.05)
         
         if st.button("💾 Update Configuration", type="primary"):
-            # Update configuration
+            # Update configuration (the config is frozen; swap in an updated copy)
+            updates = {
+                'min_confidence': min_confidence,
+                'fuzzy_threshold': fuzzy_threshold,
+                'tfidf_threshold': tfidf_threshold,
+                'embedding_threshold': embedding_threshold
+            }
             if total_weight > 0:
-                self.extractor.config.spacy_weight = spacy_weight / total_weight
-                self.extractor.config.fuzzy_weight = fuzzy_weight / total_weight
-                self.extractor.config.tfidf_weight = tfidf_weight / total_weight
-                self.extractor.config.embedding_weight = embedding_weight / total_weight
-            
-            self.extractor.config.min_confidence = min_confidence
-            self.extractor.config.fuzzy_threshold = fuzzy_threshold
-            self.extractor.config.tfidf_threshold = tfidf_threshold
-            self.extractor.config.embedding_threshold = embedding_threshold
+                updates.update({
+                    'spacy_weight': spacy_weight / total_weight,
+                    'fuzzy_weight': fuzzy_weight / total_weight,
+                    'tfidf_weight': tfidf_weight / total_weight,
+                    'embedding_weight': embedding_weight / total_weight
+                })
+            self.extractor.config = self.extractor.config.with_overrides(updates)
             
             st.success("✅ Configuration updated!")
         
@@ -414,9 +424,7 @@ class SkillExtractionDashboard:
                 try:
                     config_data = json.load(uploaded_config)
                     # Load configuration
-                    for key, value in config_data.items():
-                        if hasattr(self.extractor.config, key):
-                            setattr(self.extractor.config, key, value)
+                    self.extractor.config = self.extractor.config.with_overrides(config_data)
                     st.success("✅ Configuration imported!")
                 except Exception as e:
                     st.error(f"❌ Error importing config: {e}")
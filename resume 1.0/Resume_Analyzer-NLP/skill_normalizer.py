@@ -0,0 +1,132 @@
+"""
+Skill Normalization Service
+Interned surface form -> (skill_id, canonical_name, category) lookup built once per ontology
+version, with a bounded cache keyed by the raw string for bulk extraction runs
+"""
+
+import hashlib
+import json
+import threading
+from functools import lru_cache
+from typing import Dict, Iterable, Mapping, NamedTuple, Optional
+
+DEFAULT_CACHE_SIZE = 8192
+DEFAULT_CATEGORY = 'other'
+
+class ResolvedSkill(NamedTuple):
+    skill_id: Optional[str]
+    canonical_name: str
+    category: str
+
+def ontology_version(canonical_skills: Mapping[str, str], aliases: Mapping[str, Iterable[str]],
+                     categories: Mapping[str, Iterable[str]]) -> str:
+    """Stable id for an ontology's content; one normalizer is built per distinct version"""
+    payload = json.dumps({
+        'canonical_skills': sorted(canonical_skills.items()),
+        'aliases': [[canonical, sorted(names)] for canonical, names in aliases.items()],
+        # Category order decides which category wins for a skill listed twice
+        'categories': [[category, sorted(members)] for category, members in categories.items()]
+    }, ensure_ascii=False)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()[:16]
+
+class SkillNormalizer:
+    """Resolves raw skill strings against one ontology version
+
+    All canonical ids, display names, aliases and category members are folded into a single dict
+    keyed by their lower-cased form, so a lookup is one hash probe instead of a scan
+    over every alias list. Results for raw surface forms (before lower/strip) are
+    memoised in a bounded LRU; unknown strings are cached too, since bulk runs keep
+    seeing the same noun chunks.
+    """
+
+    def __init__(self, canonical_skills: Mapping[str, str], aliases: Mapping[str, Iterable[str]] = None,
+                 categories: Mapping[str, Iterable[str]] = None, cache_size: int = DEFAULT_CACHE_SIZE,
+                 default_category: str = DEFAULT_CATEGORY, version: str = None):
+        aliases = aliases or {}
+        categories = categories or {}
+        self.version = version or ontology_version(canonical_skills, aliases, categories)
+        self.default_category = default_category
+
+        # First category listing a skill wins, matching the old if/elif chains
+        category_of: Dict[str, str] = {}
+        for category, members in categories.items():
+            for member in members:
+                category_of.setdefault(member.lower(), category)
+
+        # canonical_name None means "keep the caller's surface form" (an alias pointing
+        # at an id with no display name resolved to the input string before, too)
+        self._entries: Dict[str, tuple] = {}
+        for skill_id, name in canonical_skills.items():
+            self._intern(skill_id.lower(), skill_id, name, category_of)
+        # Display names ("Machine Learning" for machine_learning) resolve to their id too
+        for skill_id, name in canonical_skills.items():
+            if name:
+                self._intern(name.lower(), skill_id, name, category_of)
+        for canonical, names in aliases.items():
+            for alias in names:
+                self._intern(alias.lower(), canonical, canonical_skills.get(canonical), category_of)
+        for member, category in category_of.items():
+            self._intern(member, member, canonical_skills.get(member), category_of)
+
+        self._resolve_cached = lru_cache(maxsize=cache_size)(self._resolve)
+
+    def _intern(self, key: str, skill_id: str, name: Optional[str], category_of: Dict[str, str]):
+        if key not in self._entries:
+            category = category_of.get(skill_id.lower(), category_of.get(key, self.default_category))
+            self._entries[key] = (skill_id, name, category)
+
+    def _resolve(self, raw: str) -> ResolvedSkill:
+        entry = self._entries.get(raw.lower().strip())
+        if entry is None:
+            return ResolvedSkill(None, raw, self.default_category)
+        skill_id, name, category = entry
+        return ResolvedSkill(skill_id, raw if name is None else name, category)
+
+    def resolve(self, raw: str) -> ResolvedSkill:
+        """(skill_id, canonical_name, category) for a raw string; skill_id is None when unknown"""
+        return self._resolve_cached(raw)
+
+    def normalize(self, raw: str) -> str:
+        return self._resolve_cached(raw).canonical_name
+
+    def categorize(self, raw: str) -> str:
+        return self._resolve_cached(raw).category
+
+    @property
+    def vocabulary_size(self) -> int:
+        return len(self._entries)
+
+    def clear_cache(self):
+        self._resolve_cached.cache_clear()
+
+    def get_stats(self) -> Dict:
+        info = self._resolve_cached.cache_info()
+        lookups = info.hits + info.misses
+        return {
+            'version': self.version,
+            'vocabulary': len(self._entries),
+            'hits': info.hits,
+            'misses': info.misses,
+            'hit_rate': info.hits / lookups if lookups else 0.0,
+            'cached_entries': info.currsize,
+            'capacity': info.maxsize
+        }
+
+_normalizers: Dict[tuple, SkillNormalizer] = {}
+_normalizers_lock = threading.Lock()
+
+def get_normalizer(canonical_skills: Mapping[str, str], aliases: Mapping[str, Iterable[str]] = None,
+                   categories: Mapping[str, Iterable[str]] = None, cache_size: int = DEFAULT_CACHE_SIZE,
+                   default_category: str = DEFAULT_CATEGORY) -> SkillNormalizer:
+    """Shared normalizer for this ontology version; built on first request, reused afterwards"""
+    aliases = aliases or {}
+    categories = categories or {}
+    version = ontology_version(canonical_skills, aliases, categories)
+    key = (version, default_category)
+    with _normalizers_lock:
+        normalizer = _normalizers.get(key)
+        if normalizer is None:
+            normalizer = SkillNormalizer(canonical_skills, aliases, categories, cache_size=cache_size,
+                                         default_category=default_category, version=version)
+            _normalizers[key] = normalizer
+        return normalizer
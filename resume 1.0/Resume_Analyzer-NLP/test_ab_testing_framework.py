@@ -0,0 +1,413 @@
+#!/usr/bin/env python3
+"""
+A/B Testing Framework Tests
+Storage, assignment and result aggregation checks for ab_testing_framework.py
+"""
+
+import sys
+import os
+import json
+import multiprocessing
+import random
+import statistics
+import tempfile
+import time
+from contextlib import redirect_stdout
+from io import StringIO
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import ab_testing_framework as ab
+
+def make_variants(control_share: float = 50.0) -> list:
+    return [
+        ab.TestVariant(variant_id="control", name="Control", description="Current config",
+                       config={'embedding_weight': 0.25}, traffic_percentage=control_share, is_control=True),
+        ab.TestVariant(variant_id="treatment", name="Treatment", description="Embedding heavy",
+                       config={'embedding_weight': 0.5}, traffic_percentage=100.0 - control_share)
+    ]
+
+def make_metrics(f1: float = 0.8, extraction_time: float = 0.5) -> ab.TestMetrics:
+    return ab.TestMetrics(precision=f1, recall=f1, f1_score=f1, extraction_time=extraction_time,
+                          user_satisfaction=4.0, total_extractions=10)
+
+def test_sqlite_storage_round_trip():
+    """Tests, assignments and metric events survive a new manager instance"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'ab_tests.db')
+        manager = ab.ABTestManager(db_path)
+        test_id = manager.create_test("Storage", "round trip", make_variants())
+        manager.start_test(test_id)
+        variant_id = manager.assign_user_to_variant("user_1", test_id)
+        manager.record_metrics(test_id, variant_id, make_metrics(0.9))
+        manager.record_metrics(test_id, variant_id, make_metrics(0.7))
+
+        reloaded = ab.ABTestManager(db_path)
+        assert reloaded.tests[test_id].status == ab.TestStatus.ACTIVE
+        assert [v.variant_id for v in reloaded.tests[test_id].variants] == ["control", "treatment"]
+        assert reloaded.assign_user_to_variant("user_1", test_id) == variant_id
+
+        results = reloaded.get_test_results(test_id)
+        variant_results = results['variants'][variant_id]['results']
+        assert variant_results['sample_size'] == 2
+        assert abs(variant_results['metrics']['f1_score']['mean'] - 0.8) < 1e-9
+
+        mode = reloaded.store.conn.execute("PRAGMA journal_mode").fetchone()[0]
+        assert mode == 'wal'
+        manager.store.close()
+        reloaded.store.close()
+
+def test_json_migration():
+    """A legacy ab_tests.json is imported once into the SQLite store next to it"""
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = os.path.join(tmp, 'ab_tests.json')
+        legacy = ab.ABTestManager(os.path.join(tmp, 'seed.db'))
+        test_id = legacy.create_test("Legacy", "from json", make_variants())
+        legacy_data = {
+            'tests': {test_id: legacy.tests[test_id].to_dict()},
+            'user_assignments': {'user_7': {test_id: 'treatment'}},
+            'test_results': {test_id: {'control': [make_metrics(0.6).to_dict()] * 3}}
+        }
+        with open(json_path, 'w') as f:
+            json.dump(legacy_data, f)
+
+        # The backend CLI streams JSON results on stdout, so migration must not print there
+        stdout = StringIO()
+        with redirect_stdout(stdout):
+            manager = ab.ABTestManager(json_path)
+        assert stdout.getvalue() == ''
+        assert os.path.exists(ab.default_db_path(json_path))
+        assert manager.tests[test_id].name == "Legacy"
+        assert manager.store.count_metrics(test_id, 'control') == 3
+        manager.start_test(test_id)
+        assert manager.assign_user_to_variant('user_7', test_id) == 'treatment'
+
+        # A second start must not import the same rows again
+        again = ab.ABTestManager(json_path)
+        assert again.store.count_metrics(test_id, 'control') == 3
+        for m in (legacy, manager, again):
+            m.store.close()
+
+def test_hash_assignment_matches_traffic_split():
+    """100k users land in each variant in proportion to its traffic percentage"""
+    variants = make_variants(control_share=70.0)
+    users = [f"user_{i}" for i in range(100000)]
+    counts = {'control': 0, 'treatment': 0}
+    for user_id in users:
+        counts[ab.pick_variant(variants, ab.assignment_point("split-test", user_id)).variant_id] += 1
+
+    assert abs(counts['control'] / len(users) - 0.70) < 0.01
+    assert abs(counts['treatment'] / len(users) - 0.30) < 0.01
+
+def test_hash_assignment_is_stable_and_independent_across_tests():
+    """Same user, same test -> same variant; different tests shuffle users independently"""
+    variants = make_variants()
+    users = [f"user_{i}" for i in range(20000)]
+    first = [ab.pick_variant(variants, ab.assignment_point("test-a", u)).variant_id for u in users]
+    again = [ab.pick_variant(variants, ab.assignment_point("test-a", u)).variant_id for u in users]
+    other = [ab.pick_variant(variants, ab.assignment_point("test-b", u)).variant_id for u in users]
+    resalted = [ab.pick_variant(variants, ab.assignment_point("test-a", u, "v2")).variant_id for u in users]
+    assert first == again
+
+    # With a 50/50 split, being in control for test-a says nothing about test-b
+    both_control = sum(1 for a, b in zip(first, other) if a == b == 'control') / len(users)
+    assert abs(both_control - 0.25) < 0.015
+    changed = sum(1 for a, b in zip(first, resalted) if a != b) / len(users)
+    assert abs(changed - 0.5) < 0.015
+
+def test_assignment_sees_tests_created_by_another_process():
+    """A worker with a fresh cache still finds a test another worker just created"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'ab_tests.db')
+        worker = ab.ABTestManager(db_path, refresh_interval=3600)
+        creator = ab.ABTestManager(db_path)
+        test_id = creator.create_test("Elsewhere", "created by another worker", make_variants())
+        creator.start_test(test_id)
+
+        assert test_id not in worker.tests
+        assert worker.assign_user_to_variant("user_1", test_id) == creator.assign_user_to_variant("user_1", test_id)
+        assert worker.assign_user_to_variant("user_1", "no_such_test") is None
+        creator.store.close()
+        worker.store.close()
+
+def test_assignment_stores_nothing_per_user_and_honours_pins():
+    """Only pinned users get a row; everyone else is recomputed from the hash"""
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = ab.ABTestManager(os.path.join(tmp, 'ab_tests.db'))
+        test_id = manager.create_test("Pins", "overrides", make_variants())
+        manager.start_test(test_id)
+
+        for i in range(1000):
+            manager.assign_user_to_variant(f"user_{i}", test_id)
+        rows = manager.store.conn.execute("SELECT COUNT(*) FROM assignment_overrides").fetchone()[0]
+        assert rows == 0
+
+        natural = manager.assign_user_to_variant("qa_account", test_id)
+        forced = 'treatment' if natural == 'control' else 'control'
+        assert manager.pin_user(test_id, "qa_account", forced)
+        assert not manager.pin_user(test_id, "qa_account", "no_such_variant")
+        assert manager.assign_user_to_variant("qa_account", test_id) == forced
+        assert manager.unpin_user(test_id, "qa_account")
+        assert manager.assign_user_to_variant("qa_account", test_id) == natural
+        manager.store.close()
+
+def test_streaming_aggregates_match_full_recompute():
+    """Welford mean/std/min/max agree with statistics over the full sample list"""
+    rng = random.Random(7)
+    samples = [make_metrics(rng.uniform(0.5, 0.95), rng.uniform(0.05, 3.0)) for _ in range(2000)]
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = ab.ABTestManager(os.path.join(tmp, 'ab_tests.db'))
+        test_id = manager.create_test("Aggregates", "welford", make_variants())
+        for metrics in samples:
+            manager.record_metrics(test_id, 'control', metrics)
+
+        summary = manager.get_test_results(test_id)['variants']['control']['results']
+        assert summary['sample_size'] == len(samples)
+        for name in ('f1_score', 'extraction_time'):
+            values = [getattr(m, name) for m in samples]
+            stats = summary['metrics'][name]
+            assert abs(stats['mean'] - statistics.mean(values)) < 1e-9
+            assert abs(stats['std'] - statistics.stdev(values)) < 1e-9
+            assert stats['min'] == min(values) and stats['max'] == max(values)
+
+        # Raw events are opt-in
+        assert manager.store.load_metrics(test_id, 'control') == []
+        manager.store.close()
+
+def test_accumulator_merge_equals_single_pass():
+    """Merging partial aggregates (e.g. per worker) gives the same result as one pass"""
+    rng = random.Random(11)
+    values = [rng.gauss(10, 3) for _ in range(5000)]
+    whole, left, right = ab.MetricAccumulator(), ab.MetricAccumulator(), ab.MetricAccumulator()
+    for i, value in enumerate(values):
+        whole.update(value)
+        (left if i % 3 else right).update(value)
+    left.merge(right)
+    assert left.count == whole.count
+    assert abs(left.mean - whole.mean) < 1e-9
+    assert abs(left.std - whole.std) < 1e-9
+    assert (left.min_value, left.max_value) == (whole.min_value, whole.max_value)
+
+def test_raw_events_kept_when_enabled():
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = ab.ABTestManager(os.path.join(tmp, 'ab_tests.db'), keep_raw_events=True)
+        test_id = manager.create_test("Raw", "events", make_variants())
+        manager.record_metrics(test_id, 'treatment', make_metrics(0.75))
+        assert manager.store.load_metrics(test_id, 'treatment') == [make_metrics(0.75)]
+        manager.store.close()
+
+def exact_quantile(values: list, q: float) -> float:
+    ordered = sorted(values)
+    return ordered[int(q * (len(ordered) - 1))]
+
+def test_quantile_sketch_relative_accuracy():
+    """p50-p99 from the sketch are within the configured relative error of the exact values"""
+    rng = random.Random(3)
+    latencies = [rng.lognormvariate(-1.0, 0.8) for _ in range(50000)]
+    sketch = ab.QuantileSketch(alpha=0.01)
+    for value in latencies:
+        sketch.add(value)
+    for q in ab.REPORTED_QUANTILES:
+        exact = exact_quantile(latencies, q)
+        assert abs(sketch.quantile(q) - exact) / exact <= 0.0101
+
+def test_quantile_sketches_merge_across_workers():
+    """Per-worker sketches merged together equal one sketch over all samples"""
+    rng = random.Random(5)
+    latencies = [rng.expovariate(2.0) for _ in range(20000)]
+    combined = ab.QuantileSketch()
+    workers = [ab.QuantileSketch() for _ in range(4)]
+    for i, value in enumerate(latencies):
+        combined.add(value)
+        workers[i % 4].add(value)
+    merged = ab.QuantileSketch()
+    for sketch in workers:
+        merged.merge(sketch)
+    assert merged.bins == combined.bins
+    assert merged.percentiles() == combined.percentiles()
+
+def test_results_report_latency_percentiles():
+    """A variant with a slow tail shows it at p99 even when the means are close"""
+    rng = random.Random(9)
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = ab.ABTestManager(os.path.join(tmp, 'ab_tests.db'))
+        test_id = manager.create_test("Latency", "tails", make_variants())
+        for _ in range(1000):
+            manager.record_metrics(test_id, 'control', make_metrics(extraction_time=rng.uniform(0.4, 0.6)))
+            slow = rng.random() < 0.03
+            manager.record_metrics(test_id, 'treatment',
+                                   make_metrics(extraction_time=3.0 if slow else rng.uniform(0.3, 0.45)))
+
+        variants = manager.get_test_results(test_id)['variants']
+        control = variants['control']['results']['metrics']['extraction_time']
+        treatment = variants['treatment']['results']['metrics']['extraction_time']
+        assert set(ab.QuantileSketch().percentiles()) <= set(control)
+        assert abs(treatment['p99'] - 3.0) / 3.0 <= 0.0101
+        assert control['p99'] < 0.61
+        manager.store.close()
+
+def make_guarded_test(manager, rule: ab.GuardrailRule) -> str:
+    test_id = manager.create_test("Guardrails", "slow variant", make_variants(), guardrails=[rule])
+    manager.start_test(test_id)
+    return test_id
+
+def test_guardrail_pauses_slow_variant():
+    """A variant whose p95 latency exceeds 1.25x control is paused and control takes its traffic"""
+    rng = random.Random(13)
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'ab_tests.db')
+        manager = ab.ABTestManager(db_path, guardrail_check_interval=100)
+        rule = ab.GuardrailRule(metric='extraction_time', statistic='p95', max_ratio_to_control=1.25)
+        test_id = make_guarded_test(manager, rule)
+        for _ in range(200):
+            manager.record_metrics(test_id, 'control', make_metrics(extraction_time=rng.uniform(0.4, 0.6)))
+            manager.record_metrics(test_id, 'treatment', make_metrics(extraction_time=rng.uniform(0.8, 1.2)))
+
+        reloaded = ab.ABTestManager(db_path)
+        treatment = next(v for v in reloaded.tests[test_id].variants if v.variant_id == 'treatment')
+        control = next(v for v in reloaded.tests[test_id].variants if v.is_control)
+        assert treatment.status == 'paused' and treatment.traffic_percentage == 0.0
+        assert control.traffic_percentage == 100.0
+        assert {reloaded.assign_user_to_variant(f"user_{i}", test_id) for i in range(500)} == {'control'}
+        # A pin to the paused variant no longer routes traffic to it
+        assert reloaded.pin_user(test_id, "qa_account", 'treatment')
+        assert reloaded.assign_user_to_variant("qa_account", test_id) == 'control'
+
+        events = reloaded.get_test_results(test_id)['guardrail_events']
+        assert len(events) == 1 and events[0]['action'] == 'pause'
+        assert 'extraction_time p95' in events[0]['reason']
+        assert events[0]['observed'] > events[0]['threshold']
+        manager.store.close()
+        reloaded.store.close()
+
+def test_guardrail_leaves_comparable_variant_and_downweights():
+    """Similar latency never trips; a 'downweight' rule halves traffic instead of pausing"""
+    rng = random.Random(17)
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = ab.ABTestManager(os.path.join(tmp, 'ab_tests.db'), guardrail_check_interval=10**9)
+        rule = ab.GuardrailRule(metric='memory_mb', statistic='mean', max_ratio_to_control=1.25,
+                                action='downweight', downweight_factor=0.5)
+        test_id = make_guarded_test(manager, rule)
+
+        def record(variant_id, memory):
+            metrics = make_metrics()
+            metrics.memory_mb = memory
+            manager.record_metrics(test_id, variant_id, metrics)
+
+        for _ in range(100):
+            record('control', rng.uniform(400, 440))
+            record('treatment', rng.uniform(410, 450))
+        assert manager.evaluate_guardrails(test_id) == []
+
+        for _ in range(200):
+            record('treatment', rng.uniform(900, 1000))
+        fired = manager.evaluate_guardrails(test_id)
+        assert [f['action'] for f in fired] == ['downweight']
+        shares = {v.variant_id: v.traffic_percentage for v in manager.tests[test_id].variants}
+        assert shares == {'control': 75.0, 'treatment': 25.0}
+        # Only active variants are evaluated, so it is not downweighted again
+        assert manager.evaluate_guardrails(test_id) == []
+        manager.store.close()
+
+def test_default_guardrails_skip_process_memory():
+    """Whole-process or per-request RSS cannot be attributed to a variant reliably"""
+    assert [rule.metric for rule in ab.default_guardrails()] == ['extraction_time']
+    rss = ab.current_rss_mb()
+    assert rss > 0 and max(0.0, ab.current_rss_mb() - rss) < 64
+
+def worker_latency(worker: int, i: int) -> float:
+    return 0.1 + worker * 0.05 + (i % 17) * 0.01
+
+def record_from_worker(db_path: str, test_id: str, worker: int, samples: int):
+    """Runs in a separate process with its own manager and connection"""
+    manager = ab.ABTestManager(db_path, batch_size=25, flush_interval=0.05)
+    for i in range(samples):
+        variant_id = 'control' if i % 2 else 'treatment'
+        manager.record_metrics(test_id, variant_id, make_metrics(extraction_time=worker_latency(worker, i)))
+    manager.close()
+
+def test_concurrent_workers_lose_no_metrics():
+    """N processes writing the same database concurrently: every sample is counted once"""
+    workers, samples = 4, 400
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'ab_tests.db')
+        manager = ab.ABTestManager(db_path)
+        test_id = manager.create_test("Workers", "concurrency", make_variants(), guardrails=[])
+        manager.start_test(test_id)
+
+        context = multiprocessing.get_context('spawn')
+        processes = [context.Process(target=record_from_worker, args=(db_path, test_id, w, samples))
+                     for w in range(workers)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join(timeout=120)
+            assert process.exitcode == 0
+
+        expected = {'control': [], 'treatment': []}
+        for w in range(workers):
+            for i in range(samples):
+                expected['control' if i % 2 else 'treatment'].append(worker_latency(w, i))
+
+        aggregates = manager.store.load_aggregates(test_id)
+        sketches = manager.store.load_sketches(test_id)
+        for variant_id, values in expected.items():
+            latency = aggregates[variant_id]['extraction_time']
+            assert latency.count == len(values) == workers * samples // 2
+            assert abs(latency.mean - statistics.mean(values)) < 1e-9
+            assert abs(latency.std - statistics.stdev(values)) < 1e-9
+            assert sketches[variant_id]['extraction_time'].count == len(values)
+        manager.close()
+
+def test_buffered_metrics_flush_on_batch_and_read():
+    """Buffered samples reach the database at batch_size, and before results are read"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'ab_tests.db')
+        manager = ab.ABTestManager(db_path, batch_size=10, flush_interval=3600)
+        observer = ab.ABTestManager(db_path)
+        test_id = manager.create_test("Batches", "buffering", make_variants(), guardrails=[])
+
+        for _ in range(9):
+            manager.record_metrics(test_id, 'control', make_metrics())
+        assert observer.store.count_metrics(test_id, 'control') == 0
+        manager.record_metrics(test_id, 'control', make_metrics())
+        assert observer.store.count_metrics(test_id, 'control') == 10
+
+        manager.record_metrics(test_id, 'control', make_metrics())
+        assert manager.get_test_results(test_id)['variants']['control']['results']['sample_size'] == 11
+
+        # Status changes made by another process are picked up on refresh
+        observer.load_tests()
+        observer.start_test(test_id)
+        assert manager.refresh_tests(force=True)
+        assert manager.tests[test_id].status == ab.TestStatus.ACTIVE
+        manager.close()
+        observer.close()
+
+def test_idle_worker_flushes_on_interval():
+    """Samples buffered by a worker that gets no further requests still land within flush_interval"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'ab_tests.db')
+        manager = ab.ABTestManager(db_path, batch_size=50, flush_interval=0.05)
+        observer = ab.ABTestManager(db_path)
+        test_id = manager.create_test("Idle", "timer flush", make_variants(), guardrails=[])
+
+        for _ in range(3):
+            manager.record_metrics(test_id, 'control', make_metrics())
+        deadline = time.monotonic() + 5
+        while observer.store.count_metrics(test_id, 'control') < 3 and time.monotonic() < deadline:
+            time.sleep(0.02)
+        assert observer.store.count_metrics(test_id, 'control') == 3
+        manager.close()
+        assert not manager._flusher.is_alive()
+        observer.close()
+
+def main():
+    """Run all checks without pytest"""
+    tests = [obj for name, obj in sorted(globals().items()) if name.startswith('test_') and callable(obj)]
+    for test in tests:
+        test()
+        print(f"✅ {test.__name__}")
+    print(f"\n🎉 {len(tests)} A/B testing checks passed")
+
+if __name__ == "__main__":
+    main()
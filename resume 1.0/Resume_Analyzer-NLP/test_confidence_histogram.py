@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Confidence Histogram Tests
+Incremental TP/FP buckets and the F1 threshold sweep in confidence_histogram.py
+"""
+
+import sys
+import os
+import random
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from confidence_histogram import ConfidenceHistogram
+
+def make_feedback(seed: int = 1, documents: int = 300) -> list:
+    """(candidates, correct_skills) pairs: correct skills score high, noise scores low"""
+    rng = random.Random(seed)
+    feedback = []
+    for doc in range(documents):
+        correct = {f"skill_{doc}_{i}" for i in range(rng.randint(2, 6))}
+        candidates = {skill: min(1.0, rng.gauss(0.7, 0.12)) for skill in correct if rng.random() > 0.1}
+        candidates.update({f"noise_{doc}_{i}": max(0.0, rng.gauss(0.4, 0.12)) for i in range(rng.randint(1, 5))})
+        feedback.append((candidates, correct))
+    return feedback
+
+def brute_force_f1(feedback: list, threshold: float) -> float:
+    tp = fp = fn = 0
+    for candidates, correct in feedback:
+        predicted = {skill for skill, confidence in candidates.items() if confidence >= threshold}
+        tp += len(predicted & correct)
+        fp += len(predicted - correct)
+        fn += len(correct - predicted)
+    return 2 * tp / (2 * tp + fp + fn) if tp + fp + fn else 0.0
+
+def test_sweep_matches_brute_force_at_bucket_edges():
+    """Every threshold's F1 from the cumulative sums equals re-scoring all feedback"""
+    feedback = make_feedback()
+    histogram = ConfidenceHistogram(buckets=50)
+    for candidates, correct in feedback:
+        histogram.add_feedback(candidates, correct)
+
+    curve = histogram.sweep()
+    for threshold, f1 in zip(curve['threshold'], curve['f1']):
+        # A confidence lands in the bucket below its value, so compare with edge-aligned scores
+        aligned = [({skill: histogram.edges[histogram.bucket(c)] for skill, c in candidates.items()}, correct)
+                   for candidates, correct in feedback]
+        assert abs(f1 - brute_force_f1(aligned, threshold)) < 1e-12
+
+def test_best_threshold_separates_signal_from_noise():
+    histogram = ConfidenceHistogram()
+    for candidates, correct in make_feedback(seed=2):
+        histogram.add_feedback(candidates, correct)
+
+    best = histogram.best_threshold()
+    assert 0.45 <= best['threshold'] <= 0.65
+    assert best['f1'] >= max(histogram.sweep()['f1']) - 1e-12
+    bounded = histogram.best_threshold(bounds=(0.7, 0.8))
+    assert 0.7 <= bounded['threshold'] <= 0.8 and bounded['f1'] <= best['f1']
+
+def test_missed_skills_count_as_false_negatives():
+    histogram = ConfidenceHistogram(buckets=10)
+    histogram.add_feedback({'python': 0.9, 'excel': 0.3}, ['python', 'docker'])
+    assert histogram.missed == 1
+    best = histogram.best_threshold()
+    assert best['recall'] == 0.5 and best['precision'] == 1.0
+
+def test_merge_and_round_trip():
+    """Per-worker histograms merge into the same counts as one histogram over everything"""
+    feedback = make_feedback(seed=3, documents=100)
+    whole, left, right = ConfidenceHistogram(), ConfidenceHistogram(), ConfidenceHistogram()
+    for i, (candidates, correct) in enumerate(feedback):
+        whole.add_feedback(candidates, correct)
+        (left if i % 2 else right).add_feedback(candidates, correct)
+    left.merge(right)
+    assert left.to_dict() == whole.to_dict()
+    assert ConfidenceHistogram.from_dict(whole.to_dict()).best_threshold() == whole.best_threshold()
+
+def test_empty_histogram_has_no_threshold():
+    assert ConfidenceHistogram().best_threshold() is None
+
+def main():
+    """Run all checks without pytest"""
+    tests = [obj for name, obj in sorted(globals().items()) if name.startswith('test_') and callable(obj)]
+    for test in tests:
+        test()
+        print(f"✅ {test.__name__}")
+    print(f"\n🎉 {len(tests)} confidence histogram checks passed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Config-Driven Training Tests
+Held-out dev data, early stopping and the best checkpoint in Training/train_with_config.py
+"""
+
+import sys
+import os
+import json
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Training'))
+
+import spacy
+
+from train_with_config import resume_dev_data, train_with_config
+
+def test_dev_data_labels_expected_skills():
+    nlp = spacy.blank("en")
+    dev_data = resume_dev_data(nlp, size=5)
+    assert len(dev_data) == 5
+    for text, annotations in dev_data:
+        assert annotations['entities']
+        for start, end, label in annotations['entities']:
+            assert label == 'SKILL' and text[start:end].strip() == text[start:end]
+
+def test_stops_early_and_keeps_best_checkpoint():
+    with tempfile.TemporaryDirectory() as root:
+        output_dir = os.path.join(root, 'run')
+        metadata = train_with_config(
+            output_dir, dev_size=10, corpus_dir=os.path.join(root, 'corpus'),
+            overrides={'training.eval_frequency': 20, 'training.patience': 40, 'training.max_steps': 2000}
+        )
+        assert metadata['stopped_early'] and metadata['steps_trained'] < 2000
+        assert metadata['steps_trained'] - metadata['best_step'] >= 40
+        assert set(metadata['benchmark']) == {'precision', 'recall', 'f1', 'words_per_second'}
+
+        best_dir = os.path.join(output_dir, 'model-best')
+        with open(os.path.join(best_dir, 'training_metadata.json')) as f:
+            assert json.load(f)['best_step'] == metadata['best_step']
+        best = spacy.load(best_dir)
+        assert abs(best.meta['performance']['ents_f'] - metadata['benchmark']['f1']) < 1e-6
+
+def main():
+    """Run all checks without pytest"""
+    tests = [obj for name, obj in sorted(globals().items()) if name.startswith('test_') and callable(obj)]
+    for test in tests:
+        test()
+        print(f"✅ {test.__name__}")
+    print(f"\n🎉 {len(tests)} config training checks passed")
+
+if __name__ == "__main__":
+    main()
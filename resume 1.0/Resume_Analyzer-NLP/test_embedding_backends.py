@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Embedding Backend Tests
+The EmbeddingBackend interface and int8 ONNX parity with the float ONNX graph
+"""
+
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+import pytest
+
+from embedding_backends import EmbeddingBackend, OnnxEmbeddingBackend, check_parity, PARITY_MIN_COSINE
+
+SENTENCES = [
+    "Senior Python developer with five years of AWS and Docker experience",
+    "Built React dashboards backed by a PostgreSQL reporting database",
+    "Led a team of four data scientists shipping TensorFlow models to production",
+    "Certified Kubernetes administrator; maintains CI/CD pipelines in Jenkins",
+    "Fluent in Spanish, strong written communication and stakeholder management",
+]
+
+def test_backend_must_implement_encode():
+    with pytest.raises(TypeError):
+        EmbeddingBackend()
+
+    class Incomplete(EmbeddingBackend):
+        name = 'incomplete'
+    with pytest.raises(TypeError):
+        Incomplete()
+
+    class Constant(EmbeddingBackend):
+        name = 'constant'
+        def encode(self, texts, batch_size: int = 32, **kwargs) -> np.ndarray:
+            return np.ones((len(texts), 4), dtype=np.float32)
+    assert check_parity(Constant(), Constant(), SENTENCES)['min_cosine'] == pytest.approx(1.0)
+
+def test_int8_onnx_matches_float_onnx():
+    """Quantizing the exported graph keeps every sentence's embedding direction"""
+    pytest.importorskip('onnxruntime')
+    pytest.importorskip('transformers')
+    pytest.importorskip('sentence_transformers')  # exports the graph on first use
+
+    with tempfile.TemporaryDirectory() as root:
+        export_dir = os.path.join(root, 'onnx')
+        fp32 = OnnxEmbeddingBackend(export_dir=export_dir, quantize=False)
+        int8 = OnnxEmbeddingBackend(export_dir=export_dir, quantize=True)
+        assert int8.name == 'onnx-int8'
+        assert fp32.encode(SENTENCES).shape == int8.encode(SENTENCES).shape == (len(SENTENCES), 384)
+
+        parity = check_parity(fp32, int8, SENTENCES)
+        assert parity['min_cosine'] >= PARITY_MIN_COSINE, parity
+
+def main():
+    """Run all checks without pytest"""
+    tests = [obj for name, obj in sorted(globals().items()) if name.startswith('test_') and callable(obj)]
+    for test in tests:
+        try:
+            test()
+        except pytest.skip.Exception as e:
+            print(f"⏭️ {test.__name__}: {e}")
+            continue
+        print(f"✅ {test.__name__}")
+    print(f"\n🎉 {len(tests)} embedding backend checks run")
+
+if __name__ == "__main__":
+    main()
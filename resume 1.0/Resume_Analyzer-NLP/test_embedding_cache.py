@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Embedding Cache Tests
+Set-associative CLOCK cache, per-set seqlock and cross-process sharing in embedding_cache.py
+"""
+
+import sys
+import os
+import tempfile
+import multiprocessing as mp
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+
+from embedding_cache import EmbeddingCache, sentence_key
+
+DIM = 64
+
+def vector_for(key: bytes) -> np.ndarray:
+    """Deterministic vector per key, so any hit can be checked for tearing"""
+    return np.full(DIM, int.from_bytes(key[:4], 'little') % 100003, dtype=np.float32)
+
+def test_hit_miss_and_normalized_keys():
+    cache = EmbeddingCache(capacity=64, dim=DIM)
+    key = sentence_key("Python  and AWS")
+    assert cache.get(key) is None
+    cache.put(key, vector_for(key))
+    assert np.array_equal(cache.get(sentence_key("python and aws")), vector_for(key))
+    assert cache.stats['hits'] == 1 and cache.stats['misses'] == 1
+
+def test_set_being_written_reads_as_miss():
+    cache = EmbeddingCache(capacity=64, dim=DIM)
+    key = sentence_key("Docker")
+    cache.put(key, vector_for(key))
+    set_index = cache._set_base(key) // cache.ways
+    cache.versions[set_index] += 1  # a writer in another process is mid-write
+    assert cache.get(key) is None
+    # The next completed write makes the set readable again
+    cache.put(key, vector_for(key))
+    assert cache.versions[set_index] % 2 == 0
+    assert np.array_equal(cache.get(key), vector_for(key))
+
+def test_layout_change_does_not_touch_mapped_files():
+    with tempfile.TemporaryDirectory() as root:
+        old = EmbeddingCache(capacity=64, dim=DIM, path=root, fingerprint='minilm')
+        key = sentence_key("Kubernetes")
+        old.put(key, vector_for(key))
+        EmbeddingCache(capacity=64, dim=DIM, path=root, fingerprint='mpnet')
+        assert np.array_equal(old.get(key), vector_for(key))
+        reopened = EmbeddingCache(capacity=64, dim=DIM, path=root, fingerprint='minilm')
+        assert np.array_equal(reopened.get(key), vector_for(key))
+        assert not [name for name in os.listdir(root) if name.startswith('.tmp-')]
+
+def _hammer(path: str, worker: int, errors):
+    cache = EmbeddingCache(capacity=32, dim=DIM, path=path, ways=4)
+    keys = [sentence_key(f"sentence {i}") for i in range(200)]
+    for round_ in range(20):
+        for i, key in enumerate(keys):
+            if (i + round_ + worker) % 3 == 0:
+                cache.put(key, vector_for(key))
+            else:
+                vector = cache.get(key)
+                if vector is not None and not np.array_equal(vector, vector_for(key)):
+                    errors.put(i)
+
+def test_processes_never_read_a_wrong_vector():
+    with tempfile.TemporaryDirectory() as root:
+        ctx = mp.get_context('spawn')
+        errors = ctx.Queue()
+        workers = [ctx.Process(target=_hammer, args=(root, w, errors)) for w in range(4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+            assert worker.exitcode == 0
+        assert errors.empty()
+
+def main():
+    """Run all checks without pytest"""
+    tests = [obj for name, obj in sorted(globals().items()) if name.startswith('test_') and callable(obj)]
+    for test in tests:
+        test()
+        print(f"✅ {test.__name__}")
+    print(f"\n🎉 {len(tests)} embedding cache checks passed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Ensemble Config Isolation Tests
+Per-call EnsembleConfig objects must not leak between concurrent requests
+"""
+
+import sys
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import FrozenInstanceError
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from ensemble_skill_extractor import EnsembleSkillExtractor, EnsembleConfig
+
+RESUME = """
+Jane Smith
+jane.smith@example.com | Boston, MA
+
+Technical Skills:
+Python, JavaScript, React, Node.js, Docker, Kubernetes, AWS, PostgreSQL, TensorFlow
+
+Experience:
+Machine Learning Engineer - built training pipelines in Python with TensorFlow and
+scikit-learn, deployed models on AWS with Docker and Kubernetes, and wrote React
+dashboards backed by Node.js and PostgreSQL.
+
+Education:
+B.Sc. Computer Science, Northeastern University
+"""
+
+_extractor = None
+# Feedback and reference index files go here, not into the repo's TrainedModel/
+_workdir = tempfile.TemporaryDirectory()
+
+def get_extractor() -> EnsembleSkillExtractor:
+    """Models are loaded once and shared by every check, as in a server process"""
+    global _extractor
+    if _extractor is None:
+        _extractor = EnsembleSkillExtractor(EnsembleConfig(
+            feedback_dir=os.path.join(_workdir.name, 'feedback'),
+            reference_index_dir=os.path.join(_workdir.name, 'reference_index')
+        ))
+    return _extractor
+
+def signature(matches) -> list:
+    return [(m.skill, round(m.confidence, 6), m.position) for m in matches]
+
+def test_config_is_frozen_and_copied_on_override():
+    config = EnsembleConfig()
+    try:
+        config.min_confidence = 0.9
+        raise AssertionError("EnsembleConfig should be immutable")
+    except FrozenInstanceError:
+        pass
+
+    derived = config.with_overrides({'min_confidence': 0.9, 'not_a_field': 1}, fuzzy_threshold=90)
+    assert (derived.min_confidence, derived.fuzzy_threshold) == (0.9, 90)
+    assert config.min_confidence == EnsembleConfig().min_confidence
+
+def test_resource_fields_cannot_change_per_call():
+    extractor = get_extractor()
+    other_model = extractor.config.with_overrides(embedding_model_name='all-mpnet-base-v2')
+    try:
+        extractor.ensemble_extract(RESUME, config=other_model)
+        raise AssertionError("a different embedding model needs its own extractor")
+    except ValueError as e:
+        assert 'embedding_model_name' in str(e)
+
+def test_concurrent_variants_are_isolated():
+    """Threads serving different variants on one extractor each get their own variant's result"""
+    extractor = get_extractor()
+    shared = extractor.config
+    variants = {
+        'strict': shared.with_overrides(min_confidence=0.6),
+        'lenient': shared.with_overrides(min_confidence=0.1, fuzzy_weight=0.6, embedding_weight=0.05),
+        'full_text': shared.with_overrides(min_confidence=0.2, use_section_routing=False),
+    }
+    expected = {name: signature(extractor.ensemble_extract(RESUME, config=config))
+                for name, config in variants.items()}
+    assert expected['strict'] != expected['lenient']
+
+    def run(name):
+        return name, signature(extractor.ensemble_extract(RESUME, config=variants[name]))
+
+    jobs = [name for _ in range(20) for name in variants]
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(run, jobs))
+
+    assert len(results) == len(jobs)
+    for name, result in results:
+        assert result == expected[name], f"variant {name} saw another variant's settings"
+    assert extractor.config is shared
+    assert signature(extractor.ensemble_extract(RESUME)) == signature(extractor.ensemble_extract(RESUME, config=shared))
+
+def test_feedback_stays_in_the_configured_directory():
+    extractor = get_extractor()
+    before = extractor.feedback_count
+    extractor.add_feedback(RESUME, ['Python'], ['Python', 'Docker'], 'user_1', confidences={'Python': 0.9})
+    assert extractor.feedback_count == before + 1
+    assert extractor.feedback_store.root == os.path.join(_workdir.name, 'feedback')
+    assert os.listdir(os.path.join(_workdir.name, 'reference_index'))
+
+def main():
+    """Run all checks without pytest"""
+    tests = [obj for name, obj in sorted(globals().items()) if name.startswith('test_') and callable(obj)]
+    for test in tests:
+        test()
+        print(f"✅ {test.__name__}")
+    print(f"\n🎉 {len(tests)} ensemble config checks passed")
+
+if __name__ == "__main__":
+    main()
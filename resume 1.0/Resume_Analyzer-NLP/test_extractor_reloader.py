@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Extractor Hot Reload Tests
+Publishing a model or ontology version swaps the serving extractor without disturbing requests
+"""
+
+import sys
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from ensemble_skill_extractor import EnsembleConfig, SkillOntology, CUSTOM_MODEL_DIR, ONTOLOGY_FILE
+from extractor_reloader import ExtractorReloader
+from model_registry import ModelRegistry
+
+RESUME = """
+Technical Skills:
+Python, Zig, Docker, Kubernetes, AWS, PostgreSQL
+
+Experience:
+Backend Engineer - services in Python and Zig, deployed with Docker on AWS.
+"""
+
+def make_reloader(root: str) -> ExtractorReloader:
+    config = EnsembleConfig(
+        feedback_dir=os.path.join(root, 'feedback'),
+        model_registry_dir=os.path.join(root, 'models'),
+        ontology_registry_dir=os.path.join(root, 'ontology'),
+        reference_index_dir=os.path.join(root, 'reference_index')
+    )
+    return ExtractorReloader(config, check_interval=0)
+
+def publish_ontology(root: str, **extra_skills) -> str:
+    ontology = SkillOntology()
+    ontology.canonical_skills.update(extra_skills)
+    registry = ModelRegistry(os.path.join(root, 'ontology'))
+    staged = registry.stage()
+    ontology.save(os.path.join(staged, ONTOLOGY_FILE))
+    return registry.publish(staged)
+
+def test_ontology_publish_swaps_extractor():
+    with tempfile.TemporaryDirectory() as root:
+        reloader = make_reloader(root)
+        before = reloader.acquire()
+        assert before.versions == {'model': 'custom', 'ontology': 'builtin'}
+        assert 'Zig' not in {m.skill for m in before.ensemble_extract(RESUME)}
+        assert not reloader.check_for_update(force=True)
+
+        version = publish_ontology(root, zig='Zig')
+        assert reloader.check_for_update(force=True, wait=True)
+        after = reloader.acquire()
+        assert after is not before and after.ontology_version == version
+        assert 'Zig' in {m.skill for m in after.ensemble_extract(RESUME)}
+        # Unchanged resources carry over instead of being loaded twice
+        assert after.sentence_model is before.sentence_model
+        assert after.feedback_store is before.feedback_store
+
+def test_feedback_on_old_extractor_reaches_replacement():
+    """Feedback and a retune that land on the replaced extractor are not lost"""
+    with tempfile.TemporaryDirectory() as root:
+        reloader = make_reloader(root)
+        old = reloader.acquire()
+        publish_ontology(root, zig='Zig')
+        assert reloader.check_for_update(force=True, wait=True)
+        new = reloader.acquire()
+        count = new.feedback_count
+
+        # A request that acquired `old` before the swap reports back afterwards
+        old.add_feedback(RESUME, ['Python'], ['Python', 'Docker'],
+                         confidences={'Python': 0.9, 'Docker': 0.45, 'Java': 0.5})
+        assert new.feedback_count == old.feedback_count == count + 1
+        old.retrain_with_feedback()
+        assert new.config is old.config
+
+def test_model_publish_and_inflight_requests():
+    """Requests started on the old extractor finish on it while the new one is built"""
+    with tempfile.TemporaryDirectory() as root:
+        reloader = make_reloader(root)
+        old = reloader.acquire()
+        expected = [m.skill for m in old.ensemble_extract(RESUME)]
+
+        version = ModelRegistry(os.path.join(root, 'models')).import_directory(CUSTOM_MODEL_DIR)
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            inflight = [pool.submit(old.ensemble_extract, RESUME) for _ in range(8)]
+            assert reloader.check_for_update(force=True, wait=True)
+            assert all([m.skill for m in future.result()] == expected for future in inflight)
+        assert old.model_version == 'custom'
+        assert reloader.acquire().model_version == version
+
+def test_broken_version_keeps_serving():
+    with tempfile.TemporaryDirectory() as root:
+        reloader = make_reloader(root)
+        serving = reloader.acquire()
+        registry = ModelRegistry(os.path.join(root, 'ontology'))
+        staged = registry.stage()
+        with open(os.path.join(staged, ONTOLOGY_FILE), 'w') as f:
+            f.write('{not json')
+        registry.publish(staged)
+
+        assert reloader.check_for_update(force=True, wait=True)
+        assert reloader.acquire() is serving
+        # The failed version is not retried until something else is published
+        assert not reloader.check_for_update(force=True)
+
+def main():
+    """Run all checks without pytest"""
+    tests = [obj for name, obj in sorted(globals().items()) if name.startswith('test_') and callable(obj)]
+    for test in tests:
+        test()
+        print(f"✅ {test.__name__}")
+    print(f"\n🎉 {len(tests)} extractor reload checks passed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Feedback Fine-Tuner Tests
+Span annotation, the feedback cut-off and publish/reject decisions in feedback_finetuner.py
+"""
+
+import sys
+import os
+import csv
+import tempfile
+from datetime import datetime, timedelta
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import spacy
+
+from feedback_finetuner import FeedbackFineTuner, annotate
+from feedback_store import FeedbackStore
+from model_registry import ModelRegistry
+
+FORMS = {
+    'AWS': ['AWS', 'amazon web services'], 'AWS Lambda': ['AWS Lambda'],
+    'C': ['C'], 'C++': ['C++'], 'C#': ['C#', '.net'], 'Python': ['Python']
+}
+START = datetime(2025, 1, 1)
+
+def entities(text: str, skills):
+    example = annotate(spacy.blank("en"), text, skills, FORMS)
+    return [text[ent.start_char:ent.end_char] for ent in example.reference.ents]
+
+def test_longest_mention_wins():
+    text = "Deployed AWS Lambda functions and other Amazon Web Services on AWS."
+    assert entities(text, ['AWS', 'AWS Lambda']) == ['AWS Lambda', 'Amazon Web Services', 'AWS']
+
+def test_symbol_suffixes_are_part_of_the_skill():
+    text = "Wrote C++ engines, C# tools and embedded C firmware."
+    assert entities(text, ['C']) == ['C']
+    assert entities(text, ['C', 'C++', 'C#']) == ['C++', 'C#', 'C']
+    assert entities("Pythonic code", ['Python']) == []
+
+def make_tuner(root: str, **kwargs) -> FeedbackFineTuner:
+    """Tuner over a blank-`en` NER model and a two-resume benchmark"""
+    base_path = os.path.join(root, 'base')
+    nlp = spacy.blank("en")
+    nlp.add_pipe('ner').add_label('SKILL')
+    nlp.initialize()
+    nlp.to_disk(base_path)
+
+    benchmark_csv = os.path.join(root, 'benchmark.csv')
+    with open(benchmark_csv, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=['resume_text', 'expected_skills'])
+        writer.writeheader()
+        writer.writerow({'resume_text': "Python and AWS developer.", 'expected_skills': "['Python', 'AWS']"})
+        writer.writerow({'resume_text': "Built C++ services.", 'expected_skills': "['C++']"})
+
+    options = dict(base_model_path=base_path, benchmark_csv=benchmark_csv, min_feedback=2,
+                   epochs=1, rehearsal_ratio=0.0)
+    options.update(kwargs)
+    return FeedbackFineTuner(ModelRegistry(os.path.join(root, 'registry')),
+                             FeedbackStore(os.path.join(root, 'feedback')), **options)
+
+def add_feedback(tuner: FeedbackFineTuner, days: int):
+    tuner.feedback_store.append(f"Resume {days}: Python and AWS work.", ['Python'], ['Python', 'AWS'],
+                                timestamp=START + timedelta(days=days))
+
+def test_pending_feedback_uses_the_published_cut_off():
+    with tempfile.TemporaryDirectory() as root:
+        tuner = make_tuner(root)
+        for days in (1, 2, 3):
+            add_feedback(tuner, days)
+        assert len(tuner.pending_feedback()) == 3
+
+        cut_off = (START + timedelta(days=2)).isoformat()
+        tuner.registry.publish(tuner.registry.stage(), {'feedback_until': cut_off})
+        pending = tuner.pending_feedback()
+        assert [record['timestamp'] for record in pending] == [(START + timedelta(days=3)).isoformat()]
+        assert pending[0]['text'].startswith("Resume 3")
+
+def test_publish_advances_feedback_until():
+    with tempfile.TemporaryDirectory() as root:
+        tuner = make_tuner(root, min_f1_gain=-1.0)
+        for days in (1, 2):
+            add_feedback(tuner, days)
+        result = tuner.run_once()
+        assert result['status'] == 'published'
+        assert tuner.registry.current_version() == result['version']
+        assert tuner.registry.metadata(result['version'])['feedback_until'] == (START + timedelta(days=2)).isoformat()
+        assert tuner.pending_feedback() == []
+        assert tuner.run_once()['status'] == 'skipped'
+
+def test_rejected_model_is_not_published():
+    with tempfile.TemporaryDirectory() as root:
+        tuner = make_tuner(root, min_f1_gain=1.0)
+        for days in (1, 2):
+            add_feedback(tuner, days)
+        result = tuner.run_once()
+        assert result['status'] == 'rejected' and 'version' not in result
+        assert tuner.registry.list_versions() == [] and tuner.registry.current_version() is None
+        assert not os.listdir(tuner.registry.staging_dir)
+        # Nothing was consumed, so the same feedback is retried next round
+        assert len(tuner.pending_feedback()) == 2
+
+def main():
+    """Run all checks without pytest"""
+    tests = [obj for name, obj in sorted(globals().items()) if name.startswith('test_') and callable(obj)]
+    for test in tests:
+        test()
+        print(f"✅ {test.__name__}")
+    print(f"\n🎉 {len(tests)} feedback fine-tuner checks passed")
+
+if __name__ == "__main__":
+    main()
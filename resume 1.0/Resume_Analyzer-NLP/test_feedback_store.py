@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Feedback Store Tests
+Append-only segments, text deduplication, retention and streaming reads in feedback_store.py
+"""
+
+import sys
+import os
+import gzip
+import tempfile
+from datetime import datetime, timedelta
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from feedback_store import FeedbackStore, text_hash
+
+RESUME = "Python developer with React, Docker and AWS experience. " * 20
+
+def backdate(paths, seconds: float):
+    """Make segments look closed (retention skips recently modified ones)"""
+    stamp = (datetime.now() - timedelta(seconds=seconds)).timestamp()
+    for path in paths:
+        os.utime(path, (stamp, stamp))
+
+def test_append_stores_each_text_once():
+    with tempfile.TemporaryDirectory() as root:
+        store = FeedbackStore(root)
+        for i in range(5):
+            store.append(RESUME, ['Python', 'Developer'], ['Python'], f"user_{i}", {'Python': 0.9, 'Developer': 0.4})
+        store.append("Java and Spring", ['Java'], ['Java', 'Spring'])
+
+        records = list(store.iter_feedback())
+        assert len(records) == 6
+        assert records[0]['text_sha256'] == text_hash(RESUME)
+        assert records[0]['confidences'] == {'Python': 0.9, 'Developer': 0.4}
+        assert 'text' not in records[0]
+        assert store.stats['texts_written'] == 2 and store.stats['texts_deduplicated'] == 4
+        store.close()
+
+def test_open_segment_is_readable_by_another_reader():
+    """Records flushed by a writer that has not closed its segment are visible to a new store"""
+    with tempfile.TemporaryDirectory() as root:
+        writer = FeedbackStore(root)
+        writer.append(RESUME, ['Python'], ['Python'])
+        writer.append(RESUME, ['React'], ['React'])
+
+        reader = FeedbackStore(root)
+        assert reader.count() == 2
+        writer.append(RESUME, ['AWS'], ['AWS'])
+        assert [r['correct'] for r in reader.iter_feedback()] == [['Python'], ['React'], ['AWS']]
+        writer.close()
+
+def test_streaming_with_text_and_since():
+    with tempfile.TemporaryDirectory() as root:
+        store = FeedbackStore(root)
+        old = datetime(2024, 1, 1)
+        store.append("old resume", ['Excel'], ['Excel'], timestamp=old)
+        store.append(RESUME, ['Python'], ['Python'])
+
+        recent = list(store.iter_feedback(since=old + timedelta(days=1), with_text=True))
+        assert len(recent) == 1 and recent[0]['text'] == RESUME
+        store.close()
+
+def test_segments_roll_over_and_stay_compressed():
+    with tempfile.TemporaryDirectory() as root:
+        store = FeedbackStore(root, max_segment_bytes=512)
+        for i in range(200):
+            store.append(f"resume {i}", ['Python'] * 5, ['Python'])
+        store.close()
+
+        segments = store.segments()
+        assert len(segments) > 1
+        with gzip.open(segments[0], 'rt', encoding='utf-8') as f:
+            assert f.readline().startswith('{')
+        assert store.count() == 200
+
+def test_retention_by_age_and_size_collects_texts():
+    with tempfile.TemporaryDirectory() as root:
+        store = FeedbackStore(root, max_segment_bytes=256, retention_days=30)
+        for i in range(60):
+            store.append(f"resume {i} " * 50, ['Python'], ['Python'])
+        store.close()
+        segments = store.segments()
+        assert len(segments) > 3
+        backdate(segments, 60)
+
+        # Age out the first segment
+        stale = (datetime.now() - timedelta(days=45)).timestamp()
+        os.utime(segments[0], (stale, stale))
+        removed = store.apply_retention()
+        assert removed['segments'] == 1 and removed['texts'] > 0
+        assert segments[0] not in store.segments()
+
+        # Size cap drops the oldest remaining segments until the store fits
+        remaining = {r['text_sha256'] for r in store.iter_feedback()}
+        store.max_total_bytes = store.disk_usage() // 2
+        store.apply_retention()
+        assert store.disk_usage() <= store.max_total_bytes
+        kept = {r['text_sha256'] for r in store.iter_feedback()}
+        assert kept < remaining
+        assert all(store.load_text(sha) is not None for sha in kept)
+        assert all(store.load_text(sha) is None for sha in remaining - kept)
+
+def test_partial_size_cap_keeps_newest_records():
+    """Each removed segment frees its own texts, so the cap stops deleting as soon as it fits"""
+    with tempfile.TemporaryDirectory() as root:
+        store = FeedbackStore(root, max_segment_bytes=64)
+        for i in range(60):
+            store.append(f"resume {i} " + os.urandom(1500).hex(), ['Python'], ['Python'])
+        store.close()
+        backdate(store.segments(), 60)
+        before = store.disk_usage()
+
+        store.max_total_bytes = int(before * 0.6)
+        removed = store.apply_retention()
+        kept = list(store.iter_feedback())
+        assert store.disk_usage() <= store.max_total_bytes
+        # Roughly the oldest 40% go; most records survive
+        assert 0 < removed['segments'] < 60 and len(kept) >= 30
+        assert kept[-1]['correct'] == ['Python'] and store.load_text(kept[-1]['text_sha256'])
+        assert removed['texts'] == 60 - len(kept)
+
+def test_retention_skips_recently_written_segments():
+    """Another process may still be appending to a segment it wrote moments ago"""
+    with tempfile.TemporaryDirectory() as root:
+        other_process = FeedbackStore(root, max_segment_bytes=64)
+        for i in range(10):
+            other_process.append(f"resume {i}", ['Python'], ['Python'])
+        store = FeedbackStore(root, retention_days=0, max_total_bytes=0)
+        assert store.apply_retention() == {'segments': 0, 'texts': 0}
+        assert store.count() == 10
+
+        backdate(store.segments(), 60)
+        assert store.apply_retention()['segments'] == 10
+        other_process.close()
+
+def test_retention_never_removes_the_open_segment():
+    with tempfile.TemporaryDirectory() as root:
+        store = FeedbackStore(root, retention_days=0, max_total_bytes=0)
+        store.append(RESUME, ['Python'], ['Python'])
+        store.apply_retention()
+        assert store.count() == 1
+        store.close()
+
+def main():
+    """Run all checks without pytest"""
+    tests = [obj for name, obj in sorted(globals().items()) if name.startswith('test_') and callable(obj)]
+    for test in tests:
+        test()
+        print(f"✅ {test.__name__}")
+    print(f"\n🎉 {len(tests)} feedback store checks passed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Model Registry Tests
+Staged publishing, the atomic CURRENT pointer, rollback and pruning in model_registry.py
+"""
+
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from model_registry import ModelRegistry
+
+def write_model(path: str, content: str):
+    """Stand-in for nlp.to_disk(): any directory of files"""
+    os.makedirs(os.path.join(path, 'ner'), exist_ok=True)
+    with open(os.path.join(path, 'ner', 'model'), 'w') as f:
+        f.write(content)
+
+def test_staged_versions_are_invisible_until_published():
+    with tempfile.TemporaryDirectory() as root:
+        registry = ModelRegistry(root)
+        assert registry.current_version() is None and registry.current_path() is None
+
+        staged = registry.stage()
+        write_model(staged, 'v1')
+        assert registry.list_versions() == [] and registry.current_version() is None
+
+        version = registry.publish(staged, {'parent': 'skills', 'benchmark_after': {'f1': 0.8}})
+        assert registry.current_version() == version
+        assert not os.path.exists(staged)
+        with open(os.path.join(registry.current_path(), 'ner', 'model')) as f:
+            assert f.read() == 'v1'
+        metadata = registry.metadata(version)
+        assert metadata['parent'] == 'skills' and metadata['version'] == version
+
+def test_publish_without_switching_and_rollback():
+    with tempfile.TemporaryDirectory() as root:
+        registry = ModelRegistry(root)
+        first = registry.publish(registry.stage())
+        second = registry.publish(registry.stage(), make_current=False)
+        assert registry.current_version() == first
+
+        registry.set_current(second)
+        assert registry.current_version() == second
+        registry.set_current(first)
+        assert registry.current_version() == first
+        try:
+            registry.set_current('no-such-version')
+            raise AssertionError("unknown versions must be rejected")
+        except ValueError:
+            pass
+        assert not [name for name in os.listdir(root) if name.endswith('.tmp')]
+
+def test_pointer_to_missing_version_reads_as_none():
+    with tempfile.TemporaryDirectory() as root:
+        registry = ModelRegistry(root)
+        with open(registry.current_file, 'w') as f:
+            f.write('deleted-version\n')
+        assert registry.current_version() is None
+
+def test_import_directory_copies_existing_model():
+    with tempfile.TemporaryDirectory() as root:
+        legacy = os.path.join(root, 'skills')
+        write_model(legacy, 'legacy')
+        registry = ModelRegistry(os.path.join(root, 'registry'))
+        version = registry.import_directory(legacy)
+        assert registry.current_version() == version
+        assert registry.metadata(version)['imported_from'] == os.path.abspath(legacy)
+        assert os.path.exists(os.path.join(legacy, 'ner', 'model'))
+
+def test_prune_keeps_current_and_newest():
+    with tempfile.TemporaryDirectory() as root:
+        registry = ModelRegistry(root)
+        versions = []
+        for i in range(6):
+            staged = registry.stage()
+            write_model(staged, f"v{i}")
+            versions.append(registry.publish(staged))
+        registry.set_current(versions[1])
+
+        removed = registry.prune(keep=3)
+        assert registry.list_versions() == [versions[1], versions[4], versions[5]]
+        assert set(removed) == {versions[0], versions[2], versions[3]}
+        assert registry.current_version() == versions[1]
+
+def main():
+    """Run all checks without pytest"""
+    tests = [obj for name, obj in sorted(globals().items()) if name.startswith('test_') and callable(obj)]
+    for test in tests:
+        test()
+        print(f"✅ {test.__name__}")
+    print(f"\n🎉 {len(tests)} model registry checks passed")
+
+if __name__ == "__main__":
+    main()
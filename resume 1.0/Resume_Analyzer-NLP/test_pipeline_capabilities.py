@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Pipeline Capability Tests
+Which stages configure_pipeline keeps and what it reports in pipeline_capabilities.py
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import spacy
+
+from pipeline_capabilities import configure_pipeline
+
+def build_pipeline(*names):
+    nlp = spacy.blank("en")
+    for name in names:
+        nlp.add_pipe(name)
+    return nlp
+
+def test_parser_keeps_pos_stages_for_noun_chunks():
+    nlp = build_pipeline('tok2vec', 'tagger', 'parser', 'attribute_ruler', 'lemmatizer', 'ner')
+    capabilities = configure_pipeline(nlp)
+    assert nlp.pipe_names == ['tok2vec', 'tagger', 'parser', 'attribute_ruler', 'ner']
+    assert capabilities.disabled == ('lemmatizer',)
+    assert capabilities.has_noun_chunks and capabilities.has_sentences and capabilities.has_ner
+
+def test_parser_without_pos_reports_no_noun_chunks():
+    nlp = build_pipeline('tok2vec', 'parser', 'ner')
+    capabilities = configure_pipeline(nlp)
+    assert not capabilities.has_noun_chunks
+    assert capabilities.has_sentences and not capabilities.added_sentencizer
+
+def test_pos_stages_dropped_without_parser():
+    nlp = build_pipeline('tok2vec', 'tagger', 'attribute_ruler', 'ner')
+    capabilities = configure_pipeline(nlp)
+    assert set(capabilities.disabled) == {'tagger', 'attribute_ruler'}
+    assert nlp.pipe_names == ['tok2vec', 'ner', 'sentencizer']
+    assert capabilities.added_sentencizer and not capabilities.has_noun_chunks
+
+def main():
+    """Run all checks without pytest"""
+    tests = [obj for name, obj in sorted(globals().items()) if name.startswith('test_') and callable(obj)]
+    for test in tests:
+        test()
+        print(f"✅ {test.__name__}")
+    print(f"\n🎉 {len(tests)} pipeline capability checks passed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Reference Index Tests
+Quantized scoring and the on-disk artifact in reference_index.py
+"""
+
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+
+from reference_index import ReferenceEmbeddingIndex
+
+SKILLS = [f"skill {i}" for i in range(50)]
+
+def random_embeddings(seed: int) -> np.ndarray:
+    return np.random.default_rng(seed).standard_normal((len(SKILLS), 32)).astype(np.float32)
+
+def test_int8_scores_match_exact_above_threshold():
+    embeddings = random_embeddings(0)
+    exact = ReferenceEmbeddingIndex.build(SKILLS, embeddings, None)
+    quantized = ReferenceEmbeddingIndex.build(SKILLS, embeddings, 'int8', rerank_k=4)
+    queries = embeddings[:5] + 0.1 * random_embeddings(1)[:5]
+    expected = exact.similarities(queries)
+    scores = quantized.similarities(queries, threshold=0.5)
+    above = expected >= 0.5
+    assert np.allclose(scores[above], expected[above], atol=1e-5)
+    assert quantized.nbytes < exact.nbytes
+
+def test_save_replaces_a_mapped_artifact_whole():
+    with tempfile.TemporaryDirectory() as root:
+        directory = os.path.join(root, 'reference')
+        ReferenceEmbeddingIndex.build(SKILLS, random_embeddings(0)).save(directory, {'model_name': 'a'})
+        mapped = ReferenceEmbeddingIndex.load(directory)
+        before = np.array(mapped.embeddings)
+
+        ReferenceEmbeddingIndex.build(SKILLS, random_embeddings(1)).save(directory, {'model_name': 'b'})
+        # The worker holding the old mapping keeps reading the old vectors
+        assert np.array_equal(mapped.embeddings, before)
+        reloaded = ReferenceEmbeddingIndex.load(directory)
+        assert not np.array_equal(reloaded.embeddings, before)
+        assert os.listdir(root) == ['reference']
+
+def main():
+    """Run all checks without pytest"""
+    tests = [obj for name, obj in sorted(globals().items()) if name.startswith('test_') and callable(obj)]
+    for test in tests:
+        test()
+        print(f"✅ {test.__name__}")
+    print(f"\n🎉 {len(tests)} reference index checks passed")
+
+if __name__ == "__main__":
+    main()
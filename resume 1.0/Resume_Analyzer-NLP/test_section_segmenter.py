@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Section Segmenter Tests
+Heading detection, routing of skill-bearing sections and offset mapping in section_segmenter.py
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from section_segmenter import SectionSegmenter, RoutedText
+
+RESUME = """Jane Doe
+jane@example.com | Python Street 5
+
+PROFESSIONAL SUMMARY
+Backend developer focused on data platforms.
+
+Technical Skills: Python, Docker, AWS
+
+Work Experience:
+Built Kafka pipelines at Acme.
+
+EDUCATION
+BSc Computer Science, Java coursework
+
+Certifications:
+AWS Certified Developer
+"""
+
+SEGMENTER = SectionSegmenter()
+
+def test_headings_and_aliases():
+    spans = SEGMENTER.segment(RESUME)
+    assert [(span.name, span.heading) for span in spans] == [
+        ('header', ''), ('summary', 'PROFESSIONAL SUMMARY'), ('skills', 'Technical Skills'),
+        ('experience', 'Work Experience'), ('education', 'EDUCATION'), ('certifications', 'Certifications')
+    ]
+    assert spans[0].start == 0 and spans[-1].end == len(RESUME)
+    assert all(a.end == b.start for a, b in zip(spans, spans[1:]))
+
+def test_bare_headings_need_caps_or_a_colon():
+    text = "Experience\nI list my skills below.\nSkills\nPython"
+    assert [span.name for span in SEGMENTER.segment(text)] == ['unknown']
+    assert [span.name for span in SEGMENTER.segment("SKILLS\nPython\nTech Stack: Go")] == ['skills']
+
+def test_route_drops_header_and_education():
+    routed = SEGMENTER.route(RESUME)
+    assert 'jane@example.com' not in routed.text and 'Python Street' not in routed.text
+    assert 'BSc Computer Science' not in routed.text and 'Java coursework' not in routed.text
+    assert 'Kafka' in routed.text and 'AWS Certified Developer' in routed.text
+    summary = SEGMENTER.section_summary(RESUME)
+    assert routed.skipped_chars == summary['header'] + summary['education']
+
+def test_to_original_span_maps_back_from_every_piece():
+    routed = SEGMENTER.route(RESUME)
+    for word in ('Backend', 'Docker', 'Kafka', 'Certified'):
+        start = routed.text.index(word)
+        original = routed.to_original_span((start, start + len(word)))
+        assert RESUME[original[0]:original[1]] == word, word
+    start = routed.text.index('Kafka')
+    assert routed.section_at(start) == 'experience'
+    assert routed.to_original_span((-1, -1)) == (-1, -1)
+
+def test_text_without_headings_is_routed_whole():
+    text = "Python and React developer"
+    routed = SEGMENTER.route(text)
+    assert routed.text == text and routed.skipped_chars == 0
+    identity = RoutedText.identity(text)
+    assert identity.to_original_span((7, 10)) == (7, 10)
+
+def main():
+    """Run all checks without pytest"""
+    tests = [obj for name, obj in sorted(globals().items()) if name.startswith('test_') and callable(obj)]
+    for test in tests:
+        test()
+        print(f"✅ {test.__name__}")
+    print(f"\n🎉 {len(tests)} section segmenter checks passed")
+
+if __name__ == "__main__":
+    main()
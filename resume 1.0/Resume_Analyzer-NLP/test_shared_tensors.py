@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Shared Tensor Store Tests
+Content-keyed publishing and zero-copy mapping in shared_tensors.py
+"""
+
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+
+from shared_tensors import SharedArrayStore
+
+def test_same_content_is_mapped_not_rewritten():
+    with tempfile.TemporaryDirectory() as root:
+        store = SharedArrayStore(root)
+        array = np.arange(12, dtype=np.float32).reshape(3, 4)
+        first = store.publish('reference.minilm.embeddings', array)
+        second = store.publish('reference.minilm.embeddings', array.copy())
+        assert np.array_equal(second, array) and second.filename == first.filename
+        assert len(os.listdir(root)) == 1
+
+def test_same_shape_new_content_is_not_stale():
+    """A new ontology with as many skills, or a fine-tuned model keeping its name"""
+    with tempfile.TemporaryDirectory() as root:
+        store = SharedArrayStore(root)
+        old = store.publish('spacy.skills.vectors', np.zeros((4, 8), dtype=np.float32))
+        new_values = np.ones((4, 8), dtype=np.float32)
+        new = store.publish('spacy.skills.vectors', new_values)
+        assert np.array_equal(new, new_values)
+        # A worker still mapping the old version keeps its values
+        assert not old.any()
+        assert np.array_equal(store.attach('spacy.skills.vectors'), new_values)
+        assert len(os.listdir(root)) == 1
+
+def test_names_sharing_a_prefix_stay_separate():
+    with tempfile.TemporaryDirectory() as root:
+        store = SharedArrayStore(root)
+        store.publish('reference.minilm.embeddings', np.ones(3))
+        store.publish('reference.minilm', np.zeros(3))
+        assert np.array_equal(store.attach('reference.minilm.embeddings'), np.ones(3))
+        assert store.attach('reference.other') is None
+
+def main():
+    """Run all checks without pytest"""
+    tests = [obj for name, obj in sorted(globals().items()) if name.startswith('test_') and callable(obj)]
+    for test in tests:
+        test()
+        print(f"✅ {test.__name__}")
+    print(f"\n🎉 {len(tests)} shared tensor checks passed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Skill Normalizer Tests
+Ids, display names, aliases and category members all resolve in skill_normalizer.py
+"""
+
+import sys
+import os
+import importlib.util
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(CURRENT_DIR)
+
+from skill_normalizer import SkillNormalizer
+
+BACKEND_DIR = os.path.join(CURRENT_DIR, '..', '..', 'job-skill-matcher', 'backend')
+
+def load_ontology(directory: str):
+    """SkillOntology from the ensemble_skill_extractor.py in `directory`"""
+    spec = importlib.util.spec_from_file_location(
+        f"ensemble_skill_extractor_{abs(hash(directory))}", os.path.join(directory, 'ensemble_skill_extractor.py')
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.SkillOntology()
+
+def test_every_surface_form_resolves():
+    normalizer = SkillNormalizer(
+        {'machine_learning': 'Machine Learning', 'cpp': 'C++'},
+        aliases={'machine_learning': ['ML'], 'cpp': ['c plus plus']},
+        categories={'data_science': ['machine_learning'], 'programming': ['cpp', 'Rust']}
+    )
+    for raw in ['machine_learning', 'Machine Learning', ' machine learning ', 'ML']:
+        assert normalizer.resolve(raw) == ('machine_learning', 'Machine Learning', 'data_science'), raw
+    assert normalizer.resolve('C++') == ('cpp', 'C++', 'programming')
+    assert normalizer.resolve('c plus plus').skill_id == 'cpp'
+    assert normalizer.resolve('rust') == ('rust', 'rust', 'programming')
+    assert normalizer.resolve('Cobol') == (None, 'Cobol', 'other')
+
+def test_ids_win_over_display_names():
+    normalizer = SkillNormalizer({'go': 'Go', 'golang': 'go'})
+    assert normalizer.resolve('go').skill_id == 'go'
+    assert normalizer.resolve('Golang').skill_id == 'golang'
+
+def test_canonical_names_resolve_to_their_key():
+    """Every display name in both ontologies maps back to its id (skill_id output and DB lookups rely on it)"""
+    for directory in (CURRENT_DIR, BACKEND_DIR):
+        ontology = load_ontology(directory)
+        normalizer = SkillNormalizer(ontology.canonical_skills, ontology.aliases, ontology.categories)
+        unresolved = [skill_id for skill_id, name in ontology.canonical_skills.items()
+                      if normalizer.resolve(name).skill_id != skill_id]
+        assert not unresolved, f"{directory}: {unresolved}"
+
+def main():
+    """Run all checks without pytest"""
+    tests = [obj for name, obj in sorted(globals().items()) if name.startswith('test_') and callable(obj)]
+    for test in tests:
+        test()
+        print(f"✅ {test.__name__}")
+    print(f"\n🎉 {len(tests)} skill normalizer checks passed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Skill Rule Engine Tests
+Lead-character dispatch, symbol boundaries and context guards in skill_rules.py
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from skill_rules import DEFAULT_RULE_ENGINE, SkillRule, SkillRuleEngine, _legacy_scan
+
+ENGINE = DEFAULT_RULE_ENGINE
+
+def test_lead_chars_gate_every_alternative():
+    engine = SkillRuleEngine((
+        SkillRule('go', 'go', lead_chars='g', patterns=(r'\bgo(?:lang)?\b',)),
+        # The pattern can start with "k" but lead_chars does not list it
+        SkillRule('kotlin', 'kotlin', lead_chars='x', patterns=(r'\bkotlin\b',)),
+    ))
+    assert engine.pattern.pattern.startswith('(?=[gx])')
+    assert engine.skills("Golang, Go and Kotlin services") == {'go'}
+    assert ENGINE.skills("Java, Kotlin and Swift") == set()
+
+def test_earlier_rules_win_at_the_same_offset():
+    hits = ENGINE.scan("C++ and C# and C")
+    assert [(hit.skill_id, hit.start, hit.end) for hit in hits] == [('c++', 0, 3), ('c#', 8, 10), ('c', 15, 16)]
+
+def test_symbol_boundaries():
+    cases = {
+        "Wrote C++, C# and C.": {'c++', 'c#', 'c'},
+        "c + + and c sharp": {'c++', 'c#'},
+        "Objective-C and C-suite": set(),
+        "Send mail c/o HR": set(),
+        "ASP.NET, .NET Core and dotnet CLI": {'.net'},
+        "Visit example.net today": set(),
+        "SQL databases and a DB": {'sql', 'database'},
+        "MySQL and NoSQL": set(),
+    }
+    for text, expected in cases.items():
+        assert ENGINE.skills(text) == expected, (text, ENGINE.skills(text))
+
+def test_r_needs_nearby_context():
+    assert ENGINE.skills("Statistical analysis in R and ggplot2") == {'r'}
+    assert ENGINE.skills("R programming") == {'r'}
+    assert ENGINE.skills("Grade: R. Approved by HR.") == set()
+    assert ENGINE.skills("R&D lead") == set()
+    # The guard looks around the hit, not across the whole document
+    far = "Data engineer. " + "x" * 200 + " Initials: R"
+    assert ENGINE.skills(far) == set()
+
+def test_context_guards_can_be_skipped():
+    text = "Grade: R. Approved by HR."
+    assert ENGINE.skills(text, context_guards=False) == {'r'}
+    assert ENGINE.first_hits(text, include=['r'], context_guards=False)['r'].start == 7
+    assert ENGINE.first_hits(text, include=['r']) == {}
+
+def test_finds_everything_the_legacy_patterns_did():
+    text = "Languages: C++, C#, C, R programming, SQL. Frameworks: .NET. Databases: PostgreSQL."
+    assert _legacy_scan(text) < ENGINE.skills(text)
+    # \bc\+\+\b and \b\.net\b never matched before a comma or after a space
+    assert ENGINE.skills(text) - _legacy_scan(text) == {'c++', '.net'}
+
+def main():
+    """Run all checks without pytest"""
+    tests = [obj for name, obj in sorted(globals().items()) if name.startswith('test_') and callable(obj)]
+    for test in tests:
+        test()
+        print(f"✅ {test.__name__}")
+    print(f"\n🎉 {len(tests)} skill rule checks passed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Long-document Chunking
+Splits text on sentence/line boundaries into overlapping chunks so spaCy's max_length
+and MiniLM's 256-token window never see more than they can handle
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Callable, Hashable, Iterable, Iterator, List, TypeVar
+
+T = TypeVar('T')
+
+# Sentence ends and line breaks are the preferred places to cut
+_BOUNDARY_PATTERN = re.compile(r'(?<=[.!?;])\s+|\n+')
+
+@dataclass
+class TextChunk:
+    """A slice of the original text and where it starts"""
+    text: str
+    start: int
+
+    @property
+    def end(self) -> int:
+        return self.start + len(self.text)
+
+class TextChunker:
+    """Greedy boundary-aligned chunker with a fixed character overlap between chunks"""
+
+    def __init__(self, max_chars: int = 5000, overlap_chars: int = 200):
+        if max_chars <= 0:
+            raise ValueError("max_chars must be positive")
+        if not 0 <= overlap_chars < max_chars:
+            raise ValueError("overlap_chars must be in [0, max_chars)")
+        self.max_chars = max_chars
+        self.overlap_chars = overlap_chars
+
+    def _cut_point(self, text: str, start: int, limit: int) -> int:
+        """Last boundary in (start, limit], else last whitespace, else a hard cut"""
+        cut = -1
+        for match in _BOUNDARY_PATTERN.finditer(text, start, limit):
+            cut = match.end()
+        if cut > start:
+            return cut
+        space = text.rfind(' ', start, limit)
+        if space > start:
+            return space + 1
+        return limit
+
+    def _resume_point(self, text: str, chunk_start: int, chunk_end: int) -> int:
+        """Start the next chunk on a boundary inside the overlap region"""
+        if self.overlap_chars == 0:
+            return chunk_end
+        target = max(chunk_start + 1, chunk_end - self.overlap_chars)
+        match = _BOUNDARY_PATTERN.search(text, target, chunk_end)
+        if match and match.end() < chunk_end:
+            return match.end()
+        space = text.find(' ', target, chunk_end)
+        if space != -1 and space + 1 < chunk_end:
+            return space + 1
+        return target
+
+    def chunks(self, text: str) -> Iterator[TextChunk]:
+        """Yield chunks lazily so callers can stream them through batch pipelines"""
+        if len(text) <= self.max_chars:
+            yield TextChunk(text, 0)
+            return
+
+        start = 0
+        while start < len(text):
+            limit = min(len(text), start + self.max_chars)
+            end = limit if limit == len(text) else self._cut_point(text, start, limit)
+            yield TextChunk(text[start:end], start)
+            if end >= len(text):
+                break
+            start = max(start + 1, self._resume_point(text, start, end))
+
+    def needs_chunking(self, text: str) -> bool:
+        return len(text) > self.max_chars
+
+    def sentences(self, text: str, min_chars: int = 3) -> Iterator[TextChunk]:
+        """Yield individual sentences/lines, splitting any longer than max_chars
+
+        Sentence-sized units repeat across documents (boilerplate bullets), which is
+        what makes them worth caching; overlap is not applied here.
+        """
+        start = 0
+        for match in _BOUNDARY_PATTERN.finditer(text):
+            yield from self._sentence_pieces(text, start, match.start(), min_chars)
+            start = match.end()
+        yield from self._sentence_pieces(text, start, len(text), min_chars)
+
+    def _sentence_pieces(self, text: str, start: int, end: int, min_chars: int) -> Iterator[TextChunk]:
+        sentence = text[start:end]
+        if len(sentence.strip()) < min_chars:
+            return
+        if len(sentence) <= self.max_chars:
+            yield TextChunk(sentence, start)
+            return
+        for piece in TextChunker(self.max_chars, 0).chunks(sentence):
+            yield TextChunk(piece.text, start + piece.start)
+
+def batched(items: Iterable[T], size: int) -> Iterator[List[T]]:
+    """Group an iterable into lists of at most `size` items without materialising it"""
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def merge_seam_duplicates(items: Iterable[T], key: Callable[[T], Hashable]) -> List[T]:
+    """Drop items seen twice because they fell inside the overlap between two chunks"""
+    seen = set()
+    merged = []
+    for item in items:
+        item_key = key(item)
+        if item_key in seen:
+            continue
+        seen.add(item_key)
+        merged.append(item)
+    return merged